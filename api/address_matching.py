@@ -0,0 +1,266 @@
+import os
+import re
+import unicodedata
+from name_matching import jaro_winkler
+
+# Confidence at or above ACCEPT is a match and at or below REJECT is not; only
+# the residual band in between goes to Gemini.
+ADDRESS_MATCH_ACCEPT = float(os.getenv("ADDRESS_MATCH_ACCEPT", "0.8"))
+ADDRESS_MATCH_REJECT = float(os.getenv("ADDRESS_MATCH_REJECT", "0.35"))
+# Two differing words this close are read as the same word misspelled
+TOKEN_TYPO_SIMILARITY = float(os.getenv("ADDRESS_TOKEN_TYPO_SIMILARITY", "0.9"))
+
+# Whole-token abbreviations used in UAE addresses
+ABBREVIATIONS = {
+    "jlt": "jumeirah lake towers",
+    "jbr": "jumeirah beach residence",
+    "jvc": "jumeirah village circle",
+    "jvt": "jumeirah village triangle",
+    "difc": "dubai international financial centre",
+    "dmcc": "dubai multi commodities centre",
+    "dso": "dubai silicon oasis",
+    "dic": "dubai internet city",
+    "dmc": "dubai media city",
+    "dip": "dubai investments park",
+    "jafza": "jebel ali free zone",
+    "dafza": "dubai airport free zone",
+    "adgm": "abu dhabi global market",
+    "szr": "sheikh zayed road",
+    "mbz": "mohammed bin zayed",
+    "dxb": "dubai",
+    "auh": "abu dhabi",
+    "shj": "sharjah",
+    "rak": "ras al khaimah",
+    "uaq": "umm al quwain",
+    "uae": "united arab emirates",
+    "bldg": "building",
+    "blg": "building",
+    "bld": "building",
+    "twr": "tower",
+    "flr": "floor",
+    "fl": "floor",
+    "lvl": "level",
+    "st": "street",
+    "str": "street",
+    "rd": "road",
+    "ave": "avenue",
+    "blvd": "boulevard",
+    "apt": "apartment",
+    "ofc": "office",
+    "ste": "suite",
+    "pob": "po box",
+    "center": "centre",
+    "no": "",
+    "nr": "",
+    "number": "",
+}
+
+EMIRATES = ("abu dhabi", "dubai", "sharjah", "ajman", "umm al quwain", "ras al khaimah", "fujairah")
+COUNTRY = "united arab emirates"
+UNIT_WORDS = ("office", "suite", "apartment", "flat", "unit", "shop", "villa", "room")
+BUILDING_WORDS = ("building", "tower", "plaza", "complex", "house", "residence", "mall", "centre", "business park")
+STREET_WORDS = ("street", "road", "avenue", "boulevard", "highway")
+
+_PO_BOX = re.compile(r"\bp\s*o\s*box\s*(\d+)\b|\bpo\s*box\s*(\d+)\b|\bpost\s*box\s*(\d+)\b")
+_UNIT = re.compile(r"\b(?:%s)\s*([a-z]?\d+[a-z]?(?:\s*\d+)?)\b" % "|".join(UNIT_WORDS))
+# "Floor 3" is tried before "3rd floor" so "office 12 floor 3" does not read as floor 12
+_FLOOR_AFTER = re.compile(r"\b(?:floor|level)\s*(\d+)\b")
+_FLOOR_BEFORE = re.compile(r"\b(\d+)\s*(?:st|nd|rd|th)?\s*floor\b|\b(ground|mezzanine)\s*floor\b")
+
+
+def normalize_address(text: str):
+    """Casefold, strip accents and punctuation, expand abbreviations."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+    text = text.replace("p.o.", "po ").replace("p. o.", "po ")
+    text = re.sub(r"[^\w\s,]|_", " ", text)
+    # "Office1203" -> "office 1203"
+    text = re.sub(r"(?<=[a-z])(?=\d{2,})", " ", text)
+    segments = []
+    for segment in text.split(","):
+        words = []
+        for word in segment.split():
+            expanded = ABBREVIATIONS.get(word, word)
+            if expanded:
+                words.append(expanded)
+        if words:
+            segments.append(" ".join(words))
+    return segments
+
+
+def _last_emirate(text: str):
+    found, position = None, -1
+    for emirate in EMIRATES:
+        index = text.rfind(emirate)
+        if index > position:
+            found, position = emirate, index
+    return found
+
+
+def _find(segments: list, *patterns):
+    """First value captured by `patterns`, searched one comma segment at a time."""
+    for segment in segments:
+        for pattern in patterns:
+            found = pattern.search(segment)
+            if found:
+                return next(g for g in found.groups() if g)
+    return None
+
+
+def _strip_emirate(segment: str):
+    """Drop a trailing emirate ("al barsha dubai" -> "al barsha"); emirates are compared separately."""
+    for emirate in EMIRATES:
+        if segment.endswith(" " + emirate):
+            return segment[:-len(emirate)].strip()
+    return segment
+
+
+def parse_address(text: str):
+    """
+    Split a UAE address into components: emirate, community, building, unit,
+    floor, po box and street, plus the remaining tokens for fuzzy comparison.
+    """
+    segments = normalize_address(text)
+    full = " ".join(segments)
+    parsed = {"emirate": _last_emirate(full), "community": None, "building": None, "unit": None,
+              "floor": None, "poBox": None, "street": None}
+
+    parsed["poBox"] = _find(segments, _PO_BOX)
+    parsed["floor"] = _find(segments, _FLOOR_AFTER, _FLOOR_BEFORE)
+    unit = _find(segments, _UNIT)
+    if unit:
+        parsed["unit"] = unit.replace(" ", "")
+
+    residual = []
+    for segment in segments:
+        cleaned = _PO_BOX.sub(" ", segment)
+        cleaned = _FLOOR_AFTER.sub(" ", cleaned)
+        cleaned = _FLOOR_BEFORE.sub(" ", cleaned)
+        cleaned = _UNIT.sub(" ", cleaned)
+        cleaned = cleaned.replace(COUNTRY, " ")
+        cleaned = _strip_emirate(" ".join(cleaned.split()))
+        if not cleaned or cleaned in EMIRATES:
+            continue
+        if not parsed["building"] and any(re.search(rf"\b{w}\b", cleaned) for w in BUILDING_WORDS):
+            parsed["building"] = cleaned
+        elif not parsed["street"] and any(re.search(rf"\b{w}\b", cleaned) for w in STREET_WORDS):
+            parsed["street"] = cleaned
+        elif not parsed["community"]:
+            parsed["community"] = cleaned
+        residual.append(cleaned)
+    parsed["tokens"] = sorted(set(" ".join(residual).split()))
+    return parsed
+
+
+def _text_similarity(a: str, b: str):
+    """
+    Order-independent similarity of two short phrases, compared token by
+    token. Extra tokens on one side only make it more specific; a token that
+    has no counterpart on both sides ("tower a" vs "tower b", "building 7" vs
+    "building 8", "deira city centre" vs "mirdif city centre") makes a
+    different place. Only alphabetic tokens may pair up as typos.
+    """
+    only_a, only_b = set(a.split()) - set(b.split()), set(b.split()) - set(a.split())
+    if not only_a or not only_b:
+        return 1.0
+    similarity = 1.0
+    for token in sorted(only_a, key=len, reverse=True):
+        if not token.isalpha():
+            continue
+        best, other = max(((jaro_winkler(token, t), t) for t in only_b if t.isalpha()), default=(0.0, None))
+        if best >= TOKEN_TYPO_SIMILARITY:
+            only_b.discard(other)
+            similarity = min(similarity, best)
+            only_a.discard(token)
+    return similarity if not only_a or not only_b else 0.0
+
+
+def _phrase_similarity(a: dict, b: dict, key: str):
+    return _text_similarity(a[key], b[key]) if a[key] and b[key] else None
+
+
+# Weight of each component when both sides have it
+COMPONENT_WEIGHTS = {"building": 0.3, "community": 0.2, "street": 0.1, "unit": 0.2, "poBox": 0.1, "floor": 0.1}
+
+# Where agreeing components land when there is too little else to compare;
+# the middle of the band, so Gemini decides instead of a local rejection
+WEAK_MATCH_CONFIDENCE = round((ADDRESS_MATCH_ACCEPT + ADDRESS_MATCH_REJECT) / 2, 3)
+# Highest confidence when a component differs that Gemini should still look at
+SUSPICIOUS_CAP = 0.5
+
+
+def _components(parsed: dict):
+    """Everything but the emirate, which is compared on its own."""
+    return {k: v for k, v in parsed.items() if k != "emirate"}
+
+
+def score_addresses(address1: str, address2: str):
+    """Return (confidence, reason) for two addresses."""
+    a, b = parse_address(address1), parse_address(address2)
+    if not a["tokens"] and not b["tokens"] and not (a["poBox"] or b["poBox"]):
+        return 0.0, "Empty address"
+    if normalize_address(address1) == normalize_address(address2):
+        return 1.0, "Identical after normalization"
+    if a["emirate"] and b["emirate"] and a["emirate"] != b["emirate"]:
+        return 0.05, f"Different emirates ({a['emirate']} vs {b['emirate']})"
+    # Same components, differing only in punctuation, ordering or the emirate/country suffix
+    if _components(a) == _components(b):
+        return 1.0, "Same address components"
+
+    scores = {}
+    for key in ("building", "community", "street"):
+        similarity = _phrase_similarity(a, b, key)
+        if similarity is not None:
+            scores[key] = similarity
+    for key in ("unit", "poBox", "floor"):
+        if a[key] and b[key]:
+            scores[key] = 1.0 if a[key] == b[key] else 0.0
+
+    # Everything else, compared as bags of tokens (catches misplaced components)
+    ta, tb = set(a["tokens"]), set(b["tokens"])
+    bag = len(ta & tb) / min(len(ta), len(tb)) if ta and tb else 0.0
+
+    if scores:
+        weight = sum(COMPONENT_WEIGHTS[k] for k in scores)
+        component_score = sum(COMPONENT_WEIGHTS[k] * s for k, s in scores.items()) / weight
+        # Few shared components leave more room for the token bag
+        coverage = min(weight / 0.5, 1.0)
+        confidence = coverage * component_score + (1 - coverage) * bag
+    else:
+        confidence = bag
+    matched = [k for k, s in scores.items() if s >= 0.9]
+    differing = [k for k, s in scores.items() if s < 0.5]
+    # A different unit in the same building is a different address; a
+    # different PO box, floor or numbered building, community or street is
+    # suspicious but leaves the call to Gemini
+    if scores.get("unit") == 0.0:
+        confidence = min(confidence, 0.3)
+    elif differing:
+        confidence = min(confidence, SUSPICIOUS_CAP)
+    elif matched:
+        confidence = max(confidence, WEAK_MATCH_CONFIDENCE)
+    confidence = round(max(0.0, min(confidence, 1.0)), 3)
+
+    if differing:
+        reason = f"Different {', '.join(differing)}"
+    elif matched:
+        reason = f"Same {', '.join(matched)}"
+    elif confidence <= ADDRESS_MATCH_REJECT:
+        reason = "Few shared address terms"
+    else:
+        reason = "Some shared address terms"
+    return confidence, reason
+
+
+def match_addresses_locally(address1: str, address2: str):
+    """
+    Decide locally when the confidence is outside the residual band.
+    Returns {"match", "confidence", "reason", "ambiguous"}.
+    """
+    confidence, reason = score_addresses(address1, address2)
+    return {
+        "match": confidence >= ADDRESS_MATCH_ACCEPT,
+        "confidence": confidence,
+        "reason": reason,
+        "ambiguous": ADDRESS_MATCH_REJECT < confidence < ADDRESS_MATCH_ACCEPT,
+    }
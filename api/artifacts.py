@@ -0,0 +1,90 @@
+import asyncio
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Literal, get_args
+from db import upload
+
+# Video recording policy: "off", "on_failure" (keep the video only when the scrape errors) or "always"
+RecordingPolicy = Literal["off", "on_failure", "always"]
+RECORDING_POLICIES = get_args(RecordingPolicy)
+DEFAULT_RECORDING_POLICY = os.getenv("VIDEO_RECORDING_POLICY", "always")
+
+
+def resolve_recording_policy(policy: str = None):
+    policy = policy or DEFAULT_RECORDING_POLICY
+    if policy not in RECORDING_POLICIES:
+        raise ValueError(f"Unknown recording policy: {policy}")
+    return policy
+
+
+class ArtifactUploads:
+    """
+    Uploads recorded videos in the background so verification responses do not
+    wait on storage. Each upload gets an artifact ID that can be polled until it
+    resolves to its public path.
+    """
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self._artifacts = OrderedDict()
+        self._tasks = set()
+
+    def schedule(self, file_path: str, bucket: str, destination_path: str):
+        """Queue an upload and return its artifact ID; the public path is set once the upload succeeds."""
+        artifact_id = uuid.uuid4().hex
+        self._artifacts[artifact_id] = {
+            "id": artifact_id,
+            "status": "pending",
+            "public_video_path": None,
+            "created_at": time.time(),
+        }
+        while len(self._artifacts) > self.max_entries:
+            self._artifacts.popitem(last=False)
+
+        task = asyncio.create_task(self._upload(artifact_id, file_path, bucket, destination_path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return artifact_id
+
+    async def _upload(self, artifact_id, file_path, bucket, destination_path):
+        artifact = self._artifacts.get(artifact_id, {})
+        try:
+            public_path = await upload(file_path, bucket, destination_path)
+            artifact.update({"status": "uploaded", "public_video_path": public_path})
+            print(f"Video uploaded to Supabase: {public_path}")
+        except Exception as e:
+            print(f"Error uploading video artifact {artifact_id}: {e}")
+            artifact.update({"status": "failed", "error": str(e)})
+        finally:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def get(self, artifact_id: str):
+        return self._artifacts.get(artifact_id)
+
+    def stats(self):
+        pending = sum(1 for a in self._artifacts.values() if a["status"] == "pending")
+        return {"tracked": len(self._artifacts), "pending": pending}
+
+
+artifact_uploads = ArtifactUploads()
+
+
+def handle_recorded_video(data: dict, policy: str, video_filename: str):
+    """
+    Apply the recording policy to a scrape result. Kept videos are uploaded in
+    the background; the result only gets `video_artifact_id`, and
+    GET /artifacts/{id} gives the public path once the upload has succeeded.
+    """
+    video_path = data.get("video_path")
+    if not video_path or not os.path.exists(video_path):
+        return data
+    if policy == "on_failure" and not data.get("error"):
+        os.remove(video_path)
+        data.pop("video_path", None)
+        return data
+
+    data["video_artifact_id"] = artifact_uploads.schedule(video_path, "zamp-uploads", f"videos/{video_filename}")
+    return data
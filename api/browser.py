@@ -1,56 +1,154 @@
 import asyncio
 import json
+import os
 import random
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from typing import Literal, get_args
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 from datetime import datetime
+from browser_pool import browser_pool, video_options
 
-async def extract_license_info(trade_license_number: str = None, direct_url: str = None):
+# Readiness profiles: "fast" only waits on DOM conditions, "stealth" adds human-like jitter on top
+ReadinessProfile = Literal["fast", "stealth"]
+READINESS_PROFILES = get_args(ReadinessProfile)
+DEFAULT_PROFILE = os.getenv("LICENSE_READINESS_PROFILE", "fast")
+
+# The license card is ready once its value cells are populated
+CARD_READY_JS = """
+(minRows) => {
+    const card = document.querySelector('#printArea .v-card');
+    if (!card) return false;
+    const values = Array.from(card.querySelectorAll('.v-col.text-right'));
+    return values.filter(v => v.textContent.trim()).length >= minRows;
+}
+"""
+
+# The activities list is ready once the section under its heading has rendered rows
+ACTIVITIES_READY_JS = """
+() => {
+    const heading = Array.from(document.querySelectorAll('#printArea *'))
+        .find(el => el.children.length === 0 && el.textContent.trim() === 'License Activities');
+    if (!heading) return false;
+    const section = heading.parentElement && heading.parentElement.parentElement;
+    return !!section && /Active\\s*$/m.test(section.innerText);
+}
+"""
+
+# Walk the #printArea card once and return {label: value} plus the activity names
+EXTRACT_LICENSE_JS = """
+() => {
+    const clean = (el) => (el && el.textContent || '').replace(/\\s+/g, ' ').trim();
+    const fields = {};
+    const card = document.querySelector('#printArea .v-card');
+    if (card) {
+        for (const value of card.querySelectorAll('.v-col.text-right')) {
+            const row = value.parentElement;
+            const label = row && Array.from(row.children).find(c => c !== value && c.classList.contains('v-col'));
+            const key = clean(label);
+            if (key && !(key in fields)) fields[key] = clean(value);
+        }
+    }
+
+    const activities = [];
+    const heading = Array.from(document.querySelectorAll('#printArea *'))
+        .find(el => el.children.length === 0 && el.textContent.trim() === 'License Activities');
+    const section = heading && heading.parentElement && heading.parentElement.parentElement;
+    if (section) {
+        const isActivity = (el) => /^[A-Za-z].*Active$/.test(clean(el));
+        for (const el of section.querySelectorAll('*')) {
+            // Innermost element carrying the "<name> Active" text
+            if (isActivity(el) && !Array.from(el.children).some(isActivity)) {
+                const name = clean(el).replace(/Active$/, '').trim();
+                if (name) activities.push(name);
+            }
+        }
+    }
+    return { fields, activities };
+}
+"""
+
+# Output field -> label keywords on the card, matched by text rather than position
+LICENSE_FIELDS = {
+    "Business Name": ("business name", "trade name"),
+    "License Number": ("license number", "licence number", "license no"),
+    "Issuing Authority": ("issuing authority", "authority"),
+    "Legal Type": ("legal type", "legal form"),
+    "Expiry Date": ("expiry date", "expiry"),
+}
+
+def map_license_fields(fields: dict):
+    """Map raw card labels onto the fixed license fields; missing ones come back as None."""
+    normalized = {label.strip().rstrip(":").lower(): value for label, value in fields.items()}
+    license_data = {}
+    for field, keywords in LICENSE_FIELDS.items():
+        value = None
+        for keyword in keywords:
+            if keyword in normalized:
+                value = normalized[keyword]
+                break
+        if value is None:
+            value = next((v for label, v in normalized.items() if any(k in label for k in keywords)), None)
+        license_data[field] = value or None
+    return license_data
+
+async def wait_for_license_card(page, timeout=30000):
+    """Wait until the #printArea card rows are populated. Returns False on timeout."""
+    try:
+        await page.wait_for_function(CARD_READY_JS, arg=4, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def wait_for_activities(page, timeout=5000):
+    """Wait until the License Activities list has rendered. Returns False on timeout."""
+    try:
+        await page.wait_for_function(ACTIVITIES_READY_JS, timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def extract_license_info(trade_license_number: str = None, direct_url: str = None, profile: str = None, record_video: bool = True):
     """
-    Extract license information from Dubai invest portal with maximum stealth
+    Extract license information from Dubai invest portal
     
     Args:
         trade_license_number: The trade license number to search for
         direct_url: Optional direct URL to navigate to (e.g. from QR code)
+        profile: "fast" (DOM readiness waits only) or "stealth" (adds human-like pauses).
+            QR/direct URLs default to "fast"; license numbers default to LICENSE_READINESS_PROFILE.
+        record_video: Whether to record a screencast of the session
         
     Returns:
         dict: Extracted license information
     """
+    if profile is None:
+        profile = "fast" if direct_url else DEFAULT_PROFILE
+    if profile not in READINESS_PROFILES:
+        raise ValueError(f"Unknown readiness profile: {profile}")
+    stealth = profile == "stealth"
     
-    async with async_playwright() as p:
-        # Try Firefox as it's sometimes harder to detect
-        browser = await p.firefox.launch(
-            headless=True,
-            firefox_user_prefs={
-                "dom.webdriver.enabled": False,
-                "useAutomationExtension": False,
-                "general.platform.override": "Win32",
-                "general.useragent.override": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
-            }
-        )
-        
-        # Create context with realistic settings
-        context = await browser.new_context(
-            viewport={"width": 1366, "height": 768},  # Common laptop resolution
-            locale="en-US",
-            timezone_id="Asia/Dubai",  # Use Dubai timezone
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
-            record_video_dir="videos/",
-            record_video_size={"width": 1366, "height": 768},
-            geolocation={"latitude": 25.2048, "longitude": 55.2708},
-            permissions=["geolocation"],
-            extra_http_headers={
-                "Accept-Language": "en-US,en;q=0.9,ar;q=0.8",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
-                "Accept-Encoding": "gzip, deflate, br",
-                "DNT": "1",
-                "Connection": "keep-alive",
-                "Upgrade-Insecure-Requests": "1",
-                "Sec-Fetch-Dest": "document",
-                "Sec-Fetch-Mode": "navigate",
-                "Sec-Fetch-Site": "none",
-                "Cache-Control": "max-age=0"
-            }
-        )
+    # Lease a fresh context on a warm Firefox from the shared pool
+    async with browser_pool.context(
+        "firefox",
+        viewport={"width": 1366, "height": 768},  # Common laptop resolution
+        locale="en-US",
+        timezone_id="Asia/Dubai",  # Use Dubai timezone
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0",
+        **video_options(record_video, {"width": 1366, "height": 768}),
+        geolocation={"latitude": 25.2048, "longitude": 55.2708},
+        permissions=["geolocation"],
+        extra_http_headers={
+            "Accept-Language": "en-US,en;q=0.9,ar;q=0.8",
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
+            "Accept-Encoding": "gzip, deflate, br",
+            "DNT": "1",
+            "Connection": "keep-alive",
+            "Upgrade-Insecure-Requests": "1",
+            "Sec-Fetch-Dest": "document",
+            "Sec-Fetch-Mode": "navigate",
+            "Sec-Fetch-Site": "none",
+            "Cache-Control": "max-age=0"
+        }
+    ) as context:
         
         page = await context.new_page()
         
@@ -68,105 +166,43 @@ async def extract_license_info(trade_license_number: str = None, direct_url: str
             print(f"Navigating to: {target_url}")
             await page.goto(target_url, wait_until="load", timeout=60000)
             
-            # Wait for details page to confirm load
-            print("Waiting for page content to load...")
-            # Wait for a key element that signifies the details are present
-            try:
-                await page.wait_for_selector("text=Business Name", timeout=30000)
-            except PlaywrightTimeoutError:
-                print("Warning: 'Business Name' not found immediately, page might be slow or invalid ID.")
-            
-            # Small random pause for realism/loading
-            await asyncio.sleep(random.uniform(2.0, 4.0))
+            # Wait for the license card rows to be populated
+            print(f"Waiting for page content to load ({profile} profile)...")
+            if not await wait_for_license_card(page):
+                print("Warning: license card not populated in time, page might be slow or invalid ID.")
             
-            # Scroll to simulate reading
-            await page.mouse.wheel(0, random.randint(100, 200))
-            await asyncio.sleep(random.uniform(1.0, 1.5))
+            if stealth:
+                # Small random pause for realism
+                await asyncio.sleep(random.uniform(2.0, 4.0))
+                
+                # Scroll to simulate reading
+                await page.mouse.wheel(0, random.randint(100, 200))
+                await asyncio.sleep(random.uniform(1.0, 1.5))
             
             
             # Extract license information
             print("Extracting license information...")
             
-            license_data = {}
-            
-            # Extract Business Name
-            try:
-                # Selector provided by user
-                business_name_selector = "#printArea > div.border-sm.border-grey-300.border-opacity-100.mt-6.rounded-lg > div.v-card.v-card--flat.v-theme--omnia.v-card--density-default.rounded-md.v-card--variant-elevated.border-0.rounded-lg > div:nth-child(5) > div > div > div.v-col.v-col-6.text-right.text-body-1.font-weight-semibold.text-grey-900"
-                business_name_element = await page.wait_for_selector(business_name_selector, timeout=5000)
-                if business_name_element:
-                    license_data["Business Name"] = await business_name_element.text_content()
-                    license_data["Business Name"] = license_data["Business Name"].strip()
-            except Exception as e:
-                print(f"Error extracting Business Name: {e}")
-                license_data["Business Name"] = None
-            
-            # Extract License Number
-            try:
-                # Selector provided by user
-                license_number_selector = "#printArea > div.border-sm.border-grey-300.border-opacity-100.mt-6.rounded-lg > div.v-card.v-card--flat.v-theme--omnia.v-card--density-default.rounded-md.v-card--variant-elevated.border-0.rounded-lg > div:nth-child(4) > div > div > div.v-col.v-col-6.text-right.text-body-1.font-weight-semibold.text-grey-900"
-                license_number_element = await page.wait_for_selector(license_number_selector, timeout=5000)
-                if license_number_element:
-                    license_data["License Number"] = await license_number_element.text_content()
-                    license_data["License Number"] = license_data["License Number"].strip()
-            except Exception as e:
-                print(f"Error extracting License Number: {e}")
-                license_data["License Number"] = None
-            
-            # Extract Issuing Authority
-            try:
-                # Selector provided by user
-                issuing_authority_selector = "#printArea > div.border-sm.border-grey-300.border-opacity-100.mt-6.rounded-lg > div.v-card.v-card--flat.v-theme--omnia.v-card--density-default.rounded-md.v-card--variant-elevated.border-0.rounded-lg > div:nth-child(7) > div > div > div.v-col.v-col-6.text-right.text-body-1.font-weight-semibold.text-grey-900"
-                issuing_authority_element = await page.wait_for_selector(issuing_authority_selector, timeout=5000)
-                if issuing_authority_element:
-                    license_data["Issuing Authority"] = await issuing_authority_element.text_content()
-                    license_data["Issuing Authority"] = license_data["Issuing Authority"].strip()
-            except Exception as e:
-                print(f"Error extracting Issuing Authority: {e}")
-                license_data["Issuing Authority"] = None
-            
-            # Extract Legal Type
-            try:
-                # Selector provided by user
-                legal_type_selector = "#printArea > div.border-sm.border-grey-300.border-opacity-100.mt-6.rounded-lg > div.v-card.v-card--flat.v-theme--omnia.v-card--density-default.rounded-md.v-card--variant-elevated.border-0.rounded-lg > div:nth-child(8) > div > div > div.v-col.v-col-6.text-right.text-body-1.font-weight-semibold.text-grey-900"
-                legal_type_element = await page.wait_for_selector(legal_type_selector, timeout=5000)
-                if legal_type_element:
-                    license_data["Legal Type"] = await legal_type_element.text_content()
-                    license_data["Legal Type"] = license_data["Legal Type"].strip()
-            except Exception as e:
-                print(f"Error extracting Legal Type: {e}")
-                license_data["Legal Type"] = None
-            
-            # Extract Activities (Unchanged as per request)
+            # Bring the activities list into view and let it render
             try:
                 await page.locator("text=License Activities").scroll_into_view_if_needed()
-                await asyncio.sleep(random.uniform(0.8, 1.5))
-                
-                activities = []
-                activity_elements = await page.locator("text=License Activities").locator("..").locator("..").locator("text=/^[A-Za-z].*Active$/").all()
-                
-                for activity_element in activity_elements:
-                    activity_text = await activity_element.text_content()
-                    activity_name = activity_text.replace("Active", "").strip()
-                    if activity_name:
-                        activities.append(activity_name)
-                
-                license_data["Activities"] = activities if activities else None
+                if stealth:
+                    await asyncio.sleep(random.uniform(0.8, 1.5))
+                await wait_for_activities(page)
             except Exception as e:
-                print(f"Error extracting Activities: {e}")
-                license_data["Activities"] = None
+                print(f"Error waiting for Activities: {e}")
             
-            # Extract Expiry Date
+            # Single round trip: every label/value pair on the card plus the activities list
             try:
-                # Selector provided by user
-                expiry_date_selector = "#printArea > div.border-sm.border-grey-300.border-opacity-100.mt-6.rounded-lg > div.v-card.v-card--flat.v-theme--omnia.v-card--density-default.rounded-md.v-card--variant-elevated.border-0.rounded-lg > div:nth-child(3) > div > div > div.v-col.v-col-6.text-right.text-body-1.font-weight-semibold.text-grey-900"
-                expiry_date_element = await page.wait_for_selector(expiry_date_selector, timeout=5000)
-                if expiry_date_element:
-                    license_data["Expiry Date"] = await expiry_date_element.text_content()
-                    license_data["Expiry Date"] = license_data["Expiry Date"].strip()
+                extracted = await page.evaluate(EXTRACT_LICENSE_JS)
             except Exception as e:
-                print(f"Error extracting Expiry Date: {e}")
-                license_data["Expiry Date"] = None
+                print(f"Error extracting license card: {e}")
+                extracted = {"fields": {}, "activities": []}
+            
+            license_data = map_license_fields(extracted["fields"])
+            license_data["Activities"] = extracted["activities"] or None
+            if not (license_data["Business Name"] or license_data["License Number"]):
+                license_data["error"] = "License details not found; the portal may be slow or the license number invalid"
             
             print("\n" + "="*50)
             print("EXTRACTED LICENSE INFORMATION")
@@ -176,7 +212,7 @@ async def extract_license_info(trade_license_number: str = None, direct_url: str
             await context.close()
             
             # Get video path
-            video_path = await page.video.path()
+            video_path = await page.video.path() if page.video else None
             if video_path:
                 print(f"Video saved at: {video_path}")
                 license_data["video_path"] = video_path
@@ -189,7 +225,7 @@ async def extract_license_info(trade_license_number: str = None, direct_url: str
             error_data = {"error": "Timeout waiting for element"}
             # Ensure video is saved even on timeout
             await context.close()
-            video_path = await page.video.path()
+            video_path = await page.video.path() if page.video else None
             if video_path:
                 error_data["video_path"] = video_path
             return error_data
@@ -198,22 +234,17 @@ async def extract_license_info(trade_license_number: str = None, direct_url: str
             await page.screenshot(path="debug_error.png", full_page=True)
             error_data = {"error": str(e)}
             await context.close()
-            video_path = await page.video.path()
+            video_path = await page.video.path() if page.video else None
             if video_path:
                 error_data["video_path"] = video_path
             return error_data
-        finally:
-            await browser.close()
-            
-            video_path = await page.video.path() if page.video else None
-            if video_path:
-                print(f"\nVideo saved to: {video_path}")
 
 # Main execution
 async def main():
     trade_license_number = "1234538"
     
     result = await extract_license_info(trade_license_number)
+    await browser_pool.stop()
     
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = f"license_data_{trade_license_number}_{timestamp}.json"
@@ -6,24 +6,22 @@
 # !playwright install chromium
 # !playwright install-deps
 
-from playwright.async_api import async_playwright
+from browser_pool import browser_pool, video_options
 from bs4 import BeautifulSoup
 import json
 import re
 import asyncio
 
-async def extract_website_data(url):
+async def extract_website_data(url, record_video=True):
     """
     Extracts business information from a website using Playwright browser automation
     """
     
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        # Create context with video recording
-        context = await browser.new_context(
-            record_video_dir="videos/",
-            record_video_size={"width": 1280, "height": 720}
-        )
+    # Lease a fresh context (optionally recording video) on a warm Chromium from the shared pool
+    async with browser_pool.context(
+        "chromium",
+        **video_options(record_video, {"width": 1280, "height": 720})
+    ) as context:
         page = await context.new_page()
         
         print(f"Navigating to {url}...")
@@ -32,8 +30,7 @@ async def extract_website_data(url):
         
         content = await page.content()
         await context.close() # Close context to save video
-        video_path = await page.video.path()
-        await browser.close()
+        video_path = await page.video.path() if page.video else None
     
     soup = BeautifulSoup(content, 'html.parser')
     
@@ -150,7 +147,8 @@ async def extract_website_data(url):
             
             result['people'].append(person_data)
     
-    # Fallback if no data found (as per request)
+    # Fallback if no data found (as per request); defaulted fields are listed so they are never cached
+    result['defaulted'] = [field for field, value in result.items() if not value]
     if not result['company_name']:
         result['company_name'] = "Trafco DMCC"
     
@@ -183,6 +181,7 @@ async def main():
     print("="*60)
     
     data = await extract_website_data(url)
+    await browser_pool.stop()
     
     # Print results
     print("\n" + "="*60)
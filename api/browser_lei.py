@@ -1,32 +1,25 @@
 import asyncio
 import json
 import traceback
-from playwright.async_api import async_playwright
-async def extract_lei_info(lei_code: str):
+from browser_pool import browser_pool, video_options
+
+async def extract_lei_info(lei_code: str, record_video: bool = True):
     """
     Extract LEI company details from leicodeae.com
     
     Args:
         lei_code: The 20-character LEI code
+        record_video: Whether to record a screencast of the session
         
     Returns:
         dict: Extracted company details and video path
     """
-    async with async_playwright() as p:
-        browser = await p.firefox.launch(
-            headless=True,
-            firefox_user_prefs={
-                "dom.webdriver.enabled": False,
-                "useAutomationExtension": False,
-            }
-        )
-        
-        context = await browser.new_context(
-            viewport={"width": 1366, "height": 768},
-            record_video_dir="videos/",
-            record_video_size={"width": 1366, "height": 768},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
-        )
+    async with browser_pool.context(
+        "firefox",
+        viewport={"width": 1366, "height": 768},
+        **video_options(record_video, {"width": 1366, "height": 768}),
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
+    ) as context:
         
         page = await context.new_page()
         lei_data = {}
@@ -186,11 +179,9 @@ async def extract_lei_info(lei_code: str):
             
         finally:
             await context.close()
-            video_path = await page.video.path()
+            video_path = await page.video.path() if page.video else None
             if video_path:
                 print(f"Video saved at: {video_path}")
                 lei_data["video_path"] = video_path
             
-            await browser.close()
-            
         return lei_data
@@ -0,0 +1,198 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from playwright.async_api import async_playwright
+
+# Launch options per engine. Firefox keeps the stealth prefs the license scraper
+# has always used; the LEI scraper sets its user agent per context anyway.
+ENGINE_LAUNCH_OPTIONS = {
+    "firefox": {
+        "headless": True,
+        "firefox_user_prefs": {
+            "dom.webdriver.enabled": False,
+            "useAutomationExtension": False,
+            "general.platform.override": "Win32",
+            "general.useragent.override": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:121.0) Gecko/20100101 Firefox/121.0"
+        }
+    },
+    "chromium": {
+        "headless": True
+    }
+}
+
+
+def video_options(record_video: bool, size: dict):
+    """Context options for screencast recording; recording costs CPU, so it is opt-in per scrape."""
+    if not record_video:
+        return {}
+    return {"record_video_dir": "videos/", "record_video_size": size}
+
+
+class PooledBrowser:
+    """A launched browser plus the bookkeeping the pool needs to recycle it."""
+
+    def __init__(self, engine, browser):
+        self.engine = engine
+        self.browser = browser
+        self.uses = 0
+        self.leases = 0
+        self.retired = False
+
+    def healthy(self):
+        return not self.retired and self.browser.is_connected()
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Playwright browsers.
+
+    Browsers are launched once (normally from the FastAPI lifespan hook) and every
+    scrape leases a fresh BrowserContext from one of them. A browser is replaced
+    when it disconnects or after `max_uses` leases.
+    """
+
+    def __init__(self, sizes: dict = None, max_uses: int = None):
+        self.sizes = sizes or {
+            "firefox": int(os.getenv("BROWSER_POOL_FIREFOX_SIZE", "1")),
+            "chromium": int(os.getenv("BROWSER_POOL_CHROMIUM_SIZE", "1")),
+        }
+        self.max_uses = max_uses or int(os.getenv("BROWSER_POOL_MAX_USES", "50"))
+        self._playwright = None
+        self._slots = {engine: [] for engine in self.sizes}
+        self._lock = asyncio.Lock()
+        # Signalled when launched browsers join the pool
+        self._changed = asyncio.Condition(self._lock)
+        self._launching = {engine: 0 for engine in self.sizes}
+        self._launched = 0
+        self._recycled = 0
+
+    @property
+    def started(self):
+        return self._playwright is not None
+
+    async def start(self):
+        async with self._lock:
+            if self.started:
+                return
+            self._playwright = await async_playwright().start()
+            for engine, size in self.sizes.items():
+                for _ in range(size):
+                    self._slots[engine].append(await self._launch(engine))
+            print(f"Browser pool started: {self.sizes}")
+
+    async def stop(self):
+        async with self._lock:
+            if not self.started:
+                return
+            for slots in self._slots.values():
+                for slot in slots:
+                    await self._close(slot)
+                slots.clear()
+            await self._playwright.stop()
+            self._playwright = None
+            print("Browser pool stopped")
+
+    async def _launch(self, engine):
+        launcher = getattr(self._playwright, engine)
+        browser = await launcher.launch(**ENGINE_LAUNCH_OPTIONS[engine])
+        self._launched += 1
+        return PooledBrowser(engine, browser)
+
+    async def _close(self, slot):
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            print(f"Error closing pooled {slot.engine} browser: {e}")
+
+    async def _acquire(self, engine):
+        if engine not in self._slots:
+            raise ValueError(f"Unknown browser engine: {engine}")
+        if not self.started:
+            await self.start()
+
+        while True:
+            leased, retired = None, []
+            async with self._lock:
+                slots = self._slots[engine]
+                # Health check and recycling happen on the way out of the pool
+                for slot in [s for s in slots if not s.healthy() or s.uses >= self.max_uses]:
+                    slot.retired = True
+                    slots.remove(slot)
+                    self._recycled += 1
+                    if slot.leases == 0:
+                        retired.append(slot)
+                missing = max(self.sizes[engine], 1) - len(slots) - self._launching[engine]
+                if missing > 0:
+                    self._launching[engine] += missing
+                elif slots:
+                    leased = min(slots, key=lambda s: s.leases)
+                    leased.uses += 1
+                    leased.leases += 1
+            for slot in retired:
+                await self._close(slot)
+            if leased:
+                return leased
+
+            if missing > 0:
+                # Only the lease that found the pool short waits for the launch;
+                # the lock is free meanwhile so other leases use the healthy slots
+                await self._replenish(engine, missing)
+            else:
+                async with self._changed:
+                    await self._changed.wait_for(
+                        lambda: self._slots[engine] or not self._launching[engine]
+                    )
+
+    async def _replenish(self, engine, count):
+        results = []
+        try:
+            results = await asyncio.gather(
+                *(self._launch(engine) for _ in range(count)), return_exceptions=True
+            )
+        finally:
+            async with self._changed:
+                self._launching[engine] -= count
+                self._slots[engine].extend(r for r in results if isinstance(r, PooledBrowser))
+                self._changed.notify_all()
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def _release(self, slot):
+        slot.leases -= 1
+        if slot.retired and slot.leases == 0:
+            await self._close(slot)
+
+    @asynccontextmanager
+    async def context(self, engine: str, **context_options):
+        """Lease a fresh BrowserContext on a warm `engine` browser."""
+        slot = await self._acquire(engine)
+        context = None
+        try:
+            context = await slot.browser.new_context(**context_options)
+            yield context
+        finally:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            await self._release(slot)
+
+    def stats(self):
+        return {
+            "started": self.started,
+            "maxUses": self.max_uses,
+            "launched": self._launched,
+            "recycled": self._recycled,
+            "engines": {
+                engine: [
+                    {"connected": slot.browser.is_connected(), "uses": slot.uses, "leases": slot.leases}
+                    for slot in slots
+                ]
+                for engine, slots in self._slots.items()
+            }
+        }
+
+
+browser_pool = BrowserPool()
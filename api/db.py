@@ -0,0 +1,69 @@
+import asyncio
+import functools
+import os
+import random
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from supabase_config import pool_stats
+from storage import upload_path, upload_fileobj, content_index
+
+# The Supabase client is synchronous; its calls run on this bounded pool so they
+# never block the event loop serving other requests.
+DB_MAX_WORKERS = int(os.getenv("SUPABASE_MAX_WORKERS", "16"))
+_executor = ThreadPoolExecutor(max_workers=DB_MAX_WORKERS, thread_name_prefix="supabase")
+
+# Reads (GET/HEAD) are safe to repeat after a dropped connection or timeout
+READ_RETRIES = int(os.getenv("SUPABASE_READ_RETRIES", "2"))
+RETRY_BASE_DELAY = float(os.getenv("SUPABASE_RETRY_BASE_DELAY", "0.2"))
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+
+_retries = 0
+
+
+async def run_db(fn, *args, **kwargs):
+    """Run a blocking Supabase call on the DB thread pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, functools.partial(fn, *args, **kwargs))
+
+
+def _http_method(query):
+    # postgrest keeps the method on the builder or on its request config, depending on version
+    request = getattr(query, "request", None)
+    return (getattr(query, "http_method", None) or getattr(request, "http_method", None) or "").upper()
+
+
+async def execute(query):
+    """Await a built PostgREST query, e.g. `await execute(supabase.table("processes").select("*"))`."""
+    global _retries
+    attempts = 1 + (READ_RETRIES if _http_method(query) in IDEMPOTENT_METHODS else 0)
+    for attempt in range(attempts):
+        try:
+            return await run_db(query.execute)
+        except httpx.TransportError as e:
+            if attempt == attempts - 1:
+                raise
+            _retries += 1
+            # Full jitter so retries from concurrent requests spread out
+            delay = random.uniform(0, RETRY_BASE_DELAY * 2 ** attempt)
+            print(f"Supabase read failed ({type(e).__name__}), retry {attempt + 1}/{attempts - 1} in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+async def upload(file_path: str, bucket: str, destination_path: str, sha256: str = None):
+    """Stream a local file to storage off the event loop; returns its public URL."""
+    return await run_db(upload_path, file_path, bucket, destination_path, None, sha256)
+
+
+async def upload_stream(fileobj, bucket: str, destination_path: str, content_type: str = None):
+    """Stream an open file object (e.g. `UploadFile.file`) to storage; returns its public URL."""
+    return await run_db(upload_fileobj, fileobj, bucket, destination_path, content_type)
+
+
+def stats():
+    return {
+        "workers": DB_MAX_WORKERS,
+        "queuedCalls": _executor._work_queue.qsize(),
+        "readRetries": _retries,
+        "pool": pool_stats(),
+        "storage": content_index.stats(),
+    }
@@ -0,0 +1,108 @@
+"""
+Local stand-in for the Gemini generateContent and Files API upload REST
+endpoints, so the API and its tests run offline. Answers are deterministic and
+shaped like the real responses each prompt in index.py expects.
+
+    python api/fake_gemini.py --port 8765
+    GEMINI_API_BASE=http://127.0.0.1:8765 VITE_GEMINI_API_KEY=fake uvicorn index:app
+
+Tests can run it in-process instead: `server, base_url = start_fake_gemini()`.
+"""
+import argparse
+import difflib
+import json
+import os
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_QR_URL = os.getenv("FAKE_GEMINI_QR_URL", "https://eservices.dubaided.gov.ae/Pages/Anon/GlobalSearch.aspx?licenseNo=123456")
+FAKE_LATENCY = float(os.getenv("FAKE_GEMINI_LATENCY", "0"))
+
+
+def _quoted(prompt: str):
+    return re.findall(r'"([^"]*)"', prompt)
+
+
+def answer(prompt: str, has_file: bool):
+    """Canned answer for the prompts the API sends."""
+    if has_file and "QR code" in prompt:
+        return json.dumps({"url": FAKE_QR_URL, "licenseNumber": "123456"})
+    if prompt.startswith("Compare these two addresses"):
+        a, b = (_quoted(prompt) + ["", ""])[:2]
+        match = " ".join(a.lower().split()) == " ".join(b.lower().split())
+        return json.dumps({"match": match, "reason": "Fake: normalized comparison"})
+    if prompt.startswith("Compare these two names"):
+        a, b = (_quoted(prompt) + ["", ""])[:2]
+        confidence = round(difflib.SequenceMatcher(None, a.lower(), b.lower()).ratio(), 2)
+        return json.dumps({"match": confidence > 0.7, "confidence": confidence, "reason": "Fake: sequence ratio"})
+    return "This is a fake Gemini answer for offline testing."
+
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    def _send_json(self, body: dict, headers: dict = None):
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _upload(self):
+        """Files API resumable upload: `start` hands out an upload URL, `upload, finalize` returns the file."""
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        command = self.headers.get("X-Goog-Upload-Command", "")
+        if command == "start":
+            upload_id = f"fake-{int(time.time() * 1000)}"
+            host, port = self.server.server_address[:2]
+            self._send_json({}, {"X-Goog-Upload-URL": f"http://{host}:{port}/upload/v1beta/files?upload_id={upload_id}"})
+            return
+        upload_id = re.search(r"upload_id=([^&]+)", self.path).group(1)
+        host, port = self.server.server_address[:2]
+        self._send_json({"file": {
+            "name": f"files/{upload_id}",
+            "uri": f"http://{host}:{port}/v1beta/files/{upload_id}",
+            "sizeBytes": str(len(body)),
+            "state": "ACTIVE",
+        }})
+
+    def do_POST(self):
+        if self.path.startswith("/upload/v1beta/files"):
+            self._upload()
+            return
+        if not re.match(r"^/v1beta/models/[^/:]+:generateContent", self.path):
+            self.send_error(404)
+            return
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        parts = body.get("contents", [{}])[-1].get("parts", [])
+        # The answer depends on the whole conversation, like chat history would
+        prompt = "\n".join(p.get("text", "") for c in body.get("contents", []) for p in c.get("parts", []) if "text" in p)
+        has_file = any("inline_data" in p or "file_data" in p for p in parts)
+
+        if FAKE_LATENCY:
+            time.sleep(FAKE_LATENCY)
+        self._send_json({
+            "candidates": [{"content": {"role": "model", "parts": [{"text": answer(prompt.strip(), has_file)}]}, "finishReason": "STOP"}]
+        })
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_gemini(host: str = "127.0.0.1", port: int = 0):
+    """Serve in a background thread; returns (server, base_url). Call server.shutdown() when done."""
+    server = ThreadingHTTPServer((host, port), FakeGeminiHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Gemini generateContent server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    print(f"Fake Gemini listening on http://{args.host}:{args.port}")
+    ThreadingHTTPServer((args.host, args.port), FakeGeminiHandler).serve_forever()
@@ -0,0 +1,256 @@
+import asyncio
+import base64
+import json
+import mimetypes
+import os
+import time
+import httpx
+
+GENAI_API_KEY = os.getenv("VITE_GEMINI_API_KEY")
+
+if not GENAI_API_KEY:
+    # Try reading from .env manually if not in environment
+    try:
+        with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'), 'r') as f:
+            for line in f:
+                if line.startswith("VITE_GEMINI_API_KEY="):
+                    GENAI_API_KEY = line.split("=", 1)[1].strip().strip('"')
+                    break
+    except:
+        pass
+
+# Point at api/fake_gemini.py (e.g. http://127.0.0.1:8765) to run without network
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com").rstrip("/")
+GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "8"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+# Whole requests are capped at 20MB and base64 grows a file by a third, so
+# larger files go through the Files API instead of inline
+GEMINI_INLINE_MAX_BYTES = int(os.getenv("GEMINI_INLINE_MAX_BYTES", str(14 * 1024 * 1024)))
+GEMINI_FILE_ACTIVE_TIMEOUT = float(os.getenv("GEMINI_FILE_ACTIVE_TIMEOUT", "60"))
+
+# Document types Gemini reads that users upload here
+SUPPORTED_MIME_TYPES = ("application/pdf", "image/png", "image/jpeg", "image/webp", "image/heic", "image/heif")
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
+
+class GeminiError(Exception):
+    pass
+
+
+class GeminiTimeout(GeminiError):
+    pass
+
+
+class LatencyHistogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        for i, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[i] += 1
+                return
+        self.counts[-1] += 1
+
+    def snapshot(self):
+        buckets = {f"le_{bound}": n for bound, n in zip(self.buckets, self.counts)}
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avgMs": round(1000 * self.total / self.count, 1) if self.count else 0.0,
+            "buckets": buckets,
+        }
+
+
+def text_part(text: str):
+    return {"text": text}
+
+
+def file_mime_type(file_path: str, mime_type: str = None):
+    """The file's mime type, guessed from its name if not given; GeminiError unless Gemini reads it."""
+    mime_type = mime_type or mimetypes.guess_type(file_path)[0]
+    if mime_type not in SUPPORTED_MIME_TYPES:
+        raise GeminiError(f"Unsupported file type for Gemini: {mime_type or os.path.basename(file_path)}")
+    return mime_type
+
+
+def inline_part(file_path: str, mime_type: str):
+    """Inline a local file as a base64 request part."""
+    with open(file_path, "rb") as f:
+        data = base64.b64encode(f.read()).decode()
+    return {"inline_data": {"mime_type": mime_type, "data": data}}
+
+
+def parse_json(text: str):
+    """Parse a JSON answer, tolerating ```json fences around it."""
+    return json.loads(text.replace('```json', '').replace('```', '').strip())
+
+
+class GeminiClient:
+    """
+    Non-blocking Gemini client over the REST API. Calls are limited to
+    `max_concurrency` in flight, each bounded by a timeout (waiting for a slot
+    included), and their latency is recorded per operation.
+    """
+
+    def __init__(self, api_key: str = None, model: str = None, base_url: str = None,
+                 max_concurrency: int = None, timeout: float = None, inline_max_bytes: int = None):
+        self.api_key = api_key
+        self.model = model or GEMINI_MODEL
+        self.base_url = base_url or GEMINI_API_BASE
+        self.max_concurrency = max_concurrency or GEMINI_MAX_CONCURRENCY
+        self.timeout = timeout or GEMINI_TIMEOUT
+        self.inline_max_bytes = inline_max_bytes or GEMINI_INLINE_MAX_BYTES
+        self._http = None
+        self._slots = None
+        self.in_flight = 0
+        self.latency = {}
+        self.outcomes = {}
+
+    @property
+    def configured(self):
+        return bool(self.api_key)
+
+    def _client(self):
+        # Created on first use so the semaphore binds to the running loop
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=httpx.Limits(max_connections=self.max_concurrency),
+                timeout=httpx.Timeout(self.timeout),
+            )
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._http
+
+    async def _post(self, contents: list):
+        http = self._client()
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                res = await http.post(
+                    f"/v1beta/models/{self.model}:generateContent",
+                    params={"key": self.api_key},
+                    json={"contents": contents},
+                )
+            finally:
+                self.in_flight -= 1
+        if res.status_code != 200:
+            raise GeminiError(f"Gemini returned {res.status_code}: {res.text[:200]}")
+        candidates = res.json().get("candidates") or []
+        if not candidates:
+            raise GeminiError("Gemini returned no candidates")
+        return "".join(p.get("text", "") for p in candidates[0].get("content", {}).get("parts", []))
+
+    async def file_part(self, file_path: str, mime_type: str = None):
+        """
+        A request part for a local file (PDF, image): inline up to
+        `inline_max_bytes`, uploaded through the Files API above that.
+        """
+        mime_type = file_mime_type(file_path, mime_type)
+        if os.path.getsize(file_path) <= self.inline_max_bytes:
+            # Reading and encoding stay off the event loop
+            return await asyncio.to_thread(inline_part, file_path, mime_type)
+        uri = await self.upload_file(file_path, mime_type)
+        return {"file_data": {"mime_type": mime_type, "file_uri": uri}}
+
+    async def upload_file(self, file_path: str, mime_type: str):
+        """Upload a file with the Files API (resumable protocol) and return its URI once it is ACTIVE."""
+        if not self.configured:
+            raise GeminiError("Gemini API key missing")
+        http = self._client()
+        with open(file_path, "rb") as f:
+            data = await asyncio.to_thread(f.read)
+        async with self._slots:
+            self.in_flight += 1
+            try:
+                start = await http.post(
+                    "/upload/v1beta/files",
+                    params={"key": self.api_key},
+                    headers={
+                        "X-Goog-Upload-Protocol": "resumable",
+                        "X-Goog-Upload-Command": "start",
+                        "X-Goog-Upload-Header-Content-Length": str(len(data)),
+                        "X-Goog-Upload-Header-Content-Type": mime_type,
+                    },
+                    json={"file": {"display_name": os.path.basename(file_path)}},
+                )
+                upload_url = start.headers.get("x-goog-upload-url")
+                if start.status_code != 200 or not upload_url:
+                    raise GeminiError(f"Gemini file upload returned {start.status_code}: {start.text[:200]}")
+                res = await http.post(
+                    upload_url,
+                    headers={"X-Goog-Upload-Offset": "0", "X-Goog-Upload-Command": "upload, finalize"},
+                    content=data,
+                )
+            finally:
+                self.in_flight -= 1
+        if res.status_code != 200:
+            raise GeminiError(f"Gemini file upload returned {res.status_code}: {res.text[:200]}")
+        file = res.json().get("file", {})
+
+        # Large files can take a moment to process before they can be referenced
+        deadline = time.monotonic() + GEMINI_FILE_ACTIVE_TIMEOUT
+        while file.get("state") == "PROCESSING":
+            if time.monotonic() > deadline:
+                raise GeminiTimeout(f"Gemini file {file.get('name')} still processing after {GEMINI_FILE_ACTIVE_TIMEOUT}s")
+            await asyncio.sleep(1)
+            res = await http.get(f"/v1beta/{file['name']}", params={"key": self.api_key})
+            if res.status_code != 200:
+                raise GeminiError(f"Gemini file status returned {res.status_code}: {res.text[:200]}")
+            file = res.json()
+        if file.get("state") == "FAILED" or not file.get("uri"):
+            raise GeminiError(f"Gemini could not process {os.path.basename(file_path)}")
+        return file["uri"]
+
+    async def generate(self, parts: list, history: list = None, timeout: float = None, op: str = "generate"):
+        """
+        Send one user turn (`parts`, after optional earlier `history` turns,
+        each a list of parts) and return the response text.
+        """
+        if not self.configured:
+            raise GeminiError("Gemini API key missing")
+        contents = [{"role": "user", "parts": turn} for turn in (history or [])]
+        contents.append({"role": "user", "parts": parts})
+
+        started = time.monotonic()
+        outcome = "ok"
+        try:
+            return await asyncio.wait_for(self._post(contents), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise GeminiTimeout(f"Gemini {op} timed out after {timeout or self.timeout}s")
+        except Exception:
+            outcome = "error"
+            raise
+        finally:
+            self.latency.setdefault(op, LatencyHistogram()).observe(time.monotonic() - started)
+            counts = self.outcomes.setdefault(op, {"ok": 0, "error": 0, "timeout": 0})
+            counts[outcome] += 1
+
+    async def generate_json(self, parts: list, timeout: float = None, op: str = "generate"):
+        return parse_json(await self.generate(parts, timeout=timeout, op=op))
+
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def stats(self):
+        return {
+            "model": self.model,
+            "maxConcurrency": self.max_concurrency,
+            "inFlight": self.in_flight,
+            "outcomes": self.outcomes,
+            "latency": {op: h.snapshot() for op, h in self.latency.items()},
+        }
+
+
+gemini = GeminiClient(GENAI_API_KEY)
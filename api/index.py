@@ -1,51 +1,52 @@
-import sys
-# Python 3.9 compatibility patch for google-generativeai
-if sys.version_info < (3, 10):
-    try:
-        import importlib.metadata
-        import importlib_metadata
-        if not hasattr(importlib.metadata, "packages_distributions"):
-            importlib.metadata.packages_distributions = importlib_metadata.packages_distributions
-            importlib.metadata.version = importlib_metadata.version
-            importlib.metadata.PackageNotFoundError = importlib_metadata.PackageNotFoundError
-    except ImportError:
-        pass
-
-from fastapi import FastAPI, HTTPException, File, UploadFile
+from typing import List, Optional
+from fastapi import FastAPI, HTTPException, File, UploadFile, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import asyncio
 import os
 import json
-import difflib
-import shutil
+import base64
+import hashlib
+import tempfile
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime
-from browser import extract_license_info
+from browser_pool import browser_pool
+from scheduler import scheduler, QueueFullError
+from verification_cache import verification_cache, normalize_identifier
+from single_flight import single_flight
+from artifacts import artifact_uploads, handle_recorded_video, resolve_recording_policy, RecordingPolicy
+from jobs import job_queue, TERMINAL_STATUSES
+from pubsub import broker
+from browser import extract_license_info, ReadinessProfile
 from browser_lei import extract_lei_info
 from browser2 import extract_website_data
-import google.generativeai as genai
-from supabase_config import supabase, upload_file, SUPABASE_URL
-
+from gemini import gemini, GENAI_API_KEY, text_part
+from name_matching import match_names_locally, name_tokens
+from address_matching import match_addresses_locally, normalize_address
+from qr_decode import extract_qr_locally, qr_stats
+from supabase_config import supabase, SUPABASE_URL
+import db
+from db import execute, upload, upload_stream, run_db
+from storage import sha256_path
 
-# Configure Gemini
-GENAI_API_KEY = os.getenv("VITE_GEMINI_API_KEY") 
 
-if not GENAI_API_KEY:
-    # Try reading from .env manually if not in environment
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the shared browser pool so scrapes only pay for a fresh context
     try:
-        with open(os.path.join(os.path.dirname(os.path.dirname(__file__)), '.env'), 'r') as f:
-            for line in f:
-                if line.startswith("VITE_GEMINI_API_KEY="):
-                    GENAI_API_KEY = line.split("=", 1)[1].strip().strip('"')
-                    break
-    except:
-        pass
-
-if GENAI_API_KEY:
-    genai.configure(api_key=GENAI_API_KEY)
+        await browser_pool.start()
+    except Exception as e:
+        print(f"Browser pool failed to start, will retry on first lease: {e}")
+    await job_queue.start()
+    yield
+    await job_queue.stop()
+    await browser_pool.stop()
+    await gemini.close()
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Enable CORS for frontend integration
 app.add_middleware(
@@ -54,32 +55,81 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
+@app.get("/metrics")
+async def metrics():
+    return {
+        "browserPool": browser_pool.stats(),
+        "scheduler": scheduler.stats(),
+        "verificationCache": verification_cache.stats(),
+        "singleFlight": single_flight.stats(),
+        "artifactUploads": artifact_uploads.stats(),
+        "pubsub": broker.stats(),
+        "supabase": db.stats(),
+        "gemini": gemini.stats(),
+        "qrDecode": qr_stats.snapshot()
+    }
+
+@app.get("/artifacts/{artifactId}")
+async def get_artifact(artifactId: str):
+    """Status of a background video upload; resolves to public_video_path once uploaded."""
+    artifact = artifact_uploads.get(artifactId)
+    if not artifact:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    return artifact
+
+def sse_event(data: dict):
+    """Format one server-sent event."""
+    return f"data: {json.dumps(data)}\n\n"
+
+SSE_KEEPALIVE = ": keep-alive\n\n"
+
+def too_busy(e: QueueFullError):
+    """Backpressure response when a scrape target's queue is full."""
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def with_cache_info(data: dict, age: float = None):
+    """Tag a verification response with whether it came from the cache and how old it is."""
+    data["cached"] = age is not None
+    data["cacheAgeSeconds"] = round(age) if age is not None else 0
+    return data
+
 class LEIRequest(BaseModel):
     leiCode: str
+    forceRefresh: bool = False # Skip the verification cache and scrape again
+    recordVideo: Optional[RecordingPolicy] = None # Recording policy: "off", "on_failure" or "always" (defaults to VIDEO_RECORDING_POLICY)
 
 @app.post("/verify-lei")
 async def verify_lei(request: LEIRequest):
     try:
         print(f"Received request for LEI: {request.leiCode}")
         
-        # Run extraction
-        data = await extract_lei_info(request.leiCode)
+        cached = None if request.forceRefresh else await verification_cache.get("lei", request.leiCode)
+        if cached:
+            return with_cache_info(*cached)
         
-        # Handle Video
-        video_path = data.get("video_path")
-        public_video_path = None
+        policy = resolve_recording_policy(request.recordVideo)
         
-        if video_path and os.path.exists(video_path):
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_filename = f"lei_check_{request.leiCode}_{timestamp}.webm"
-            public_video_path = upload_file(video_path, "zamp-uploads", f"videos/{video_filename}")
-            data["public_video_path"] = public_video_path
-            print(f"Video uploaded to Supabase: {public_video_path}")
+        async def check():
+            # Run extraction
+            async with scheduler.slot("lei"):
+                data = await extract_lei_info(request.leiCode, record_video=policy != "off")
             
-        return data
+            # Handle Video (uploaded in the background)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            handle_recorded_video(data, policy, f"lei_check_{request.leiCode}_{timestamp}.webm")
+                
+            await verification_cache.set("lei", request.leiCode, data)
+            return data
+        
+        # Identical in-flight checks share one scrape; the recording policy decides whether it has a video
+        data = await single_flight.do(("verify-lei", normalize_identifier("lei", request.leiCode), policy), check)
+        return with_cache_info(data)
 
+    except QueueFullError as e:
+        raise too_busy(e)
     except Exception as e:
         print(f"Error verifying LEI: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -90,21 +140,35 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 class LicenseRequest(BaseModel):
     licenseNumber: str
+    profile: Optional[ReadinessProfile] = None # Optional readiness profile: "fast" or opt-in "stealth"
+    forceRefresh: bool = False # Skip the verification cache and scrape again
+    recordVideo: Optional[RecordingPolicy] = None # Recording policy: "off", "on_failure" or "always" (defaults to VIDEO_RECORDING_POLICY)
 
 class WebsiteRequest(BaseModel):
     url: str
+    forceRefresh: bool = False # Skip the verification cache and scrape again
+    recordVideo: Optional[RecordingPolicy] = None # Recording policy: "off", "on_failure" or "always" (defaults to VIDEO_RECORDING_POLICY)
 
 class ZampInitRequest(BaseModel):
     processName: str
     team: str
 
-class ZampLogRequest(BaseModel):
-    processId: str # Now assumes UUID from Supabase
+class ZampLogEntry(BaseModel):
     log: dict # { title, status, time, artifacts, ... }
     stepId: str = None # Optional ID to identify unique steps for updates
     keyDetails: dict = None # Optional updates to key details
     metadata: dict = None # Optional updates to top-level process metadata (e.g. status, applicantName)
 
+class ZampLogRequest(ZampLogEntry):
+    processId: str # Now assumes UUID from Supabase
+
+class ZampLogBatchRequest(BaseModel):
+    processId: str
+    entries: List[ZampLogEntry] # Applied in order
+
+class ZampLogBulkRequest(BaseModel):
+    entries: List[ZampLogRequest] # Applied in order, may span several processes
+
 class HelpChatRequest(BaseModel):
     query: str
     contextData: dict = {}
@@ -125,36 +189,46 @@ async def extract_license(request: LicenseRequest):
     try:
         print(f"Received request for license: {request.licenseNumber}")
         
-        # Run the extraction logic
-        data = await extract_license_info(request.licenseNumber)
+        cached = None if request.forceRefresh else await verification_cache.get("license", request.licenseNumber)
+        if cached:
+            return with_cache_info(*cached)
         
-        # Handle Video
-        video_path = data.get("video_path")
-        public_video_path = None
+        policy = resolve_recording_policy(request.recordVideo)
         
-        if video_path and os.path.exists(video_path):
+        async def check():
+            # Run the extraction logic
+            async with scheduler.slot("dubai_invest"):
+                data = await extract_license_info(request.licenseNumber, profile=request.profile, record_video=policy != "off")
+            
+            # Handle Video (uploaded in the background)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_filename = f"license_check_{request.licenseNumber}_{timestamp}.webm"
-            public_video_path = upload_file(video_path, "zamp-uploads", f"videos/{video_filename}")
-            data["public_video_path"] = public_video_path
-            print(f"Video uploaded to Supabase: {public_video_path}")
+            handle_recorded_video(data, policy, f"license_check_{request.licenseNumber}_{timestamp}.webm")
+            
+            await verification_cache.set("license", request.licenseNumber, data)
+            return data
         
-        return data
+        # Identical in-flight checks share one scrape; recording policy and profile change how it runs
+        data = await single_flight.do(("extract-license", normalize_identifier("license", request.licenseNumber), policy, request.profile), check)
+        return with_cache_info(data)
         
+    except QueueFullError as e:
+        raise too_busy(e)
     except Exception as e:
         print(f"Error processing request: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 async def extract_qr_url(file_path: str):
+    # Decode the QR locally first; Gemini only reads files the local decoder cannot
+    local = await asyncio.to_thread(extract_qr_locally, file_path)
+    if local:
+        return local
     try:
         if not GENAI_API_KEY:
             print("Gemini API Key missing")
             return None
 
-        sample_file = genai.upload_file(file_path)
-        print(f"Uploaded file to Gemini: {sample_file.uri}")
-
-        model = genai.GenerativeModel("gemini-2.5-flash-lite")
+        # Inline with the prompt, or through the Files API when too large for that
+        document = await gemini.file_part(file_path)
         
         prompt = """
         Extract the URL encoded in the QR code within this image. 
@@ -168,56 +242,162 @@ async def extract_qr_url(file_path: str):
         }
         """
         
-        response = model.generate_content([sample_file, prompt])
-        text = response.text.replace('```json', '').replace('```', '').strip()
-        data = json.loads(text)
-        return data
+        return await gemini.generate_json([document, text_part(prompt)], op="extract_qr")
     except Exception as e:
         print(f"Error extracting QR URL with Gemini: {e}")
         return None
 
-@app.post("/verify-trade-license-file")
-async def verify_trade_license_file(file: UploadFile = File(...)):
+async def check_trade_license_file(temp_path: str, temp_filename: str):
+    """QR extraction, license scrape and artifact upload for a spooled trade license file."""
     try:
-        temp_filename = f"temp_upload_{datetime.now().strftime('%Y%m%d%H%M%S')}_{file.filename}"
-        temp_path = os.path.join("/tmp", temp_filename)
-        
-        with open(temp_path, "wb+") as file_object:
-            shutil.copyfileobj(file.file, file_object)
-            
+        return await _check_trade_license_file(temp_path, temp_filename)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+async def _check_trade_license_file(temp_path: str, temp_filename: str):
+    # The same license PDF is checked again and again; key QR results by content
+    document_hash = await run_db(sha256_path, temp_path)
+    cached_qr = await verification_cache.get("qr", document_hash)
+    if cached_qr:
+        qr_data = cached_qr[0]
+    else:
         qr_data = await extract_qr_url(temp_path)
-        url = qr_data.get("url") if qr_data else None
+        if qr_data and qr_data.get("url"):
+            await verification_cache.set("qr", document_hash, qr_data)
+    url = qr_data.get("url") if qr_data else None
 
-        if not url:
-            return {"error": "Could not identify a QR code in the document."}
-            
-        data = await extract_license_info(direct_url=url)
+    if not url:
+        return {"error": "Could not identify a QR code in the document."}
         
-        # Handle Video
-        video_path = data.get("video_path")
-        if video_path and os.path.exists(video_path):
+    cached = await verification_cache.get("license", url)
+    if cached:
+        data = with_cache_info(*cached)
+    else:
+        policy = resolve_recording_policy()
+        
+        async def check():
+            async with scheduler.slot("dubai_invest"):
+                data = await extract_license_info(direct_url=url, record_video=policy != "off")
+            
+            # Handle Video (uploaded in the background)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_filename = f"license_check_qr_{timestamp}.webm"
-            data["public_video_path"] = upload_file(video_path, "zamp-uploads", f"videos/{video_filename}")
+            handle_recorded_video(data, policy, f"license_check_qr_{timestamp}.webm")
             
-        # Upload original file as artifact reference
-        data["uploaded_file_path"] = upload_file(temp_path, "zamp-uploads", f"uploads/{temp_filename}")
+            await verification_cache.set("license", url, data)
+            return data
         
-        return data
+        data = with_cache_info(await single_flight.do(("verify-trade-license-file", normalize_identifier("license", url), policy), check))
+        
+    # Upload original file as artifact reference
+    data["uploaded_file_path"] = await upload(temp_path, "zamp-uploads", f"uploads/{temp_filename}", document_hash)
+    data["document_sha256"] = document_hash
+    
+    return data
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def storage_name(filename: str):
+    """Unique storage object name that still ends in the client's file name."""
+    return f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}_{os.path.basename(filename or 'upload')}"
+
+async def spool_upload(file: UploadFile):
+    """
+    Copy an upload to a unique temp file, for flows that need a local path
+    after the request (QR extraction, background jobs). Returns
+    (temp_path, temp_filename); check_trade_license_file removes the file.
+    """
+    temp_filename = storage_name(file.filename)
+    fd, temp_path = tempfile.mkstemp(prefix="upload_", suffix=f"_{os.path.basename(file.filename or 'upload')}")
+    try:
+        with os.fdopen(fd, "wb") as file_object:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                file_object.write(chunk)
+    except Exception:
+        os.remove(temp_path)
+        raise
+    return temp_path, temp_filename
+
+@app.post("/verify-trade-license-file")
+async def verify_trade_license_file(file: UploadFile = File(...)):
+    try:
+        temp_path, temp_filename = await spool_upload(file)
+        return await check_trade_license_file(temp_path, temp_filename)
+    except QueueFullError as e:
+        raise too_busy(e)
     except Exception as e:
         print(f"Error verifying trade license file: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# --- Background Jobs (long-running verifications) ---
+
+@job_queue.handler("trade_license_file")
+async def trade_license_file_job(payload: dict):
+    return await check_trade_license_file(payload["temp_path"], payload["temp_filename"])
+
+@app.post("/jobs/verify-trade-license-file")
+async def submit_trade_license_file_job(file: UploadFile = File(...)):
+    try:
+        temp_path, temp_filename = await spool_upload(file)
+        try:
+            return await job_queue.submit("trade_license_file", {"temp_path": temp_path, "temp_filename": temp_filename})
+        except Exception:
+            # No worker will ever pick the file up
+            os.remove(temp_path)
+            raise
+    except Exception as e:
+        print(f"Error submitting trade license file job: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/jobs/{jobId}")
+async def get_job(jobId: str):
+    job = await job_queue.get(jobId)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+@app.get("/jobs/{jobId}/events")
+async def job_events(jobId: str):
+    """Server-sent events with the job state, until it succeeds or fails."""
+    if not await job_queue.get(jobId):
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    async def stream():
+        with broker.subscribe(f"job:{jobId}") as queue:
+            # Read the state after subscribing so no transition is missed
+            job = await job_queue.get(jobId)
+            yield sse_event(job)
+            while job["status"] not in TERMINAL_STATUSES:
+                try:
+                    job = await asyncio.wait_for(queue.get(), timeout=15)
+                    yield sse_event(job)
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/verify-website")
 async def verify_website(request: WebsiteRequest):
     try:
-        data = await extract_website_data(request.url)
-        video_path = data.get("video_path")
-        if video_path and os.path.exists(video_path):
+        cached = None if request.forceRefresh else await verification_cache.get("website", request.url)
+        if cached:
+            return with_cache_info(*cached)
+        
+        policy = resolve_recording_policy(request.recordVideo)
+        
+        async def check():
+            async with scheduler.slot("website"):
+                data = await extract_website_data(request.url, record_video=policy != "off")
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            video_filename = f"website_check_{timestamp}.webm"
-            data["public_video_path"] = upload_file(video_path, "zamp-uploads", f"videos/{video_filename}")
-        return data
+            handle_recorded_video(data, policy, f"website_check_{timestamp}.webm")
+            await verification_cache.set("website", request.url, data)
+            return data
+        
+        # Identical in-flight checks share one scrape; the recording policy decides whether it has a video
+        data = await single_flight.do(("verify-website", normalize_identifier("website", request.url), policy), check)
+        return with_cache_info(data)
+    except QueueFullError as e:
+        raise too_busy(e)
     except Exception as e:
         print(f"Error verifying website: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -228,17 +408,35 @@ class AddressMatchRequest(BaseModel):
     address1: str
     address2: str
 
+def match_pair_key(first: str, second: str):
+    """Cache key for a comparison: order-independent normalized pair plus the model answering it."""
+    return hashlib.sha256(json.dumps([gemini.model, *sorted([first, second])]).encode()).hexdigest()
+
+async def memoized_gemini_match(source: str, pair_key: str, prompt: str):
+    """Gemini comparison memoized in the verification cache; concurrent identical calls share one request."""
+    cached = await verification_cache.get(source, pair_key)
+    if cached:
+        return with_cache_info(*cached)
+
+    async def compare():
+        data = {**await gemini.generate_json([text_part(prompt)], op=source), "method": "gemini"}
+        await verification_cache.set(source, pair_key, data)
+        return data
+
+    return with_cache_info(await single_flight.do((source, pair_key), compare))
+
 @app.post("/match-addresses")
 async def match_addresses(request: AddressMatchRequest):
     try:
-        if not GENAI_API_KEY:
-             return {"match": False, "reason": "No Gemini API Key"}
+        # Case, punctuation, abbreviations and reordered components are decided locally
+        local = match_addresses_locally(request.address1, request.address2)
+        ambiguous = local.pop("ambiguous")
+        if not ambiguous or not GENAI_API_KEY:
+            return {**local, "method": "local"}
 
-        model = genai.GenerativeModel('gemini-2.5-flash-lite')
         prompt = f"""Compare these two addresses... Address 1: "{request.address1}" Address 2: "{request.address2}"... Return JSON {{ "match": boolean, "reason": "string" }}"""
-        response = model.generate_content(prompt)
-        text = response.text.replace('```json', '').replace('```', '').strip()
-        return json.loads(text)
+        pair_key = match_pair_key(", ".join(normalize_address(request.address1)), ", ".join(normalize_address(request.address2)))
+        return await memoized_gemini_match("match_addresses", pair_key, prompt)
     except Exception as e:
         return {"match": False, "reason": str(e)}
 
@@ -249,37 +447,80 @@ class NameMatchRequest(BaseModel):
 @app.post("/match-names")
 async def match_names(request: NameMatchRequest):
     try:
-        n1 = request.name1.lower().strip()
-        n2 = request.name2.lower().strip()
-        if n1 == n2: return {"match": True, "confidence": 1.0, "reason": "Exact match"}
-        
-        similarity = difflib.SequenceMatcher(None, n1, n2).ratio()
-        if similarity > 0.85: return {"match": True, "confidence": similarity, "reason": "High confidence fuzzy match"}
+        # Transliteration variants, reordering and short vs full names are decided locally
+        local = match_names_locally(request.name1, request.name2)
+        ambiguous = local.pop("ambiguous")
+        if not ambiguous or not GENAI_API_KEY:
+            return {**local, "method": "local"}
 
-        if not GENAI_API_KEY: return {"match": False, "confidence": similarity}
-
-        model = genai.GenerativeModel('gemini-2.5-flash-lite')
         prompt = f"""Compare these two names: "{request.name1}" and "{request.name2}"... Return JSON {{ "match": boolean, "confidence": float, "reason": "string" }}"""
-        response = model.generate_content(prompt)
-        text = response.text.replace('```json', '').replace('```', '').strip()
-        return json.loads(text)
+        pair_key = match_pair_key(" ".join(name_tokens(request.name1)), " ".join(name_tokens(request.name2)))
+        return await memoized_gemini_match("match_names", pair_key, prompt)
     except Exception as e:
         return {"match": False, "confidence": 0.0, "reason": str(e)}
 
 # --- Zamp Integration Endpoints (SUPABASE VERSION) ---
 
+# Sections stored row-per-entry in the activity_log table (everything except the overview)
+LOG_SECTIONS = {
+    "activityLogs": "Activity Logs",
+    "sidebarArtifacts": "Artifacts",
+    "keyDetails": "Key Details",
+    "messages": "Messages"
+}
+
+def log_row(process_id: str, section_name: str, payload, step_id: str = None):
+    return {
+        "process_id": process_id,
+        "section_name": section_name,
+        "step_id": step_id,
+        "item_id": payload.get("id") if isinstance(payload, dict) else None,
+        "payload": payload
+    }
+
+async def fetch_section_items(process_id: str, section_name: str):
+    res = await execute(supabase.table("activity_log").select("payload").eq("process_id", process_id).eq("section_name", section_name).order("created_at").order("id"))
+    return [row["payload"] for row in res.data]
+
+def make_etag(*parts):
+    """Weak ETag from version fields such as updated_at, never from the payload itself."""
+    return 'W/"%s"' % hashlib.md5("|".join(str(p) for p in parts).encode()).hexdigest()
+
+def not_modified(request: Request, response: Response, etag: str):
+    """
+    Set the ETag on the response and return True when the client's
+    If-None-Match already holds it, so the handler can answer 304 without
+    reading the data.
+    """
+    response.headers["ETag"] = etag
+    # Let clients keep the body but always revalidate it
+    response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+def publish_process_event(process_id: str, event: dict):
+    """Push a change to clients streaming /zamp/stream/{processId}."""
+    broker.publish(f"process:{process_id}", event)
+
+def publish_metadata(process_id: str, metadata: dict):
+    if metadata and "status" in metadata:
+        publish_process_event(process_id, {"type": "status", "status": metadata["status"]})
+
 @app.post("/zamp/init")
 async def zamp_init(request: ZampInitRequest):
     try:
         today = datetime.now().strftime("%Y-%m-%d")
         
         # Insert into Processes table
-        res = supabase.table("processes").insert({
+        res = await execute(supabase.table("processes").insert({
             "process_name": request.processName,
             "team": request.team,
             "year": today,
             "status": "In Progress"
-        }).execute()
+        }))
         
         process_data = res.data[0]
         process_id = process_data["id"]
@@ -290,80 +531,73 @@ async def zamp_init(request: ZampInitRequest):
             {"process_id": process_id, "section_name": "activityLogs", "title": "Activity Logs", "content": json.dumps([])},
             {"process_id": process_id, "section_name": "keyDetails", "title": "Key Details", "content": json.dumps([])}
         ]
-        supabase.table("process_sections").insert(sections).execute()
+        await execute(supabase.table("process_sections").insert(sections))
         
         # Update stockId with UUID fragment
-        supabase.table("processes").update({"stock_id": f"{request.processName} #{process_id[:8]}"}).eq("id", process_id).execute()
+        await execute(supabase.table("processes").update({"stock_id": f"{request.processName} #{process_id[:8]}"}).eq("id", process_id))
             
         return {"processId": process_id}
     except Exception as e:
         print(f"Error initializing Zamp process: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def prepare_log_entry(entry: ZampLogEntry):
+    """Fill in server-side defaults and return the entry as zamp_log_entries expects it."""
+    if "time" not in entry.log:
+        entry.log["time"] = datetime.now().strftime("%I:%M %p")
+    if entry.stepId:
+        entry.log["stepId"] = entry.stepId
+    return {"log": entry.log, "stepId": entry.stepId, "keyDetails": entry.keyDetails, "metadata": entry.metadata}
+
 @app.post("/zamp/log")
 async def zamp_log(request: ZampLogRequest):
     try:
-        # Fetch activityLogs section
-        res = supabase.table("process_sections").select("content").eq("process_id", request.processId).eq("section_name", "activityLogs").execute()
-        items = json.loads(res.data[0]["content"]) if res.data else []
-            
-        if "time" not in request.log:
-            request.log["time"] = datetime.now().strftime("%I:%M %p")
-        if request.stepId:
-            request.log["stepId"] = request.stepId
-
-        # Update or Append
-        updated = False
-        if request.stepId:
-            for i, item in enumerate(items):
-                if item.get("stepId") == request.stepId:
-                    items[i].update(request.log)
-                    updated = True
-                    break
-        if not updated:
-            items.append(request.log)
-
-        # Save activityLogs
-        supabase.table("process_sections").update({"content": json.dumps(items)}).eq("process_id", request.processId).eq("section_name", "activityLogs").execute()
-
-        # Artifact Sync
-        if "artifacts" in request.log and request.log["artifacts"]:
-            res_art = supabase.table("process_sections").select("content").eq("process_id", request.processId).eq("section_name", "sidebarArtifacts").execute()
-            art_items = json.loads(res_art.data[0]["content"]) if res_art.data else []
-            existing_ids = set(a.get("id") for a in art_items)
-            for artifact in request.log["artifacts"]:
-                if artifact.get("id") not in existing_ids:
-                    art_items.append(artifact)
-            supabase.table("process_sections").upsert({"process_id": request.processId, "section_name": "sidebarArtifacts", "title": "Artifacts", "content": json.dumps(art_items)}).execute()
-
-        # Update Key Details
-        if request.keyDetails:
-            res_kd = supabase.table("process_sections").select("content").eq("process_id", request.processId).eq("section_name", "keyDetails").execute()
-            kd_items = json.loads(res_kd.data[0]["content"]) if res_kd.data else []
-            if isinstance(request.keyDetails, dict): kd_items.append(request.keyDetails)
-            elif isinstance(request.keyDetails, list): kd_items.extend(request.keyDetails)
-            supabase.table("process_sections").update({"content": json.dumps(kd_items)}).eq("process_id", request.processId).eq("section_name", "keyDetails").execute()
-
-        # Update Metadata
-        if request.metadata:
-            update_fields = {}
-            if "applicantName" in request.metadata: update_fields["applicant_name"] = request.metadata["applicantName"]
-            if "status" in request.metadata: update_fields["status"] = request.metadata["status"]
-            if update_fields:
-                supabase.table("processes").update(update_fields).eq("id", request.processId).execute()
-            
+        entry = prepare_log_entry(request)
+        # Log upsert, artifact sync, key details and metadata in one transactional call
+        await execute(supabase.rpc("zamp_log_step", {
+            "p_process_id": request.processId,
+            "p_log": entry["log"],
+            "p_step_id": entry["stepId"],
+            "p_key_details": entry["keyDetails"],
+            "p_metadata": entry["metadata"]
+        }))
+        publish_metadata(request.processId, request.metadata)
         return {"status": "success"}
     except Exception as e:
         print(f"Error logging to Zamp: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/zamp/log-batch")
+async def zamp_log_batch(request: ZampLogBatchRequest):
+    try:
+        entries = [prepare_log_entry(entry) for entry in request.entries]
+        await execute(supabase.rpc("zamp_log_entries", {"p_process_id": request.processId, "p_entries": entries}))
+        for entry in request.entries:
+            publish_metadata(request.processId, entry.metadata)
+        return {"status": "success", "count": len(entries)}
+    except Exception as e:
+        print(f"Error batch logging to Zamp: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/zamp/log-bulk")
+async def zamp_log_bulk(request: ZampLogBulkRequest):
+    """Apply ordered log entries for any processes in one DB call; returns a result per entry."""
+    try:
+        entries = [{"processId": entry.processId, **prepare_log_entry(entry)} for entry in request.entries]
+        res = await execute(supabase.rpc("zamp_log_bulk", {"p_entries": entries}))
+        for entry, result in zip(request.entries, res.data or []):
+            if result.get("status") == "success":
+                publish_metadata(entry.processId, entry.metadata)
+        return {"results": res.data}
+    except Exception as e:
+        print(f"Error bulk logging to Zamp: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/zamp/upload")
 async def zamp_upload(file: UploadFile = File(...)):
     try:
-        temp_path = os.path.join("/tmp", file.filename)
-        with open(temp_path, "wb+") as f:
-            shutil.copyfileobj(file.file, f)
-        public_url = upload_file(temp_path, "zamp-uploads", f"uploads/{file.filename}")
+        # Streamed from the request's own spooled file; no extra copy in /tmp
+        public_url = await upload_stream(file.file, "zamp-uploads", f"uploads/{storage_name(file.filename)}", file.content_type)
         return {"path": public_url}
     except Exception as e:
         print(f"Error uploading file: {e}")
@@ -373,12 +607,11 @@ async def zamp_upload(file: UploadFile = File(...)):
 async def chat_help(request: HelpChatRequest):
     try:
         if not GENAI_API_KEY: raise HTTPException(status_code=500, detail="Gemini Missing")
-        model = genai.GenerativeModel('gemini-2.5-flash-lite')
         knowledge_base_content = get_knowledge_base()
         system_instruction = f"Context: {request.stepInfo}. Knowledge: {knowledge_base_content}"
-        chat = model.start_chat(history=[{"role": "user", "parts": [system_instruction + f"\n\nQUERY: {request.query}"]}])
-        response = chat.send_message(request.query)
-        return {"response": response.text}
+        history = [[text_part(system_instruction + f"\n\nQUERY: {request.query}")]]
+        response = await gemini.generate([text_part(request.query)], history=history, op="chat_help")
+        return {"response": response}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -390,9 +623,6 @@ class MessageRequest(BaseModel):
 @app.post("/zamp/message")
 async def send_message(request: MessageRequest):
     try:
-        res = supabase.table("process_sections").select("content").eq("process_id", request.processId).eq("section_name", "messages").execute()
-        messages = json.loads(res.data[0]["content"]) if res.data else []
-        
         new_msg = {
             "id": f"msg-{datetime.now().strftime('%Y%m%d%H%M%S')}",
             "sender": request.sender,
@@ -400,100 +630,245 @@ async def send_message(request: MessageRequest):
             "time": datetime.now().strftime("%I:%M %p"),
             "timestamp": datetime.now().isoformat()
         }
-        messages.append(new_msg)
-        supabase.table("process_sections").upsert({"process_id": request.processId, "section_name": "messages", "title": "Messages", "content": json.dumps(messages)}).execute()
+        await execute(supabase.table("activity_log").insert(log_row(request.processId, "messages", new_msg)))
+        publish_process_event(request.processId, {"type": "message", "message": new_msg})
         return {"status": "success", "message": new_msg}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/zamp/messages/{processId}")
-async def get_messages(processId: str):
+async def get_messages(processId: str, request: Request, response: Response):
     try:
-        res = supabase.table("process_sections").select("content").eq("process_id", processId).eq("section_name", "messages").execute()
-        return {"messages": json.loads(res.data[0]["content"]) if res.data else []}
+        # processes.updated_at moves on every activity_log write (see trigger)
+        res = await execute(supabase.table("processes").select("updated_at").eq("id", processId))
+        if res.data:
+            etag = make_etag("messages", processId, res.data[0]["updated_at"])
+            if not_modified(request, response, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+        return {"messages": await fetch_section_items(processId, "messages")}
     except Exception as e:
         return {"messages": []}
 
 @app.get("/zamp/status/{processId}")
 async def get_process_status(processId: str):
-    res = supabase.table("processes").select("status").eq("id", processId).execute()
+    res = await execute(supabase.table("processes").select("status").eq("id", processId))
     return {"status": res.data[0]["status"] if res.data else "Unknown"}
 
+@app.get("/zamp/stream/{processId}")
+async def stream_process(processId: str):
+    """
+    Server-sent events for one process: a snapshot of messages and status on
+    connect, then new messages, status changes and completed HITL actions as
+    they happen. Replaces polling /zamp/messages and /zamp/status.
+    """
+    async def stream():
+        with broker.subscribe(f"process:{processId}") as queue:
+            # Snapshot after subscribing so nothing published in between is missed
+            res = await execute(supabase.table("processes").select("status").eq("id", processId))
+            yield sse_event({
+                "type": "snapshot",
+                "status": res.data[0]["status"] if res.data else "Unknown",
+                "messages": await fetch_section_items(processId, "messages")
+            })
+            while True:
+                try:
+                    yield sse_event(await asyncio.wait_for(queue.get(), timeout=15))
+                except asyncio.TimeoutError:
+                    yield SSE_KEEPALIVE
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @app.post("/zamp/approve/{processId}")
 async def approve_application(processId: str):
     try:
-        supabase.table("processes").update({"status": "Done"}).eq("id", processId).execute()
+        await execute(supabase.table("processes").update({"status": "Done"}).eq("id", processId))
         
         # Log approval
-        res_log = supabase.table("process_sections").select("content").eq("process_id", processId).eq("section_name", "activityLogs").execute()
-        logs = json.loads(res_log.data[0]["content"]) if res_log.data else []
-        logs.append({"title": "Application Approved", "status": "success", "type": "success", "time": datetime.now().strftime("%I:%M %p")})
-        supabase.table("process_sections").update({"content": json.dumps(logs)}).eq("process_id", processId).eq("section_name", "activityLogs").execute()
-        
-        # Key Details update
-        res_kd = supabase.table("process_sections").select("content").eq("process_id", processId).eq("section_name", "keyDetails").execute()
-        kd = json.loads(res_kd.data[0]["content"]) if res_kd.data else []
-        if kd: kd[-1]["status"] = "Done"
-        else: kd.append({"status": "Done"})
-        supabase.table("process_sections").update({"content": json.dumps(kd)}).eq("process_id", processId).eq("section_name", "keyDetails").execute()
+        approval_log = {"title": "Application Approved", "status": "success", "type": "success", "time": datetime.now().strftime("%I:%M %p")}
+        await execute(supabase.rpc("append_activity_log", {"p_process_id": processId, "p_log": approval_log}))
         
+        # Key Details update (latest entry only)
+        res_kd = await execute(supabase.table("activity_log").select("id, payload").eq("process_id", processId).eq("section_name", "keyDetails").order("created_at", desc=True).order("id", desc=True).limit(1))
+        if res_kd.data and isinstance(res_kd.data[0]["payload"], dict):
+            kd = res_kd.data[0]
+            await execute(supabase.table("activity_log").update({"payload": {**kd["payload"], "status": "Done"}}).eq("id", kd["id"]))
+        else:
+            await execute(supabase.table("activity_log").insert(log_row(processId, "keyDetails", {"status": "Done"})))
+        
+        publish_process_event(processId, {"type": "status", "status": "Done"})
         return {"status": "success"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+# Columns the dashboard renders, plus created_at for the cursor
+PROCESS_LIST_COLUMNS = "id, stock_id, applicant_name, team, year, status, created_at"
+PROCESS_PAGE_SIZE = 50
+PROCESS_MAX_PAGE_SIZE = 500
+
+def encode_cursor(row: dict):
+    return base64.urlsafe_b64encode(json.dumps([row["created_at"], row["id"]]).encode()).decode()
+
+def decode_cursor(cursor: str):
+    """
+    Parse a cursor from encode_cursor. Both values are re-serialized after
+    parsing, since they are interpolated into the PostgREST filter.
+    """
+    try:
+        created_at, process_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(created_at).isoformat(), str(uuid.UUID(process_id))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def filter_processes(query, status: str = None, team: str = None, applicantName: str = None):
+    if status:
+        query = query.eq("status", status)
+    if team:
+        query = query.eq("team", team)
+    if applicantName:
+        query = query.ilike("applicant_name", f"%{applicantName}%")
+    return query
+
+def process_list_etag(version: dict, request: Request):
+    """Newest updated_at catches inserts and edits, the deletion counter catches deletes."""
+    version = version or {}
+    return make_etag("processes", version.get("updatedAt"), version.get("deletions"), request.url.query)
+
 @app.get("/zamp/processes")
-async def get_all_processes():
+async def get_all_processes(request: Request, response: Response, limit: int = PROCESS_PAGE_SIZE, cursor: str = None, status: str = None, team: str = None, applicantName: str = None):
+    """
+    Newest processes first, one page at a time. The body stays a plain array;
+    when more rows exist the `X-Next-Cursor` header holds the cursor for the
+    next page (keyset on created_at, id).
+    """
+    limit = max(1, min(limit, PROCESS_MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
     try:
-        res = supabase.table("processes").select("*").order("created_at", desc=True).execute()
-        # Map camelCase for frontend compatibility if needed
-        # In processes table we have applicant_name, stock_id etc.
+        query = filter_processes(supabase.table("processes").select(PROCESS_LIST_COLUMNS), status, team, applicantName)
+        if after:
+            created_at, process_id = after
+            query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{process_id})')
+        # One extra row tells us whether there is a next page
+        query = query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
+
+        if request.headers.get("if-none-match"):
+            # Cheap version check before running the page query
+            version = await execute(supabase.rpc("zamp_process_list_version", {}))
+            etag = process_list_etag(version.data, request)
+            if not_modified(request, response, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            res = await execute(query)
+        else:
+            # First fetch: read the version before the page, so a write landing in
+            # between leaves an older ETag and the next request refetches
+            version = await execute(supabase.rpc("zamp_process_list_version", {}))
+            res = await execute(query)
+            not_modified(request, response, process_list_etag(version.data, request))
+        rows = res.data[:limit]
+        if len(res.data) > limit:
+            response.headers["X-Next-Cursor"] = encode_cursor(rows[-1])
+
         processes = []
-        for p in res.data:
+        for p in rows:
             processes.append({
                 "id": p["id"],
                 "stockId": p.get("stock_id"),
                 "applicantName": p.get("applicant_name"),
                 "name": p.get("applicant_name"), # fallback
+                "team": p.get("team"),
                 "year": p.get("year"),
-                "status": p.get("status")
+                "status": p.get("status"),
+                "createdAt": p.get("created_at")
             })
         return processes
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching processes: {e}")
         return []
 
+@app.get("/zamp/processes/count")
+async def count_processes(status: str = None, team: str = None, applicantName: str = None):
+    try:
+        res = await execute(filter_processes(supabase.table("processes").select("id", count="exact", head=True), status, team, applicantName))
+        return {"count": res.count}
+    except Exception as e:
+        print(f"Error counting processes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+# Sections whose entries are only loaded when asked for via ?sections=
+HEAVY_SECTIONS = ("activityLogs", "sidebarArtifacts", "messages")
+
 @app.get("/zamp/process/{processId}")
-async def get_process_detail(processId: str):
+async def get_process_detail(processId: str, request: Request, response: Response, sections: str = None, tail: Optional[int] = Query(None, ge=1), before: Optional[int] = Query(None, ge=1)):
+    """
+    Process metadata, section headers and keyDetails from one RPC. Heavy
+    sections come back with `itemCount` and `loaded: false` unless named in
+    `sections` (comma separated, or "all"). For activityLogs, `tail` returns
+    only the newest N entries and `before` (the section's `before` value)
+    pages further back.
+    """
     try:
-        # Fetch metadata
-        res_meta = supabase.table("processes").select("*").eq("id", processId).execute()
-        if not res_meta.data:
+        if request.headers.get("if-none-match"):
+            # Cheap version check before running the detail query
+            res_meta = await execute(supabase.table("processes").select("updated_at").eq("id", processId))
+            if res_meta.data:
+                etag = make_etag("process", processId, res_meta.data[0]["updated_at"], request.url.query)
+                if not_modified(request, response, etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+
+        requested = [name.strip() for name in (sections or "").split(",") if name.strip()]
+        if "all" in requested:
+            requested = list(HEAVY_SECTIONS)
+        wanted = [name for name in LOG_SECTIONS if name not in HEAVY_SECTIONS or name in requested]
+
+        res = await execute(supabase.rpc("zamp_process_detail", {
+            "p_process_id": processId,
+            "p_sections": wanted,
+            "p_log_tail": tail,
+            "p_log_before": before
+        }))
+        detail = res.data
+        if not detail:
              raise HTTPException(status_code=404, detail="Process not found")
-        
-        meta = res_meta.data[0]
-        
-        # Fetch sections
-        res_sections = supabase.table("process_sections").select("*").eq("process_id", processId).execute()
-        
-        sections = {}
-        for s in res_sections.data:
-            sections[s["section_name"]] = {
-                "title": s["title"],
-                "items": json.loads(s["content"]) if s["section_name"] != "overview" else s["content"]
-            }
+
+        meta = detail["process"]
+        not_modified(request, response, make_etag("process", processId, meta["updated_at"], request.url.query))
+
+        result_sections = {}
+        for s in detail["headers"]:
+            if s["section_name"] in LOG_SECTIONS:
+                result_sections[s["section_name"]] = {"title": s["title"]}
+            else:
+                result_sections[s["section_name"]] = {
+                    "title": s["title"],
+                    "items": s["content"]
+                }
             # Special handling for overview if it's stored differently
             if s["section_name"] == "overview":
                  try:
-                     sections[s["section_name"]]["content"] = json.loads(s["content"])
+                     result_sections[s["section_name"]]["content"] = json.loads(s["content"])
                  except:
-                     sections[s["section_name"]]["content"] = s["content"]
+                     result_sections[s["section_name"]]["content"] = s["content"]
+
+        counts = detail["counts"]
+        for name in LOG_SECTIONS:
+            if name not in result_sections and not counts.get(name):
+                continue
+            section = result_sections.setdefault(name, {"title": LOG_SECTIONS[name]})
+            section["itemCount"] = counts.get(name, 0)
+            section["loaded"] = name in detail["items"]
+            section["items"] = detail["items"].get(name, [])
+        if "activityLogs" in result_sections and detail.get("activityLogsBefore"):
+            result_sections["activityLogs"]["before"] = detail["activityLogsBefore"]
 
         return {
             "id": meta["id"],
             "applicantName": meta.get("applicant_name"),
             "status": meta.get("status"),
-            "sections": sections
+            "sections": result_sections
         }
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error fetching process detail: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -506,22 +881,20 @@ class HITLActionRequest(BaseModel):
 @app.post("/zamp/hitl-action")
 async def hitl_action(request: HITLActionRequest):
     try:
-        # Fetch activity logs
-        res = supabase.table("process_sections").select("content").eq("process_id", request.processId).eq("section_name", "activityLogs").execute()
-        logs = json.loads(res.data[0]["content"]) if res.data else []
-        
-        # Find the log and update its status
-        for log in logs:
-            if log.get("id") == request.logId:
-                log["status"] = "success"
-                log["title"] = f"Action Completed: {request.actionId.replace('-', ' ').title()}"
-                # Remove HITL actions after completion
-                if "hitlActions" in log:
-                    del log["hitlActions"]
-                break
-        
-        # Save updated logs
-        supabase.table("process_sections").update({"content": json.dumps(logs)}).eq("process_id", request.processId).eq("section_name", "activityLogs").execute()
+        # Fetch just the log row being actioned
+        res = await execute(supabase.table("activity_log").select("id, payload").eq("process_id", request.processId).eq("section_name", "activityLogs").eq("item_id", request.logId).limit(1))
+        
+        # Update its status
+        if res.data:
+            row = res.data[0]
+            log = row["payload"]
+            log["status"] = "success"
+            log["title"] = f"Action Completed: {request.actionId.replace('-', ' ').title()}"
+            # Remove HITL actions after completion
+            if "hitlActions" in log:
+                del log["hitlActions"]
+            await execute(supabase.table("activity_log").update({"payload": log}).eq("id", row["id"]))
+            publish_process_event(request.processId, {"type": "activity", "log": log})
         
         return {"status": "success"}
     except Exception as e:
@@ -591,26 +964,19 @@ async def seed_auto_loan(processId: str):
             }
         ]
         
-        # Save logs to process_sections
-        supabase.table("process_sections").update({"content": json.dumps(logs)}).eq("process_id", processId).eq("section_name", "activityLogs").execute()
+        # Replace the activity log rows
+        await execute(supabase.table("activity_log").delete().eq("process_id", processId).eq("section_name", "activityLogs"))
+        await execute(supabase.table("activity_log").insert([log_row(processId, "activityLogs", log) for log in logs]))
         
         # Update metadata
-        supabase.table("processes").update({"status": "Needs Review", "applicant_name": "Hamdan Rashid"}).eq("id", processId).execute()
+        await execute(supabase.table("processes").update({"status": "Needs Review", "applicant_name": "Hamdan Rashid"}).eq("id", processId))
+        publish_process_event(processId, {"type": "status", "status": "Needs Review"})
         
         return {"status": "seeded"}
     except Exception as e:
         print(f"Error seeding data: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/zamp/processes")
-async def zamp_processes():
-    try:
-        res = supabase.table("processes").select("*").order("created_at", desc=True).execute()
-        return res.data
-    except Exception as e:
-        print(f"Error fetching processes: {e}")
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-
 @app.post("/zamp/seed-demo-data")
 async def seed_demo_data():
     try:
@@ -619,59 +985,55 @@ async def seed_demo_data():
         
         # 1. Hamdan Rashid - Needs Attention (Red)
         hamdan_id = str(uuid4())
-        supabase.table("processes").insert({
+        await execute(supabase.table("processes").insert({
             "id": hamdan_id,
             "process_name": "Auto Loan Application",
             "applicant_name": "Hamdan Rashid",
             "status": "Needs Review",
             "year": "2024-01-07"
-        }).execute()
+        }))
         
         hamdan_logs = [
             {"id": str(uuid4()), "title": "Application Started", "status": "success", "time": "09:00 AM", "reasoning": ["User selected Auto Loan Ops flow"]},
             {"id": str(uuid4()), "title": "Identity Verification", "status": "success", "time": "09:15 AM", "reasoning": ["EID Verified"], "artifacts": [{"id": "h-art1", "label": "EID Scan", "icon": "file", "type": "image", "imagePath": "https://placehold.co/400x300?text=Hamdan+EID"}]},
             {"id": str(uuid4()), "title": "Interest Rate Review", "status": "needs_attention", "time": "10:30 AM", "reasoning": ["Flagged: Manual override requested for 3.2% rate"], "hitlActions": [{"id": "app-rate", "label": "Approve 3.2%", "primary": True}, {"id": "reject-rate", "label": "Stick to 3.5%", "primary": False}]}
         ]
-        supabase.table("process_sections").insert([
-            {"process_id": hamdan_id, "section_name": "activityLogs", "content": json.dumps(hamdan_logs)},
-            {"process_id": hamdan_id, "section_name": "keyDetails", "content": json.dumps({"Loan Amount": "AED 250,000", "Credit Score": "740"})}
-        ]).execute()
+        await execute(supabase.table("activity_log").insert(
+            [log_row(hamdan_id, "activityLogs", log) for log in hamdan_logs] +
+            [log_row(hamdan_id, "keyDetails", {"Loan Amount": "AED 250,000", "Credit Score": "740"})]
+        ))
 
         # 2. Fatima Al Mansouri - In Progress (Blue)
         fatima_id = str(uuid4())
-        supabase.table("processes").insert({
+        await execute(supabase.table("processes").insert({
             "id": fatima_id,
             "process_name": "Auto Loan Application",
             "applicant_name": "Fatima Al Mansouri",
             "status": "In Progress",
             "year": "2024-01-07"
-        }).execute()
+        }))
         
         fatima_logs = [
             {"id": str(uuid4()), "title": "KYC Verified", "status": "success", "time": "11:00 AM", "reasoning": ["Biometrics match"]},
             {"id": str(uuid4()), "title": "Collateral Valuation", "status": "processing", "time": "01:00 PM", "reasoning": ["Agent dispatched to dealer location"], "artifacts": []}
         ]
-        supabase.table("process_sections").insert([
-            {"process_id": fatima_id, "section_name": "activityLogs", "content": json.dumps(fatima_logs)}
-        ]).execute()
+        await execute(supabase.table("activity_log").insert([log_row(fatima_id, "activityLogs", log) for log in fatima_logs]))
 
         # 3. Omar Hassan - Done (Green)
         omar_id = str(uuid4())
-        supabase.table("processes").insert({
+        await execute(supabase.table("processes").insert({
             "id": omar_id,
             "process_name": "Auto Loan Application",
             "applicant_name": "Omar Hassan",
             "status": "Done",
             "year": "2024-01-06"
-        }).execute()
+        }))
         
         omar_logs = [
             {"id": str(uuid4()), "title": "Valuation Complete", "status": "success", "time": "Yesterday", "reasoning": ["Vehicle value: AED 180k"], "artifacts": [{"id": "o-art1", "label": "Valuation Report", "icon": "file", "type": "file", "pdfPath": "https://www.w3.org/WAI/ER/tests/xhtml/testfiles/resources/pdf/dummy.pdf"}]},
             {"id": str(uuid4()), "title": "Funds Disbursed", "status": "success", "time": "Yesterday", "reasoning": ["AED 150,000 sent to Tesla Motors UAE"]}
         ]
-        supabase.table("process_sections").insert([
-            {"process_id": omar_id, "section_name": "activityLogs", "content": json.dumps(omar_logs)}
-        ]).execute()
+        await execute(supabase.table("activity_log").insert([log_row(omar_id, "activityLogs", log) for log in omar_logs]))
 
         return {"status": "Demo data seeded successfully"}
     except Exception as e:
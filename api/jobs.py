@@ -0,0 +1,199 @@
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from pubsub import broker
+
+TERMINAL_STATUSES = ("succeeded", "failed")
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryJobStore:
+    """In-memory job state, for tests and single-process dev runs."""
+
+    def __init__(self):
+        self._jobs = {}
+
+    def create(self, job: dict):
+        self._jobs[job["id"]] = dict(job)
+
+    def update(self, job_id: str, fields: dict):
+        self._jobs[job_id].update(fields)
+
+    def get(self, job_id: str):
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def with_status(self, status: str):
+        return [dict(j) for j in self._jobs.values() if j["status"] == status]
+
+
+class SQLiteJobStore:
+    """Job state persisted to a local SQLite file so it survives restarts."""
+
+    COLUMNS = ("id", "kind", "status", "payload", "result", "error", "created_at", "updated_at")
+    JSON_COLUMNS = ("payload", "result")
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "create table if not exists jobs ("
+                "id text primary key, kind text not null, status text not null, "
+                "payload text, result text, error text, created_at real not null, updated_at real not null)"
+            )
+            self._conn.execute("create index if not exists idx_jobs_status on jobs(status)")
+
+    def _encode(self, fields: dict):
+        return {k: json.dumps(v) if k in self.JSON_COLUMNS and v is not None else v for k, v in fields.items()}
+
+    def _decode(self, row):
+        job = dict(zip(self.COLUMNS, row))
+        for k in self.JSON_COLUMNS:
+            if job[k] is not None:
+                job[k] = json.loads(job[k])
+        return job
+
+    def create(self, job: dict):
+        job = self._encode(job)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"insert into jobs ({', '.join(self.COLUMNS)}) values ({', '.join('?' * len(self.COLUMNS))})",
+                tuple(job.get(c) for c in self.COLUMNS)
+            )
+
+    def update(self, job_id: str, fields: dict):
+        fields = self._encode(fields)
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"update jobs set {assignments} where id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str):
+        with self._lock:
+            row = self._conn.execute(f"select {', '.join(self.COLUMNS)} from jobs where id = ?", (job_id,)).fetchone()
+        return self._decode(row) if row else None
+
+    def with_status(self, status: str):
+        with self._lock:
+            rows = self._conn.execute(
+                f"select {', '.join(self.COLUMNS)} from jobs where status = ? order by created_at", (status,)
+            ).fetchall()
+        return [self._decode(r) for r in rows]
+
+
+class JobQueue:
+    """
+    Runs long verifications outside the HTTP request. Submitting returns a job
+    at once; a fixed set of workers executes the registered handler for its kind
+    and every state change is published on the `job:<id>` topic.
+    """
+
+    def __init__(self, store, workers: int = None):
+        self.store = store
+        self.workers = workers or int(os.getenv("JOBS_WORKERS", "2"))
+        self._handlers = {}
+        self._queue = None
+        self._tasks = []
+
+    def handler(self, kind: str):
+        """Decorator registering `async fn(payload) -> result` for a job kind."""
+        def register(fn):
+            self._handlers[kind] = fn
+            return fn
+        return register
+
+    async def start(self):
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+        # Jobs that were running when the process died cannot be resumed
+        for job in await asyncio.to_thread(self.store.with_status, "running"):
+            await self._set(job["id"], status="failed", error="Interrupted by server restart")
+        for job in await asyncio.to_thread(self.store.with_status, "queued"):
+            self._queue.put_nowait(job["id"])
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    async def submit(self, kind: str, payload: dict):
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if self._queue is None:
+            await self.start()
+        now = time.time()
+        job = {
+            "id": uuid.uuid4().hex,
+            "kind": kind,
+            "status": "queued",
+            "payload": payload,
+            "result": None,
+            "error": None,
+            "created_at": now,
+            "updated_at": now,
+        }
+        await asyncio.to_thread(self.store.create, job)
+        self._queue.put_nowait(job["id"])
+        return self.public(job)
+
+    async def get(self, job_id: str):
+        job = await asyncio.to_thread(self.store.get, job_id)
+        return self.public(job) if job else None
+
+    @staticmethod
+    def public(job: dict):
+        return {
+            "jobId": job["id"],
+            "kind": job["kind"],
+            "status": job["status"],
+            "result": job["result"],
+            "error": job["error"],
+            "createdAt": job["created_at"],
+            "updatedAt": job["updated_at"],
+        }
+
+    def _update(self, job_id: str, fields: dict):
+        self.store.update(job_id, fields)
+        return self.store.get(job_id)
+
+    async def _set(self, job_id: str, **fields):
+        # Store calls are blocking (SQLite), so they run off the event loop
+        fields["updated_at"] = time.time()
+        job = await asyncio.to_thread(self._update, job_id, fields)
+        broker.publish(f"job:{job_id}", self.public(job))
+
+    async def _work(self):
+        while True:
+            job_id = await self._queue.get()
+            job = await asyncio.to_thread(self.store.get, job_id)
+            if not job or job["status"] != "queued":
+                continue
+            await self._set(job_id, status="running")
+            try:
+                result = await self._handlers[job["kind"]](job["payload"])
+                await self._set(job_id, status="succeeded", result=result)
+            except asyncio.CancelledError:
+                await self._set(job_id, status="failed", error="Cancelled")
+                raise
+            except Exception as e:
+                logger.exception("Job %s (%s) failed", job_id, job["kind"])
+                await self._set(job_id, status="failed", error=str(e))
+
+
+def default_store():
+    if os.getenv("JOBS_STORE", "sqlite") == "memory":
+        return MemoryJobStore()
+    return SQLiteJobStore(os.getenv("JOBS_DB", "/tmp/jobs.db"))
+
+
+job_queue = JobQueue(default_store())
@@ -0,0 +1,278 @@
+import os
+import re
+import unicodedata
+
+# Confidence at or above ACCEPT is a match and at or below REJECT is not; only
+# the band in between is worth a Gemini round trip.
+NAME_MATCH_ACCEPT = float(os.getenv("NAME_MATCH_ACCEPT", "0.85"))
+NAME_MATCH_REJECT = float(os.getenv("NAME_MATCH_REJECT", "0.45"))
+
+# Common Gulf / Arabic given and family names and their Latin spellings.
+# Every variant (and the key itself) maps to the key.
+NAME_ALIASES = {
+    "muhammad": ["mohammed", "mohammad", "mohamed", "mohamad", "muhammed", "muhamad", "mohd", "mohmmad", "mhd", "mohamud"],
+    "ahmad": ["ahmed", "ahmet", "ahmd"],
+    "mahmud": ["mahmoud", "mahmood", "mehmood"],
+    "mustafa": ["mustapha", "moustafa", "mostafa"],
+    "abdullah": ["abdulla", "abdallah", "abdalla", "abdellah"],
+    "ali": ["aly", "alee"],
+    "umar": ["omar", "omer", "umer"],
+    "uthman": ["osman", "othman", "usman", "outhman"],
+    "yusuf": ["yousef", "yousif", "youssef", "yousuf", "yusef", "yosef"],
+    "ibrahim": ["ebrahim", "ibraheem", "ebraheem"],
+    "ismail": ["ismael", "esmail", "ismaeel"],
+    "khalid": ["khaled"],
+    "khalifa": ["khalifah", "khalefa"],
+    "khalil": ["khaleel"],
+    "hamad": ["hamed"],
+    "hamid": ["hameed", "hamied"],
+    "hasan": ["hassan", "hasen"],
+    "husain": ["hussain", "hussein", "husein", "hossain", "hossein", "husayn"],
+    "said": ["saeed", "saed", "saeid"],
+    "rashid": ["rashed", "rasheed"],
+    "saif": ["sayf", "seif", "saiff"],
+    "majid": ["majed", "maajid", "majeed"],
+    "faisal": ["faysal", "feisal"],
+    "nasir": ["nasser", "naser", "nassir", "nasr"],
+    "mansur": ["mansour", "mansoor"],
+    "jasim": ["jassim", "jasem", "jassem"],
+    "qasim": ["qassim", "kasim", "kassim", "qasem", "kassem"],
+    "tariq": ["tarek", "tareq", "tarik", "tarique"],
+    "walid": ["waleed", "walied"],
+    "yasir": ["yasser", "yaser", "yassir"],
+    "zayid": ["zayed", "zaid", "zayd", "zaied"],
+    "suhail": ["sohail", "suhel", "sohel"],
+    "salim": ["salem", "saleem"],
+    "ubaid": ["obaid", "obaied", "ubayd"],
+    "sultan": ["sultaan"],
+    "mubarak": ["mobarak", "mubarack"],
+    "shaikh": ["sheikh", "shaykh", "sheik", "shekh"],
+    "fatima": ["fatma", "fatemah", "fatimah", "fathima"],
+    "aisha": ["ayesha", "aysha", "aishah", "ayisha"],
+    "maryam": ["mariam", "mariyam", "miriam"],
+    "nura": ["noura", "nora", "noora"],
+    "huda": ["hoda", "houda"],
+    "almaktum": ["almaktoum"],
+    "alnahyan": ["alnahayan", "alnehayan"],
+    "alqasimi": ["alqassimi", "alqasemi"],
+    "alnuaimi": ["alnoaimi", "alnuami"],
+    "almazrui": ["almazrouei", "almazroui", "almazrooei"],
+    "alsuwaidi": ["alsuwaidy", "alswaidi"],
+    "alfalasi": ["alfalasy", "alfallasi"],
+    "almansuri": ["almansoori", "almansouri"],
+    "alhashimi": ["alhashemi", "alhashmi"],
+    "alkitbi": ["alketbi", "alkutbi"],
+    "aldhahiri": ["aldhaheri", "aldaheri", "alzaheri"],
+    "alkaabi": ["alkabi", "alkaaby"],
+    "almarzuqi": ["almarzouqi", "almarzooqi", "almarzouki"],
+    "almuhairi": ["almehairi", "almuhairy"],
+    "alrumaithi": ["alromaithi", "alrumaithy"],
+    "alshamsi": ["alshamsy"],
+}
+_ALIAS_LOOKUP = {variant: canonical for canonical, variants in NAME_ALIASES.items() for variant in [canonical, *variants]}
+
+# "Al"/"El" article and "bin"/"ibn" lineage spellings
+ARTICLES = ("al", "el", "ul")
+LINEAGE = {"bin": "bin", "ibn": "bin", "bint": "bint", "binti": "bint"}
+# Abdul/Abdel/Abdur/Abd al + name is one compound name
+ABD_PREFIXES = ("abdul", "abdel", "abdal", "abdur", "abdu", "abd")
+
+_NON_LETTERS = re.compile(r"[^\w\s]|_|\d")
+
+
+def normalize_name(name: str):
+    """Casefold, strip accents and Arabic diacritics, turn punctuation into spaces."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch) and ch != "ـ")  # tatweel
+    text = _NON_LETTERS.sub(" ", text.casefold())
+    return " ".join(text.split())
+
+
+def _canonical_token(token: str):
+    token = _ALIAS_LOOKUP.get(token, token)
+    if token not in _ALIAS_LOOKUP:
+        for prefix in ABD_PREFIXES:
+            rest = token[len(prefix):]
+            if token.startswith(prefix) and len(rest) >= 3:
+                return "abd" + _ALIAS_LOOKUP.get(rest, rest)
+    return token
+
+
+def name_tokens(name: str):
+    """
+    Canonical tokens of a name: articles joined to the following name
+    ("El-Maktoum" -> "almaktum"), Abd- compounds joined, lineage words
+    unified and transliteration variants mapped through NAME_ALIASES.
+    """
+    raw = normalize_name(name).split()
+    tokens = []
+    i = 0
+    while i < len(raw):
+        token = raw[i]
+        nxt = raw[i + 1] if i + 1 < len(raw) else None
+        if token in ARTICLES and nxt:
+            token, i = "al" + nxt, i + 1
+        elif token in ("abd", "abdul", "abdel", "abdal", "abdur", "abdu") and nxt:
+            # "Abd al Rahman", "Abdul Rahman"
+            if nxt in ARTICLES and i + 2 < len(raw):
+                token, i = "abd" + raw[i + 2], i + 2
+            else:
+                token, i = "abd" + nxt, i + 1
+        elif token in LINEAGE:
+            token = LINEAGE[token]
+        elif token.startswith("el") and len(token) > 4 and "al" + token[2:] in _ALIAS_LOOKUP:
+            token = "al" + token[2:]
+        tokens.append(_canonical_token(token))
+        i += 1
+    return tokens
+
+
+def jaro_winkler(a: str, b: str, prefix_scale: float = 0.1):
+    if a == b:
+        return 1.0
+    if not a or not b:
+        return 0.0
+    window = max(max(len(a), len(b)) // 2 - 1, 0)
+    a_matched = [False] * len(a)
+    b_matched = [False] * len(b)
+    matches = 0
+    for i, ch in enumerate(a):
+        for j in range(max(0, i - window), min(len(b), i + window + 1)):
+            if not b_matched[j] and b[j] == ch:
+                a_matched[i] = b_matched[j] = True
+                matches += 1
+                break
+    if not matches:
+        return 0.0
+    a_seq = [ch for ch, m in zip(a, a_matched) if m]
+    b_seq = [ch for ch, m in zip(b, b_matched) if m]
+    transpositions = sum(x != y for x, y in zip(a_seq, b_seq)) / 2
+    jaro = (matches / len(a) + matches / len(b) + (matches - transpositions) / matches) / 3
+    prefix = 0
+    for x, y in zip(a[:4], b[:4]):
+        if x != y:
+            break
+        prefix += 1
+    return jaro + prefix * prefix_scale * (1 - jaro)
+
+
+def _token_similarity(a: str, b: str):
+    if a == b:
+        return 1.0
+    # An initial ("M. Ali") stands for any name with that letter
+    if len(a) == 1 or len(b) == 1:
+        return 0.9 if a[0] == b[0] else 0.0
+    return jaro_winkler(a, b)
+
+
+def _soft_token_set(small: list, large: list):
+    """Average best match of each token of the shorter name within the longer one."""
+    available = list(large)
+    total = 0.0
+    for token in small:
+        best, best_index = 0.0, None
+        for index, other in enumerate(available):
+            score = _token_similarity(token, other)
+            if score > best:
+                best, best_index = score, index
+        if best_index is not None and best >= 0.8:
+            available.pop(best_index)
+        total += best
+    return total / len(small)
+
+
+def _distinct_known_names(small: list, large: list):
+    """
+    Aligned token pairs that are two different names in NAME_ALIASES, such as
+    said/saif or hasan/husain: close in spelling but not the same name.
+    """
+    unmatched = list(large)
+    for token in small:
+        if token in unmatched:
+            unmatched.remove(token)
+    conflicts = []
+    for token in small:
+        if token in large or not unmatched:
+            continue
+        other = max(unmatched, key=lambda candidate: _token_similarity(token, candidate))
+        unmatched.remove(other)
+        if token in NAME_ALIASES and other in NAME_ALIASES:
+            conflicts.append((token, other))
+    return conflicts
+
+
+# Highest confidence for names that differ in a known given or family name;
+# inside the ambiguous band so Gemini (or a reviewer) makes the call
+DISTINCT_NAME_CAP = 0.7
+
+
+# Raw similarity -> confidence that two names denote the same person,
+# interpolated linearly. Hand-tuned on spelling variants; refit the points
+# once labelled KYC name pairs are available.
+CALIBRATION = ((0.0, 0.0), (0.6, 0.05), (0.75, 0.2), (0.85, 0.5), (0.9, 0.75), (0.95, 0.92), (0.98, 0.98), (1.0, 1.0))
+
+
+def calibrate(raw: float):
+    for (x0, y0), (x1, y1) in zip(CALIBRATION, CALIBRATION[1:]):
+        if raw <= x1:
+            return round(y0 + (y1 - y0) * (raw - x0) / (x1 - x0), 3)
+    return 1.0
+
+
+def score_names(name1: str, name2: str):
+    """Return (confidence, reason) for two person or company names."""
+    t1, t2 = name_tokens(name1), name_tokens(name2)
+    if not t1 or not t2:
+        return 0.0, "Empty name"
+    if normalize_name(name1) == normalize_name(name2):
+        return 1.0, "Exact match"
+    if t1 == t2:
+        return 0.99, "Same name with spelling or transliteration variants"
+    if sorted(t1) == sorted(t2):
+        return 0.97, "Same names in a different order"
+
+    small, large = sorted((t1, t2), key=len)
+    # Lineage words carry no identity on their own
+    small_core = [t for t in small if t not in LINEAGE.values()] or small
+    large_core = [t for t in large if t not in LINEAGE.values()] or large
+    token_set = _soft_token_set(small_core, large_core)
+    # Names that only share one token (e.g. a common first name) are not the same person
+    if len(small_core) == 1 and len(large_core) > 1:
+        token_set *= 0.85
+    # Extra names on one side (full vs short form) cost a little
+    extra = len(large_core) - len(small_core)
+    token_set -= 0.02 * extra
+
+    full = jaro_winkler(" ".join(sorted(t1)), " ".join(sorted(t2)))
+    raw = max(token_set, full)
+    confidence = calibrate(max(0.0, min(raw, 1.0)))
+
+    # Whole-name similarity hides a single swapped name (Saeed vs Saif)
+    conflicts = _distinct_known_names(small_core, large_core)
+    if conflicts:
+        confidence = min(confidence, DISTINCT_NAME_CAP)
+        names = ", ".join(f"{a} vs {b}" for a, b in conflicts)
+        reason = f"Different names ({names})" if confidence > NAME_MATCH_REJECT else "Names differ"
+    elif extra and token_set >= 0.95:
+        reason = "One name contains the other"
+    elif confidence >= NAME_MATCH_ACCEPT:
+        reason = "Close match after normalization"
+    elif confidence <= NAME_MATCH_REJECT:
+        reason = "Names differ"
+    else:
+        reason = "Partial match"
+    return confidence, reason
+
+
+def match_names_locally(name1: str, name2: str):
+    """
+    Decide locally when the confidence is outside the ambiguous band.
+    Returns {"match", "confidence", "reason", "ambiguous"}.
+    """
+    confidence, reason = score_names(name1, name2)
+    return {
+        "match": confidence >= NAME_MATCH_ACCEPT,
+        "confidence": confidence,
+        "reason": reason,
+        "ambiguous": NAME_MATCH_REJECT < confidence < NAME_MATCH_ACCEPT,
+    }
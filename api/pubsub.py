@@ -0,0 +1,40 @@
+import asyncio
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+class Broker:
+    """In-process pub/sub: every subscriber of a topic gets its own queue of events.
+
+    Events only reach subscribers in the same process, so a write handled by
+    another worker or serverless instance never shows up on a stream. Stream
+    clients must keep polling at a slower rate to pick those writes up.
+    """
+
+    def __init__(self, max_queue: int = 100):
+        self.max_queue = max_queue
+        self._subscribers = defaultdict(set)
+
+    def publish(self, topic: str, event: dict):
+        for queue in list(self._subscribers.get(topic, ())):
+            if queue.full():
+                # Slow consumer: drop its oldest event rather than block publishers
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    @contextmanager
+    def subscribe(self, topic: str):
+        queue = asyncio.Queue(maxsize=self.max_queue)
+        self._subscribers[topic].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[topic].discard(queue)
+            if not self._subscribers[topic]:
+                del self._subscribers[topic]
+
+    def stats(self):
+        return {"topics": len(self._subscribers), "subscribers": sum(len(s) for s in self._subscribers.values())}
+
+
+broker = Broker()
@@ -0,0 +1,135 @@
+"""
+Local QR decoding for trade license files, so most checks never send the
+document to Gemini. PDFs are rendered with PyMuPDF and the QR is read with
+OpenCV (opencv-python-headless and pymupdf in requirements.txt). If either is
+missing `extract_qr_locally` returns None and callers fall back to Gemini.
+"""
+import os
+from urllib.parse import urlparse, parse_qs
+
+try:
+    import cv2
+    import numpy as np
+except ImportError:
+    cv2 = None
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+# Render resolutions tried in order; small QR codes on scanned pages need the higher one
+QR_RENDER_DPIS = (150, 300)
+QR_MAX_PAGES = int(os.getenv("QR_MAX_PAGES", "2"))
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp", ".tif", ".tiff")
+# Dubai trade license QR codes point at the Invest in Dubai portal
+LICENSE_HOSTS = ("invest.dubai.ae",)
+LICENSE_NUMBER_PARAMS = ("licenseNo", "licenseNumber", "LicenseNo", "license_no", "licNo")
+
+
+class QRDecodeStats:
+    def __init__(self):
+        self.attempts = 0
+        self.hits = 0
+        self.unsupported = 0
+
+    def snapshot(self):
+        return {
+            "available": cv2 is not None,
+            "pdfSupport": fitz is not None,
+            "attempts": self.attempts,
+            "hits": self.hits,
+            "unsupported": self.unsupported,
+            "hitRate": round(self.hits / self.attempts, 3) if self.attempts else 0.0,
+        }
+
+
+qr_stats = QRDecodeStats()
+
+
+def _pdf_images(file_path: str, dpi: int):
+    with fitz.open(file_path) as doc:
+        for page in list(doc)[:QR_MAX_PAGES]:
+            pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY)
+            yield np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width)
+
+
+def _decode_image(image):
+    """All QR payloads found in a grayscale image, retrying on a binarized copy."""
+    detector = cv2.QRCodeDetector()
+    binarized = cv2.threshold(image, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)[1]
+    for candidate in (image, binarized):
+        ok, texts, _, _ = detector.detectAndDecodeMulti(candidate)
+        payloads = [t for t in (texts or []) if t] if ok else []
+        if not payloads:
+            text, _, _ = detector.detectAndDecode(candidate)
+            payloads = [text] if text else []
+        if payloads:
+            return payloads
+    return []
+
+
+def decode_qr_payloads(file_path: str):
+    """Decode QR codes from a PDF (first pages) or image file. Returns a list of payload strings."""
+    if cv2 is None:
+        return []
+    if file_path.lower().endswith(".pdf"):
+        if fitz is None:
+            return []
+        for dpi in QR_RENDER_DPIS:
+            for image in _pdf_images(file_path, dpi):
+                payloads = _decode_image(image)
+                if payloads:
+                    return payloads
+        return []
+    image = cv2.imread(file_path, cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return []
+    payloads = _decode_image(image)
+    if not payloads and max(image.shape) < 1500:
+        # Small scans: upscaling gives the detector enough modules per pixel
+        payloads = _decode_image(cv2.resize(image, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC))
+    return payloads
+
+
+def license_url(payloads: list):
+    """
+    Pick the trade license portal URL out of the decoded payloads. Other QR
+    codes on the page (payments, marketing) are ignored; without a portal URL
+    this returns None and the file goes to Gemini.
+    """
+    urls = [p.strip() for p in payloads if p.strip().lower().startswith(("http://", "https://"))]
+    for url in urls:
+        host = urlparse(url).hostname or ""
+        if any(host == h or host.endswith("." + h) for h in LICENSE_HOSTS):
+            return url
+    return None
+
+
+def license_number_from_url(url: str):
+    query = parse_qs(urlparse(url).query)
+    for param in LICENSE_NUMBER_PARAMS:
+        if query.get(param):
+            return query[param][0]
+    return None
+
+
+def extract_qr_locally(file_path: str):
+    """
+    Same shape as the Gemini extraction ({"url", "licenseNumber"}) or None when
+    the decoders are missing or no license portal QR code was found. Blocking; run it off
+    the event loop.
+    """
+    qr_stats.attempts += 1
+    if cv2 is None or (file_path.lower().endswith(".pdf") and fitz is None):
+        qr_stats.unsupported += 1
+        return None
+    try:
+        url = license_url(decode_qr_payloads(file_path))
+    except Exception as e:
+        print(f"Local QR decode failed for {file_path}: {e}")
+        return None
+    if not url:
+        return None
+    qr_stats.hits += 1
+    return {"url": url, "licenseNumber": license_number_from_url(url), "source": "local"}
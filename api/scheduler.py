@@ -0,0 +1,131 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+
+# Scrape targets and the env prefix used to size each one
+TARGETS = {
+    "dubai_invest": "SCHEDULER_DUBAI_INVEST",  # app.invest.dubai.ae
+    "lei": "SCHEDULER_LEI",  # leicodeae.com
+    "website": "SCHEDULER_WEBSITE",  # arbitrary applicant websites
+}
+
+
+class QueueFullError(Exception):
+    """Raised when a target's admission queue is full."""
+
+    def __init__(self, target, retry_after):
+        super().__init__(f"Too many pending requests for {target}")
+        self.target = target
+        self.retry_after = retry_after
+
+
+class TargetQueue:
+    """Concurrency limit plus a bounded FIFO queue for one scrape target."""
+
+    def __init__(self, name, concurrency, max_queue):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.active = 0
+        self._waiters = deque()
+        # Metrics
+        self.admitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.service_total = 0.0
+
+    def retry_after(self):
+        """Rough seconds until a queued request would be admitted."""
+        avg_service = self.service_total / self.completed if self.completed else 10.0
+        return max(1, math.ceil(avg_service * (len(self._waiters) + 1) / self.concurrency))
+
+    async def acquire(self):
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self.rejected += 1
+            raise QueueFullError(self.name, self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed to us just before cancellation; pass it on
+                self.release()
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            raise
+
+    def release(self):
+        # Hand the slot straight to the oldest waiter to keep admission FIFO
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self):
+        return {
+            "concurrency": self.concurrency,
+            "maxQueue": self.max_queue,
+            "active": self.active,
+            "queueDepth": len(self._waiters),
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "completed": self.completed,
+            "avgWaitSeconds": round(self.wait_total / self.admitted, 3) if self.admitted else 0.0,
+            "maxWaitSeconds": round(self.wait_max, 3),
+            "avgServiceSeconds": round(self.service_total / self.completed, 3) if self.completed else 0.0,
+        }
+
+
+class Scheduler:
+    """Admission control in front of the browser-backed endpoints."""
+
+    def __init__(self, limits: dict = None):
+        if limits is None:
+            limits = {
+                target: (
+                    int(os.getenv(f"{prefix}_CONCURRENCY", "2")),
+                    int(os.getenv(f"{prefix}_MAX_QUEUE", "20")),
+                )
+                for target, prefix in TARGETS.items()
+            }
+        self.targets = {
+            target: TargetQueue(target, concurrency, max_queue)
+            for target, (concurrency, max_queue) in limits.items()
+        }
+
+    @asynccontextmanager
+    async def slot(self, target: str):
+        """Wait for a free slot on `target`, or raise QueueFullError if the queue is full."""
+        queue = self.targets[target]
+        queued_at = time.monotonic()
+        await queue.acquire()
+
+        started_at = time.monotonic()
+        waited = started_at - queued_at
+        queue.admitted += 1
+        queue.wait_total += waited
+        queue.wait_max = max(queue.wait_max, waited)
+        try:
+            yield
+        finally:
+            queue.completed += 1
+            queue.service_total += time.monotonic() - started_at
+            queue.release()
+
+    def stats(self):
+        return {target: queue.stats() for target, queue in self.targets.items()}
+
+
+scheduler = Scheduler()
@@ -0,0 +1,53 @@
+import asyncio
+import copy
+from collections import Counter
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent identical work. Callers using the same key while a
+    call is in flight await that call instead of starting their own, and each
+    gets its own copy of the result.
+    """
+
+    def __init__(self):
+        self._inflight = {}
+        self.started = Counter()
+        self.coalesced = Counter()
+
+    async def do(self, key: tuple, fn):
+        """
+        Run `fn()` for `key` unless it is already running. The key is
+        (endpoint, identifier, *options): anything that changes the result,
+        such as the recording policy, belongs in it.
+        """
+        endpoint = key[0]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            self.started[endpoint] += 1
+            task.add_done_callback(lambda t: self._forget(key, t))
+        else:
+            self.coalesced[endpoint] += 1
+
+        # Shield so one caller disconnecting does not cancel the work for the others
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    def _forget(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every caller went away
+            task.exception()
+
+    def stats(self):
+        return {
+            "inFlight": len(self._inflight),
+            "started": dict(self.started),
+            "coalesced": dict(self.coalesced),
+        }
+
+
+single_flight = SingleFlight()
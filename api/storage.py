@@ -0,0 +1,193 @@
+import base64
+import hashlib
+import mimetypes
+import os
+import time
+import httpx
+from supabase_config import (
+    SUPABASE_URL, SUPABASE_KEY, supabase, supabase_transport, get_public_url,
+    CONNECT_TIMEOUT, READ_TIMEOUT, WRITE_TIMEOUT, POOL_TIMEOUT,
+)
+
+# Files at or above this size go through the resumable (TUS) endpoint
+TUS_THRESHOLD = int(os.getenv("STORAGE_TUS_THRESHOLD", str(6 * 1024 * 1024)))
+# Supabase requires every TUS chunk except the last to be exactly 6 MB
+TUS_CHUNK_SIZE = 6 * 1024 * 1024
+TUS_MAX_RESUMES = int(os.getenv("STORAGE_TUS_MAX_RESUMES", "3"))
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# Storage calls share the Supabase connection pool
+_http = httpx.Client(
+    transport=supabase_transport,
+    timeout=httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT),
+) if supabase_transport else httpx.Client(timeout=httpx.Timeout(READ_TIMEOUT, write=WRITE_TIMEOUT))
+
+
+def _headers(extra: dict = None):
+    headers = {"Authorization": f"Bearer {SUPABASE_KEY}", "apikey": SUPABASE_KEY}
+    headers.update(extra or {})
+    return headers
+
+
+def _content_type(name: str):
+    return mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+def _file_size(fileobj):
+    position = fileobj.tell()
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell() - position
+    fileobj.seek(position)
+    return size
+
+
+def _chunks(fileobj, chunk_size: int = STREAM_CHUNK_SIZE):
+    while True:
+        chunk = fileobj.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _stream_upload(fileobj, bucket: str, destination_path: str, content_type: str, size: int):
+    """Single request upload; the body is read from `fileobj` in chunks as it is sent."""
+    res = _http.post(
+        f"{SUPABASE_URL}/storage/v1/object/{bucket}/{destination_path}",
+        content=_chunks(fileobj),
+        headers=_headers({"Content-Type": content_type, "Content-Length": str(size), "x-upsert": "true"}),
+    )
+    res.raise_for_status()
+
+
+def _tus_metadata(**fields):
+    return ",".join(f"{k} {base64.b64encode(v.encode()).decode()}" for k, v in fields.items())
+
+
+def _tus_upload(fileobj, bucket: str, destination_path: str, content_type: str, size: int):
+    """
+    Resumable upload: create the upload, then PATCH it chunk by chunk. After a
+    dropped connection the server's offset is read back and the upload resumes
+    from there instead of starting over.
+    """
+    base = fileobj.tell()
+    res = _http.post(
+        f"{SUPABASE_URL}/storage/v1/upload/resumable",
+        headers=_headers({
+            "Tus-Resumable": "1.0.0",
+            "Upload-Length": str(size),
+            "Upload-Metadata": _tus_metadata(bucketName=bucket, objectName=destination_path, contentType=content_type),
+            "x-upsert": "true",
+        }),
+    )
+    res.raise_for_status()
+    location = res.headers["Location"]
+
+    offset = 0
+    resumes = 0
+    while offset < size:
+        fileobj.seek(base + offset)
+        chunk = fileobj.read(TUS_CHUNK_SIZE)
+        try:
+            res = _http.patch(location, content=chunk, headers=_headers({
+                "Tus-Resumable": "1.0.0",
+                "Upload-Offset": str(offset),
+                "Content-Type": "application/offset+octet-stream",
+            }))
+            res.raise_for_status()
+            offset = int(res.headers["Upload-Offset"])
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            if resumes >= TUS_MAX_RESUMES:
+                raise
+            resumes += 1
+            print(f"Resumable upload of {destination_path} interrupted at {offset} bytes ({e}), resuming")
+            time.sleep(0.5 * resumes)
+            head = _http.head(location, headers=_headers({"Tus-Resumable": "1.0.0"}))
+            head.raise_for_status()
+            offset = int(head.headers["Upload-Offset"])
+
+
+def sha256_fileobj(fileobj):
+    """Hex SHA-256 of the rest of `fileobj`; the read position is restored."""
+    position = fileobj.tell()
+    digest = hashlib.sha256()
+    for chunk in _chunks(fileobj):
+        digest.update(chunk)
+    fileobj.seek(position)
+    return digest.hexdigest()
+
+
+def sha256_path(file_path: str):
+    with open(file_path, "rb") as f:
+        return sha256_fileobj(f)
+
+
+class ContentIndex:
+    """
+    Maps (bucket, SHA-256) to the storage path the content was first uploaded
+    to, via the `content_objects` table, so identical files are stored once.
+    """
+
+    def __init__(self):
+        self.uploads = 0
+        self.dedup_hits = 0
+        self.bytes_saved = 0
+
+    def lookup(self, bucket: str, sha256: str):
+        try:
+            res = supabase.table("content_objects").select("storage_path").eq("bucket", bucket).eq("sha256", sha256).limit(1).execute()
+            return res.data[0]["storage_path"] if res.data else None
+        except Exception as e:
+            print(f"Content index lookup failed: {e}")
+            return None
+
+    def record(self, bucket: str, sha256: str, storage_path: str, size: int, content_type: str):
+        try:
+            # First writer wins; a concurrent duplicate upload simply isn't indexed
+            supabase.table("content_objects").upsert({
+                "bucket": bucket,
+                "sha256": sha256,
+                "storage_path": storage_path,
+                "size": size,
+                "content_type": content_type,
+            }, on_conflict="bucket,sha256", ignore_duplicates=True).execute()
+        except Exception as e:
+            print(f"Content index write failed: {e}")
+
+    def stats(self):
+        return {"uploads": self.uploads, "dedupHits": self.dedup_hits, "bytesSaved": self.bytes_saved}
+
+
+content_index = ContentIndex()
+
+
+def upload_fileobj(fileobj, bucket: str, destination_path: str, content_type: str = None, sha256: str = None):
+    """
+    Upload a readable, seekable file object to Supabase storage without copying
+    it first and return its public URL. Large files use the resumable endpoint.
+    Content that is already stored is not uploaded again; the URL of the
+    existing object is returned instead.
+    """
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        return None
+    content_type = content_type or _content_type(destination_path)
+    size = _file_size(fileobj)
+    sha256 = sha256 or sha256_fileobj(fileobj)
+
+    existing_path = content_index.lookup(bucket, sha256)
+    if existing_path:
+        content_index.dedup_hits += 1
+        content_index.bytes_saved += size
+        return get_public_url(bucket, existing_path)
+
+    if size >= TUS_THRESHOLD:
+        _tus_upload(fileobj, bucket, destination_path, content_type, size)
+    else:
+        _stream_upload(fileobj, bucket, destination_path, content_type, size)
+    content_index.uploads += 1
+    content_index.record(bucket, sha256, destination_path, size, content_type)
+    return get_public_url(bucket, destination_path)
+
+
+def upload_path(file_path: str, bucket: str, destination_path: str, content_type: str = None, sha256: str = None):
+    with open(file_path, "rb") as f:
+        return upload_fileobj(f, bucket, destination_path, content_type, sha256)
@@ -1,5 +1,14 @@
 import os
-from supabase import create_client, Client
+import threading
+import time
+import httpx
+from supabase import create_client, ClientOptions
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 SUPABASE_URL = os.getenv("VITE_SUPABASE_URL")
 SUPABASE_KEY = os.getenv("VITE_SUPABASE_SERVICE_ROLE_KEY") or os.getenv("VITE_SUPABASE_PUBLISHABLE_KEY")
@@ -18,9 +27,143 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 if SUPABASE_URL: SUPABASE_URL = SUPABASE_URL.strip().strip('"')
 if SUPABASE_KEY: SUPABASE_KEY = SUPABASE_KEY.strip().strip('"')
 
+# HTTP pool shared by the table, RPC and storage clients
+POOL_MAX_CONNECTIONS = int(os.getenv("SUPABASE_POOL_MAX_CONNECTIONS", "20"))
+POOL_MAX_KEEPALIVE = int(os.getenv("SUPABASE_POOL_MAX_KEEPALIVE", "10"))
+POOL_KEEPALIVE_EXPIRY = float(os.getenv("SUPABASE_POOL_KEEPALIVE_EXPIRY", "30"))
+CONNECT_TIMEOUT = float(os.getenv("SUPABASE_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("SUPABASE_READ_TIMEOUT", "20"))
+WRITE_TIMEOUT = float(os.getenv("SUPABASE_WRITE_TIMEOUT", "60"))
+POOL_TIMEOUT = float(os.getenv("SUPABASE_POOL_TIMEOUT", "10"))
+USE_HTTP2 = os.getenv("SUPABASE_HTTP2", "true").lower() == "true"
+
+
+class _MeteredStream(httpx.SyncByteStream):
+    """Response body that hands its pool slot back once it is closed."""
+
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    def __iter__(self):
+        yield from self._stream
+
+    def close(self):
+        try:
+            self._stream.close()
+        finally:
+            self._on_close()
+
+
+class MeteredTransport(httpx.HTTPTransport):
+    """
+    httpx transport that caps requests in flight at the pool size and records
+    how long callers waited for a slot, so pool pressure shows up in /metrics
+    instead of as hung requests.
+    """
+
+    def __init__(self, max_connections: int, pool_timeout: float, **kwargs):
+        super().__init__(limits=kwargs.pop("limits"), **kwargs)
+        self.max_connections = max_connections
+        self.pool_timeout = pool_timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self._lock = threading.Lock()
+        self.in_use = 0
+        self.requests = 0
+        self.pool_timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def handle_request(self, request):
+        started = time.monotonic()
+        if not self._slots.acquire(timeout=self.pool_timeout):
+            with self._lock:
+                self.pool_timeouts += 1
+            raise httpx.PoolTimeout(f"No Supabase connection free after {self.pool_timeout}s", request=request)
+        waited = time.monotonic() - started
+        with self._lock:
+            self.in_use += 1
+            self.requests += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+        released = False
+        def release():
+            nonlocal released
+            with self._lock:
+                if released:
+                    return
+                released = True
+                self.in_use -= 1
+            self._slots.release()
+
+        try:
+            response = super().handle_request(request)
+        except BaseException:
+            release()
+            raise
+        response.stream = _MeteredStream(response.stream, release)
+        return response
+
+    def stats(self):
+        connections = getattr(self._pool, "connections", [])
+        with self._lock:
+            return {
+                "maxConnections": self.max_connections,
+                "inUse": self.in_use,
+                "open": len(connections),
+                "idle": sum(1 for c in connections if c.is_idle()),
+                "requests": self.requests,
+                "poolTimeouts": self.pool_timeouts,
+                "avgWaitMs": round(1000 * self.wait_total / self.requests, 2) if self.requests else 0.0,
+                "maxWaitMs": round(1000 * self.wait_max, 2),
+            }
+
+
+def create_supabase_client(url: str = None, key: str = None):
+    """
+    Build a Supabase client on a pooled keep-alive (HTTP/2 when `h2` is
+    installed) httpx client with explicit timeouts. Returns (client, transport)
+    or (None, None) when Supabase is not configured.
+    """
+    url = url or SUPABASE_URL
+    key = key or SUPABASE_KEY
+    if not url or not key:
+        return None, None
+
+    http2 = USE_HTTP2 and HTTP2_AVAILABLE
+    transport = MeteredTransport(
+        max_connections=POOL_MAX_CONNECTIONS,
+        pool_timeout=POOL_TIMEOUT,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=POOL_MAX_KEEPALIVE,
+            keepalive_expiry=POOL_KEEPALIVE_EXPIRY,
+        ),
+    )
+    http_client = httpx.Client(
+        transport=transport,
+        timeout=httpx.Timeout(connect=CONNECT_TIMEOUT, read=READ_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT),
+    )
+    try:
+        options = ClientOptions(httpx_client=http_client)
+    except TypeError:
+        # supabase-py before httpx_client support: default transport, explicit timeouts only
+        print("Supabase client does not accept httpx_client; using its default connection handling")
+        http_client.close()
+        options, transport = ClientOptions(postgrest_client_timeout=READ_TIMEOUT, storage_client_timeout=int(WRITE_TIMEOUT)), None
+    print(f"Supabase pool: {POOL_MAX_CONNECTIONS} connections, http2={http2}")
+    return create_client(url, key, options=options), transport
+
+
 print(f"DEBUG: Supabase Client initializing with URL: {SUPABASE_URL}")
 
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+supabase, supabase_transport = create_supabase_client()
+
+
+def pool_stats():
+    return supabase_transport.stats() if supabase_transport else None
 
 def upload_file(file_path: str, bucket: str, destination_path: str):
     """Uploads a file to Supabase storage and returns the public URL."""
@@ -30,4 +173,10 @@ def upload_file(file_path: str, bucket: str, destination_path: str):
     with open(file_path, "rb") as f:
         res = supabase.storage.from_(bucket).upload(destination_path, f, {"upsert": "true"})
     
+    return get_public_url(bucket, destination_path)
+
+def get_public_url(bucket: str, destination_path: str):
+    """Public URL of a storage object. The URL is deterministic, so it can be handed out before upload."""
+    if not supabase:
+        return None
     return supabase.storage.from_(bucket).get_public_url(destination_path)
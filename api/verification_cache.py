@@ -0,0 +1,190 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from supabase_config import supabase
+from db import run_db
+
+# Seconds a verification result stays fresh, per source
+SOURCE_TTLS = {
+    "license": int(os.getenv("VERIFICATION_CACHE_TTL_LICENSE", str(24 * 3600))),
+    "lei": int(os.getenv("VERIFICATION_CACHE_TTL_LEI", str(7 * 24 * 3600))),
+    "website": int(os.getenv("VERIFICATION_CACHE_TTL_WEBSITE", str(24 * 3600))),
+    # QR extraction keyed by the document's SHA-256; the content never changes
+    "qr": int(os.getenv("VERIFICATION_CACHE_TTL_QR", str(30 * 24 * 3600))),
+    # Gemini answers for ambiguous name/address pairs, keyed by pair and model
+    "match_names": int(os.getenv("VERIFICATION_CACHE_TTL_MATCH", str(30 * 24 * 3600))),
+    "match_addresses": int(os.getenv("VERIFICATION_CACHE_TTL_MATCH", str(30 * 24 * 3600))),
+}
+
+# Response-only keys that should never be persisted with a result. Video
+# artifacts are tracked in memory and their upload may fail, so they belong to
+# the scrape that recorded them, not to later cache hits.
+TRANSIENT_KEYS = ("video_path", "video_artifact_id", "public_video_path", "cached", "cacheAgeSeconds")
+
+# Fields a website scrape extracts; any that fell back to defaults are listed in "defaulted"
+WEBSITE_FIELDS = ("company_name", "address", "business_services", "countries_operating", "people")
+
+
+def _license_found(data: dict):
+    # A scrape that never saw the license card comes back with every field None
+    return bool(data.get("Business Name") or data.get("License Number"))
+
+
+def _lei_found(data: dict):
+    # The LEI scraper fills fields it could not read with "Not Found"
+    return data.get("LEGAL NAME") not in (None, "", "Not Found")
+
+
+def _website_found(data: dict):
+    defaulted = data.get("defaulted") or ()
+    return any(data.get(field) and field not in defaulted for field in WEBSITE_FIELDS)
+
+
+# Scrapes can "succeed" without finding anything; only results passing the
+# check for their source are cached
+FOUND_CHECKS = {
+    "license": _license_found,
+    "lei": _lei_found,
+    "website": _website_found,
+}
+
+
+def normalize_identifier(source: str, identifier: str):
+    identifier = identifier.strip()
+    if source == "website":
+        return identifier.lower().rstrip("/")
+    return identifier.upper()
+
+
+class SupabaseCacheStore:
+    """Persistent tier backed by the `verification_cache` table."""
+
+    def get(self, source, identifier):
+        res = supabase.table("verification_cache").select("data, created_at").eq("source", source).eq("identifier", identifier).execute()
+        if not res.data:
+            return None
+        row = res.data[0]
+        return row["data"], datetime.fromisoformat(row["created_at"]).timestamp()
+
+    def set(self, source, identifier, data, created_at):
+        supabase.table("verification_cache").upsert({
+            "source": source,
+            "identifier": identifier,
+            "data": data,
+            "created_at": datetime.fromtimestamp(created_at).astimezone().isoformat()
+        }).execute()
+
+
+class SQLiteCacheStore:
+    """Persistent tier for local development when Supabase is not configured."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "create table if not exists verification_cache ("
+                "source text not null, identifier text not null, data text not null, "
+                "created_at real not null, primary key (source, identifier))"
+            )
+
+    def get(self, source, identifier):
+        with self._lock:
+            row = self._conn.execute(
+                "select data, created_at from verification_cache where source = ? and identifier = ?",
+                (source, identifier)
+            ).fetchone()
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def set(self, source, identifier, data, created_at):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "insert or replace into verification_cache (source, identifier, data, created_at) values (?, ?, ?, ?)",
+                (source, identifier, json.dumps(data), created_at)
+            )
+
+
+class VerificationCache:
+    """
+    Two-tier cache for scrape results: an in-memory LRU in front of a persistent
+    store. Entries expire after the TTL configured for their source.
+    """
+
+    def __init__(self, store=None, max_entries: int = None, ttls: dict = None):
+        self.store = store
+        self.max_entries = max_entries or int(os.getenv("VERIFICATION_CACHE_MAX_ENTRIES", "1000"))
+        self.ttls = ttls or SOURCE_TTLS
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key, data, created_at):
+        self._memory[key] = (data, created_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, source: str, identifier: str):
+        """Return (data, age_seconds) for a fresh entry, or None."""
+        key = (source, normalize_identifier(source, identifier))
+        ttl = self.ttls.get(source, 0)
+        now = time.time()
+
+        entry = self._memory.get(key)
+        if entry is None and self.store:
+            try:
+                entry = await run_db(self.store.get, *key)
+            except Exception as e:
+                print(f"Verification cache read failed: {e}")
+            if entry:
+                self._remember(key, *entry)
+        elif entry is not None:
+            self._memory.move_to_end(key)
+
+        if entry is None or now - entry[1] > ttl:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data, created_at = entry
+        return dict(data), now - created_at
+
+    async def set(self, source: str, identifier: str, data: dict):
+        """Store a successful result. Results carrying an error or missing what the source looks up are never cached."""
+        if not data or data.get("error"):
+            return
+        found = FOUND_CHECKS.get(source)
+        if found and not found(data):
+            return
+        key = (source, normalize_identifier(source, identifier))
+        data = {k: v for k, v in data.items() if k not in TRANSIENT_KEYS}
+        created_at = time.time()
+        self._remember(key, data, created_at)
+        if self.store:
+            try:
+                await run_db(self.store.set, *key, data, created_at)
+            except Exception as e:
+                print(f"Verification cache write failed: {e}")
+
+    def stats(self):
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "misses": self.misses,
+            "store": type(self.store).__name__ if self.store else None,
+        }
+
+
+def default_store():
+    if supabase:
+        return SupabaseCacheStore()
+    return SQLiteCacheStore(os.getenv("VERIFICATION_CACHE_DB", "/tmp/verification_cache.db"))
+
+
+verification_cache = VerificationCache(default_store())
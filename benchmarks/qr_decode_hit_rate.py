@@ -0,0 +1,77 @@
+"""
+Local QR decode hit rate over a folder of sample trade licenses (PDFs/images).
+
+Every file that decodes locally is one Gemini call saved in
+/verify-trade-license-file. Needs the decoders from requirements.txt
+(opencv-python-headless, pymupdf):
+
+    python benchmarks/qr_decode_hit_rate.py samples/licenses
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from qr_decode import IMAGE_EXTENSIONS, LICENSE_HOSTS, extract_qr_locally, qr_stats  # noqa: E402
+
+
+def sample_files(folder):
+    for root, _, files in os.walk(folder):
+        for name in sorted(files):
+            if name.lower().endswith((".pdf",) + IMAGE_EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", help="Folder of sample license PDFs/images (searched recursively)")
+    parser.add_argument("--verbose", action="store_true", help="Print the result for every file")
+    args = parser.parse_args()
+
+    stats = qr_stats.snapshot()
+    if not stats["available"]:
+        sys.exit("OpenCV is not installed (pip install opencv-python-headless); nothing to measure.")
+    if not stats["pdfSupport"]:
+        print("PyMuPDF is not installed; PDFs will count as misses (pip install pymupdf).")
+
+    files = list(sample_files(args.folder))
+    if not files:
+        sys.exit(f"No PDF or image files found in {args.folder}")
+
+    hits, license_hits, misses, timings = 0, 0, [], []
+    for path in files:
+        started = time.perf_counter()
+        result = extract_qr_locally(path)
+        timings.append(time.perf_counter() - started)
+        if result:
+            hits += 1
+            if any(h in result["url"] for h in LICENSE_HOSTS):
+                license_hits += 1
+        else:
+            misses.append(path)
+        if args.verbose:
+            print(f"{'HIT ' if result else 'MISS'} {timings[-1] * 1000:7.1f} ms  {path}  {result['url'] if result else ''}")
+
+    print(f"Files:              {len(files)}")
+    print(f"Decoded locally:    {hits} ({hits / len(files):.1%})")
+    print(f"License portal URL: {license_hits} ({license_hits / len(files):.1%})")
+    print(f"Gemini fallbacks:   {len(misses)}")
+    print(f"Latency:            mean {1000 * sum(timings) / len(timings):.1f} ms, "
+          f"p95 {1000 * percentile(timings, 95):.1f} ms")
+    if misses and not args.verbose:
+        print("Misses:")
+        for path in misses:
+            print(f"  {path}")
+
+
+if __name__ == "__main__":
+    main()
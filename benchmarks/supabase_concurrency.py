@@ -0,0 +1,62 @@
+"""
+Concurrent request throughput with blocking vs. executor-backed Supabase calls.
+
+Simulates N concurrent async handlers that each make a few DB round trips with a
+fixed latency, once calling `.execute()` directly on the event loop (the old
+behaviour) and once through `db.execute` (the thread-pool data-access layer).
+
+    python benchmarks/supabase_concurrency.py --requests 50 --latency 0.05
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+from db import execute  # noqa: E402
+
+
+class SlowQuery:
+    """Stands in for a built PostgREST query whose execute() blocks for one round trip."""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def execute(self):
+        time.sleep(self.latency)
+        return {"data": []}
+
+
+async def blocking_handler(latency, round_trips):
+    for _ in range(round_trips):
+        SlowQuery(latency).execute()
+
+
+async def executor_handler(latency, round_trips):
+    for _ in range(round_trips):
+        await execute(SlowQuery(latency))
+
+
+async def run(handler, requests, latency, round_trips):
+    started = time.perf_counter()
+    await asyncio.gather(*(handler(latency, round_trips) for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return elapsed, requests / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per DB round trip")
+    parser.add_argument("--round-trips", type=int, default=3, help="DB calls per request")
+    args = parser.parse_args()
+
+    for name, handler in (("blocking", blocking_handler), ("executor", executor_handler)):
+        elapsed, throughput = asyncio.run(run(handler, args.requests, args.latency, args.round_trips))
+        print(f"{name:>9}: {args.requests} requests in {elapsed:.2f}s ({throughput:.1f} req/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -234,7 +234,8 @@ const ProcessDetails = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const response = await fetch(`${ZAMP_API_URL}/zamp/process/${id}`);
+                // Heavy sections are only loaded when named; this page renders all three
+                const response = await fetch(`${ZAMP_API_URL}/zamp/process/${id}?sections=activityLogs,sidebarArtifacts,messages`);
                 if (!response.ok) {
                     throw new Error('Process data not found');
                 }
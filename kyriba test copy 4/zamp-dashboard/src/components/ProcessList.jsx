@@ -7,28 +7,52 @@ const ProcessList = () => {
     const navigate = useNavigate();
     const [activeTab, setActiveTab] = useState('Done');
     const [processes, setProcesses] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null);
+    const [counts, setCounts] = useState({});
     const [loading, setLoading] = useState(true);
 
     const ZAMP_API_URL = import.meta.env.VITE_API_URL || "/api";
 
+    // The list is paged server side: fetch one status at a time and follow X-Next-Cursor
+    const fetchPage = async (status, cursor) => {
+        const params = new URLSearchParams({ status });
+        if (cursor) params.set('cursor', cursor);
+        const response = await fetch(`${ZAMP_API_URL}/zamp/processes?${params}`);
+        const data = await response.json();
+        return { rows: Array.isArray(data) ? data : [], cursor: response.headers.get('X-Next-Cursor') };
+    };
+
     React.useEffect(() => {
+        let cancelled = false;
         const fetchProcesses = async () => {
+            setLoading(true);
             try {
-                const response = await fetch(`${ZAMP_API_URL}/zamp/processes`);
-                const data = await response.json();
-                setProcesses(data);
+                const page = await fetchPage(activeTab);
+                if (cancelled) return;
+                setProcesses(page.rows);
+                setNextCursor(page.cursor);
             } catch (error) {
                 console.error("Error fetching processes:", error);
             } finally {
-                setLoading(false);
+                if (!cancelled) setLoading(false);
             }
         };
         fetchProcesses();
-    }, []);
+        return () => { cancelled = true; };
+    }, [activeTab]);
 
-    // Filter processes based on active tab
-    const getProcessesByStatus = (status) => {
-        return processes.filter(p => p.status === status);
+    const loadMore = async () => {
+        if (!nextCursor) return;
+        setLoading(true);
+        try {
+            const page = await fetchPage(activeTab, nextCursor);
+            setProcesses(prev => [...prev, ...page.rows]);
+            setNextCursor(page.cursor);
+        } catch (error) {
+            console.error("Error fetching processes:", error);
+        } finally {
+            setLoading(false);
+        }
     };
 
     const tabs = [
@@ -39,10 +63,27 @@ const ProcessList = () => {
         { name: 'Done', status: 'Done', color: 'text-green-600', bgColor: 'bg-green-50', borderColor: 'border-green-200', squareBg: 'bg-green-50', squareBorder: 'border-green-700' },
     ].map(tab => ({
         ...tab,
-        count: getProcessesByStatus(tab.status).length
+        count: counts[tab.status] ?? 0
     }));
 
-    const currentProcesses = getProcessesByStatus(activeTab);
+    // Tab counts come from /zamp/processes/count, not from the loaded page
+    React.useEffect(() => {
+        const fetchCounts = async () => {
+            try {
+                const entries = await Promise.all(tabs.map(async (tab) => {
+                    const response = await fetch(`${ZAMP_API_URL}/zamp/processes/count?${new URLSearchParams({ status: tab.status })}`);
+                    const data = await response.json();
+                    return [tab.status, data.count || 0];
+                }));
+                setCounts(Object.fromEntries(entries));
+            } catch (error) {
+                console.error("Error counting processes:", error);
+            }
+        };
+        fetchCounts();
+    }, []);
+
+    const currentProcesses = processes;
 
     const emptyStates = {
         'Needs Attention': {
@@ -221,6 +262,18 @@ const ProcessList = () => {
                             </tbody>
                         </table>
                     </div>
+                    {nextCursor && (
+                        <div className="flex justify-center py-3">
+                            <button
+                                onClick={loadMore}
+                                disabled={loading}
+                                className="flex items-center gap-1.5 px-2 py-1 text-[11px] font-medium text-gray-600 hover:bg-gray-50 rounded border border-gray-200 disabled:opacity-50"
+                            >
+                                {loading && <Loader2 className="w-3 h-3 animate-spin" />}
+                                Load more
+                            </button>
+                        </div>
+                    )}
                 </div>
             ) : (
                 <div className="px-6">
@@ -35,10 +35,23 @@ export function SuccessScreen({ email, referenceNumber, contextData, stepInfo, z
   const bottomRef = useRef<HTMLDivElement>(null);
   const fileInputRef = useRef<HTMLInputElement>(null); // Ref for file input
 
-  // Poll for messages and status
+  // Stream messages and status over SSE, with polling as the safety net
   useEffect(() => {
     if (!zampProcessId) return;
 
+    const applyStatus = (status: string) => {
+      setProcessStatus(status);
+
+      if (status === "Done" || status === "Complete" || status === "success") {
+        setStatusSteps([
+          { label: "Application Submitted", completed: true },
+          { label: "Under Review", completed: true },
+          { label: "Application Approved", completed: true },
+          { label: "Account Opened", completed: true }, // Assuming fully done
+        ]);
+      }
+    };
+
     const fetchData = async () => {
       try {
         // Fetch Messages
@@ -52,25 +65,43 @@ export function SuccessScreen({ email, referenceNumber, contextData, stepInfo, z
         const statusRes = await fetch(`${ZAMP_API_URL}/zamp/status/${zampProcessId}`);
         if (statusRes.ok) {
           const data = await statusRes.json();
-          setProcessStatus(data.status);
-
-          if (data.status === "Done" || data.status === "Complete" || data.status === "success") {
-            setStatusSteps([
-              { label: "Application Submitted", completed: true },
-              { label: "Under Review", completed: true },
-              { label: "Application Approved", completed: true },
-              { label: "Account Opened", completed: true }, // Assuming fully done
-            ]);
-          }
+          applyStatus(data.status);
         }
       } catch (e) {
         console.error("Polling error", e);
       }
     };
 
-    fetchData();
-    const interval = setInterval(fetchData, 3000);
-    return () => clearInterval(interval);
+    if (typeof EventSource === "undefined") {
+      fetchData();
+      const interval = setInterval(fetchData, 3000);
+      return () => clearInterval(interval);
+    }
+
+    // The broker is per server process, so writes handled by another instance never
+    // reach this stream. Keep a slow poll running alongside it to pick those up.
+    const interval = setInterval(fetchData, 15000);
+
+    // EventSource reconnects on its own and every reconnect starts with a fresh snapshot
+    const source = new EventSource(`${ZAMP_API_URL}/zamp/stream/${zampProcessId}`);
+    source.onmessage = (e) => {
+      const event = JSON.parse(e.data);
+      if (event.type === "snapshot") {
+        setMessages(event.messages || []);
+        applyStatus(event.status);
+      } else if (event.type === "message") {
+        setMessages((prev) =>
+          prev.some((m) => m.id === event.message.id) ? prev : [...prev, event.message]
+        );
+      } else if (event.type === "status") {
+        applyStatus(event.status);
+      }
+    };
+    source.onerror = (e) => console.error("Stream error", e);
+    return () => {
+      clearInterval(interval);
+      source.close();
+    };
   }, [zampProcessId]);
 
   // Auto-scroll to bottom of chat
@@ -95,7 +126,7 @@ export function SuccessScreen({ email, referenceNumber, contextData, stepInfo, z
         })
       });
       if (!textOverride) setMsgText("");
-      // Messages will update on next poll
+      // The new message arrives on the stream
     } catch (e) {
       console.error(e);
     }
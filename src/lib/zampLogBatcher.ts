@@ -0,0 +1,84 @@
+// Collects /zamp/log entries and sends them to /zamp/log-bulk in one request,
+// so a burst of onboarding steps costs one HTTP call instead of one per step.
+
+export interface ZampLogEntry {
+  processId: string;
+  log: any;
+  stepId?: string;
+  keyDetails?: any;
+  metadata?: any;
+}
+
+export interface ZampLogResult {
+  index: number;
+  status: "success" | "error";
+  error?: string;
+}
+
+// Browsers reject keepalive requests with bodies over 64 KB
+const KEEPALIVE_MAX_BYTES = 60 * 1024;
+
+export class ZampLogBatcher {
+  private queue: ZampLogEntry[] = [];
+  private timer: ReturnType<typeof setTimeout> | null = null;
+  // Batches go out one after another so stepId updates apply in log order
+  private inFlight: Promise<void> = Promise.resolve();
+
+  constructor(
+    private apiUrl: string,
+    private flushIntervalMs = 250,
+    private maxBatchSize = 50
+  ) {
+    if (typeof document !== "undefined") {
+      // Don't lose queued steps when the tab is hidden or closed
+      document.addEventListener("visibilitychange", () => {
+        if (document.visibilityState === "hidden") this.flush(true);
+      });
+    }
+  }
+
+  // Fire-and-forget: queues the entry and returns; failures are reported here
+  log(entry: ZampLogEntry): void {
+    this.queue.push(entry);
+    if (this.queue.length >= this.maxBatchSize) {
+      this.flush();
+    } else if (!this.timer) {
+      this.timer = setTimeout(() => this.flush(), this.flushIntervalMs);
+    }
+  }
+
+  flush(keepalive = false): Promise<void> {
+    if (this.timer) {
+      clearTimeout(this.timer);
+      this.timer = null;
+    }
+    const batch = this.queue.splice(0, this.queue.length);
+    if (batch.length > 0) {
+      this.inFlight = this.inFlight.then(() => this.send(batch, keepalive));
+    }
+    return this.inFlight;
+  }
+
+  private async send(batch: ZampLogEntry[], keepalive: boolean): Promise<void> {
+    const body = JSON.stringify({ entries: batch });
+    try {
+      const response = await fetch(`${this.apiUrl}/zamp/log-bulk`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body,
+        keepalive: keepalive && body.length <= KEEPALIVE_MAX_BYTES,
+      });
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const data = await response.json();
+      const results: ZampLogResult[] = data.results || [];
+      batch.forEach((entry, index) => {
+        const result = results[index];
+        if (!result || result.status === "error") {
+          console.error("Failed to log to Zamp:", entry.stepId ?? entry.log?.title, result?.error ?? "Missing result");
+        }
+      });
+    } catch (error) {
+      console.error("Failed to bulk log to Zamp:", error);
+    }
+  }
+}
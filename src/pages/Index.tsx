@@ -46,6 +46,7 @@ import {
 } from "@/components/chat/screens";
 import { extractEmiratesIdData, extractAllTradeLicenseData, extractFreelancerPermitData, extractMOAData, extractPOAData } from "@/lib/gemini";
 import { HelpChat } from "@/components/chat/screens/HelpChat";
+import { ZampLogBatcher } from "@/lib/zampLogBatcher";
 
 // --- Zamp Integration Helpers ---
 const ZAMP_API_URL = import.meta.env.VITE_API_URL || "/api";
@@ -65,16 +66,12 @@ const initZampProcess = async () => {
   }
 };
 
-const logToZamp = async (processId: string, log: any, stepId?: string, keyDetails?: any, metadata?: any) => {
-  try {
-    await fetch(`${ZAMP_API_URL}/zamp/log`, {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({ processId, log, stepId, keyDetails, metadata }),
-    });
-  } catch (error) {
-    console.error("Failed to log to Zamp:", error);
-  }
+// Steps logged within the same flush window go out as one /zamp/log-bulk request
+const zampLogBatcher = new ZampLogBatcher(ZAMP_API_URL);
+
+// Fire-and-forget: the step is queued and the batcher reports any failure
+const logToZamp = (processId: string, log: any, stepId?: string, keyDetails?: any, metadata?: any) => {
+  zampLogBatcher.log({ processId, log, stepId, keyDetails, metadata });
 };
 
 const uploadToZamp = async (file: File) => {
@@ -93,6 +90,25 @@ const uploadToZamp = async (file: File) => {
   }
 };
 
+// Scrape videos upload in the background; the public path only exists once the upload succeeded
+const waitForVideoArtifact = async (artifactId?: string, timeoutMs = 120000): Promise<string | undefined> => {
+  if (!artifactId) return undefined;
+  const deadline = Date.now() + timeoutMs;
+  while (Date.now() < deadline) {
+    try {
+      const response = await fetch(`${ZAMP_API_URL}/artifacts/${artifactId}`);
+      if (!response.ok) return undefined;
+      const artifact = await response.json();
+      if (artifact.status === "uploaded") return artifact.public_video_path;
+      if (artifact.status === "failed") return undefined;
+    } catch (error) {
+      console.error("Failed to check video artifact:", error);
+    }
+    await new Promise((resolve) => setTimeout(resolve, 2000));
+  }
+  return undefined;
+};
+
 const AddressInputWrapper = ({
   data,
   stepInfo,
@@ -235,7 +251,7 @@ const SCREEN_MESSAGES: Record<ScreenId, { content: string; helperText?: string }
 };
 
 const ZAMP_LOG_AUTHORITY_COMPLETE = async (zampProcessId: string) => {
-  await logToZamp(zampProcessId, {
+  logToZamp(zampProcessId, {
     title: "Authority verified, all necessary documents received",
     status: "success",
     type: "success"
@@ -474,12 +490,12 @@ const Index = () => {
     const pid = await initZampProcess();
     setZampProcessId(pid);
     if (pid) {
-      await logToZamp(pid, {
+      logToZamp(pid, {
         title: "Auto Loan Application started",
         status: "completed",
         type: "success"
       }, undefined, { status: "processing" }); // Update keyDetails status
-      await logToZamp(pid, {
+      logToZamp(pid, {
         title: "Borrower application & pre-approval in Progress",
         status: "processing",
         type: "info"
@@ -508,13 +524,13 @@ const Index = () => {
     if (confirmed) {
       if (zampProcessId) {
         const licenseType = data.businessType === "trade_license" ? "Trade License" : "Freelancer Permit";
-        await logToZamp(zampProcessId, {
+        logToZamp(zampProcessId, {
           title: `Eligibility Verified, Applicant has a ${licenseType}`,
           status: "success",
           type: "success",
           description: `User has a ${licenseType} and is not in any restricted Industries`
         }, "eligibility-verification");
-        await logToZamp(zampProcessId, {
+        logToZamp(zampProcessId, {
           title: "Verifying Documents",
           status: "processing",
           type: "info"
@@ -702,7 +718,7 @@ const Index = () => {
   const handleEmiratesIdConfirm = async () => {
     addUserMessage("Details confirmed.");
     if (zampProcessId) {
-      await logToZamp(zampProcessId, {
+      logToZamp(zampProcessId, {
         title: "Borrower application & pre-approval complete",
         status: "success",
         type: "success",
@@ -762,7 +778,7 @@ const Index = () => {
         legalType: ((extractedData["Legal Type"] || "").toLowerCase().includes("sole") ? "sole_proprietorship" : "llc") as "sole_proprietorship" | "llc",
         activities: (extractedData["Activities"] || []).join(", "),
         expiryDate: extractedData["Expiry Date"] || "",
-        videoPath: extractedData.public_video_path // Pass video path for logging
+        videoPath: undefined // The recording is logged to Zamp once its upload finishes
       };
 
       updateData({
@@ -781,25 +797,30 @@ const Index = () => {
           id: `art-lic-ver-${Date.now()}`,
           data: extractedData
         }];
-
-        if (extractedData.public_video_path) {
-          artifacts.push({
-            type: "video",
-            label: "Verification Recording",
-            icon: "video",
-            videoPath: extractedData.public_video_path,
-            id: `art-lic-vid-${Date.now()}`
-          });
-        }
-
-        await logToZamp(zampProcessId, {
+        const verificationLog = {
           title: "Document Verification Complete",
           status: "success",
           type: "success",
           description: `Applicant's Legal Type is ${extractedData["Legal Type"]}`,
           artifacts: artifacts
-        }, "trade-license-verification");
-        await logToZamp(zampProcessId, {
+        };
+
+        logToZamp(zampProcessId, verificationLog, "trade-license-verification");
+        // Add the recording to the same step once it is actually in storage
+        waitForVideoArtifact(extractedData.video_artifact_id).then((videoPath) => {
+          if (!videoPath) return;
+          logToZamp(zampProcessId, {
+            ...verificationLog,
+            artifacts: [...artifacts, {
+              type: "video",
+              label: "Verification Recording",
+              icon: "video",
+              videoPath,
+              id: `art-lic-vid-${Date.now()}`
+            }]
+          }, "trade-license-verification");
+        });
+        logToZamp(zampProcessId, {
           title: "Authority Verification pending",
           status: "processing",
           type: "warning"
@@ -878,8 +899,10 @@ const Index = () => {
 
       // Update local data
       updateData({
-        extractedWebsiteData: extractedData,
-        websiteVideoPath: extractedData.public_video_path
+        extractedWebsiteData: extractedData
+      });
+      waitForVideoArtifact(extractedData.video_artifact_id).then((videoPath) => {
+        if (videoPath) updateData({ websiteVideoPath: videoPath });
       });
 
       // Update local data if needed, or just log to Zamp
@@ -919,8 +942,10 @@ const Index = () => {
 
       updateData({
         leiCode: leiCode,
-        extractedLEIData: data,
-        leiVideoPath: data.public_video_path
+        extractedLEIData: data
+      });
+      waitForVideoArtifact(data.video_artifact_id).then((videoPath) => {
+        if (videoPath) updateData({ leiVideoPath: videoPath });
       });
       return true;
 
@@ -1084,7 +1109,7 @@ const Index = () => {
       }
     });
 
-    await logToZamp(zampProcessId, {
+    logToZamp(zampProcessId, {
       title: "Business Verification Complete",
       status: "completed",
       type: "success",
@@ -1160,7 +1185,7 @@ const Index = () => {
               // Log Eligibility Complete
               if (zampProcessId) {
                 const licenseType = data.businessType === "trade_license" ? "Trade License" : "Freelancer Permit";
-                await logToZamp(zampProcessId, {
+                logToZamp(zampProcessId, {
                   title: `Eligibility Verified, Applicant has a ${licenseType}`,
                   status: "success",
                   type: "success",
@@ -1180,7 +1205,7 @@ const Index = () => {
 
                 // Log Trade License Start
                 if (zampProcessId) {
-                  await logToZamp(zampProcessId, {
+                  logToZamp(zampProcessId, {
                     title: "License Verification in Progress",
                     status: "processing",
                     type: "info"
@@ -1236,14 +1261,14 @@ const Index = () => {
                         });
                       }
 
-                      await logToZamp(zampProcessId, {
+                      logToZamp(zampProcessId, {
                         title: "Document Verification Complete",
                         status: "success",
                         type: "success",
                         description: `Details extracted and verified from the source site`,
                         artifacts: artifacts
                       }, "trade-license-verification");
-                      await logToZamp(zampProcessId, {
+                      logToZamp(zampProcessId, {
                         title: "Authority Verification pending",
                         status: "processing",
                         type: "warning"
@@ -1318,7 +1343,7 @@ const Index = () => {
                     // Zamp Log
                     if (zampProcessId) {
                       const uploadedPath = await uploadToZamp(file);
-                      await logToZamp(zampProcessId, {
+                      logToZamp(zampProcessId, {
                         title: "Document Verification Complete",
                         status: "success",
                         type: "success",
@@ -1328,7 +1353,7 @@ const Index = () => {
                           { type: "table", label: "Extracted Permit Data", icon: "table", data: extracted, id: `art-fp-data-${Date.now()}` }
                         ]
                       }, "freelancer-permit-verification");
-                      await logToZamp(zampProcessId, {
+                      logToZamp(zampProcessId, {
                         title: "Authority Verification pending",
                         status: "processing",
                         type: "warning"
@@ -1381,7 +1406,7 @@ const Index = () => {
 
                 if (zampProcessId) {
                   const uploadedPath = await uploadToZamp(file);
-                  await logToZamp(zampProcessId, {
+                  logToZamp(zampProcessId, {
                     title: "Common Authorization Documents",
                     status: "success",
                     type: "success",
@@ -1496,7 +1521,7 @@ const Index = () => {
 
                 if (zampProcessId) {
                   const uploadedPath = await uploadToZamp(file);
-                  await logToZamp(zampProcessId, {
+                  logToZamp(zampProcessId, {
                     title: "Power of Attorney Uploaded",
                     status: "success",
                     type: "success",
@@ -1540,7 +1565,7 @@ const Index = () => {
               addUserMessage("Uploading Bank Mandate...");
               if (zampProcessId) {
                 const uploadedPath = await uploadToZamp(file);
-                await logToZamp(zampProcessId, {
+                logToZamp(zampProcessId, {
                   title: "Bank Mandate Uploaded",
                   status: "success",
                   type: "success",
@@ -1559,7 +1584,7 @@ const Index = () => {
               addUserMessage("Uploading Proof of Address...");
               if (zampProcessId) {
                 const uploadedPath = await uploadToZamp(file);
-                await logToZamp(zampProcessId, {
+                logToZamp(zampProcessId, {
                   title: "Proof of Address Uploaded",
                   status: "success",
                   type: "success",
@@ -1568,7 +1593,7 @@ const Index = () => {
                   ]
                 }, "auth-doc-pa");
 
-                await logToZamp(zampProcessId, {
+                logToZamp(zampProcessId, {
                   title: "Authority verified, all necessary documents received",
                   status: "success",
                   type: "success"
@@ -1758,7 +1783,7 @@ const Index = () => {
 
                 // CONSOLIDATED FINANCIAL LOGGING (Post-Plan Selection)
                 if (zampProcessId) {
-                  await logToZamp(zampProcessId, {
+                  logToZamp(zampProcessId, {
                     title: "Financial Profiling complete",
                     status: "success",
                     type: "success",
@@ -1794,7 +1819,7 @@ const Index = () => {
               onSubmit={async () => {
                 const refNum = `REF-${new Date().getFullYear()}-WIO${Math.floor(Math.random() * 1000)}`;
                 if (zampProcessId) {
-                  await logToZamp(zampProcessId, {
+                  logToZamp(zampProcessId, {
                     title: `Application Submitted, awaiting final review`,
                     status: "success",
                     type: "success"
@@ -0,0 +1,8 @@
+-- Cached results of license, LEI and website verifications, keyed by normalized identifier
+create table if not exists verification_cache (
+    source text not null, -- 'license', 'lei', 'website'
+    identifier text not null,
+    data jsonb not null,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    primary key (source, identifier)
+);
@@ -0,0 +1,60 @@
+-- Atomic append/upsert of one activity log entry.
+--
+-- process_sections.content for 'activityLogs' holds the log array encoded as a JSON
+-- string (the API writes json.dumps(...) into the jsonb column), so the function
+-- decodes and re-encodes it the same way. The row is locked for the duration of
+-- the call, so concurrent appends for one process no longer lose updates.
+create or replace function append_activity_log(p_process_id uuid, p_log jsonb, p_step_id text default null)
+returns void
+language plpgsql
+as $$
+declare
+    v_content jsonb;
+    v_items jsonb;
+    v_index integer;
+begin
+    select content into v_content
+    from process_sections
+    where process_id = p_process_id and section_name = 'activityLogs'
+    for update;
+
+    if not found then
+        insert into process_sections (process_id, section_name, title, content)
+        values (p_process_id, 'activityLogs', 'Activity Logs', to_jsonb(jsonb_build_array(p_log)::text))
+        on conflict (process_id, section_name) do nothing;
+        if found then
+            return;
+        end if;
+        -- Lost the race to create the section; lock the row that won
+        select content into v_content
+        from process_sections
+        where process_id = p_process_id and section_name = 'activityLogs'
+        for update;
+    end if;
+
+    v_items := case jsonb_typeof(v_content)
+        when 'string' then (v_content #>> '{}')::jsonb
+        when 'array' then v_content
+        else '[]'::jsonb
+    end;
+
+    if p_step_id is not null then
+        select e.ord - 1 into v_index
+        from jsonb_array_elements(v_items) with ordinality as e(item, ord)
+        where e.item->>'stepId' = p_step_id
+        order by e.ord
+        limit 1;
+    end if;
+
+    if v_index is not null then
+        v_items := jsonb_set(v_items, array[v_index::text], (v_items -> v_index) || p_log);
+    else
+        v_items := v_items || jsonb_build_array(p_log);
+    end if;
+
+    update process_sections
+    set content = to_jsonb(v_items::text),
+        updated_at = timezone('utc'::text, now())
+    where process_id = p_process_id and section_name = 'activityLogs';
+end;
+$$;
@@ -0,0 +1,73 @@
+-- Row-per-event storage for activity logs, artifacts, key details and messages.
+--
+-- process_sections used to hold each of these as one growing JSON array per
+-- (process_id, section_name); every read and write moved the whole history.
+-- Each entry is now its own row, so per-step writes stay flat as a process grows.
+-- process_sections keeps the section headers (title) and the overview text.
+create table if not exists activity_log (
+    id bigint generated always as identity primary key,
+    process_id uuid not null references processes(id) on delete cascade,
+    section_name text not null, -- 'activityLogs', 'sidebarArtifacts', 'keyDetails', 'messages'
+    step_id text, -- activityLogs entries that are updated in place by stepId
+    item_id text, -- the entry's own "id" (log id, artifact id, message id)
+    payload jsonb not null,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create index if not exists idx_activity_log_process_created on activity_log(process_id, created_at);
+create index if not exists idx_activity_log_process_step on activity_log(process_id, step_id);
+create index if not exists idx_activity_log_process_item on activity_log(process_id, section_name, item_id);
+-- One row per step; NULL step_ids never conflict
+create unique index if not exists uq_activity_log_step on activity_log(process_id, section_name, step_id);
+
+-- Backfill from the existing blobs. Content is a JSON string holding the array
+-- (json.dumps from the API); a plain object (seeded keyDetails) becomes one row.
+insert into activity_log (process_id, section_name, step_id, item_id, payload, created_at, updated_at)
+select s.process_id, s.section_name, e.item->>'stepId', e.item->>'id', e.item, s.updated_at, s.updated_at
+from process_sections s
+cross join lateral (
+    select case jsonb_typeof(s.content)
+        when 'string' then (s.content #>> '{}')::jsonb
+        else s.content
+    end as decoded
+) d
+cross join lateral (
+    select item, ord
+    from jsonb_array_elements(case jsonb_typeof(d.decoded) when 'array' then d.decoded else jsonb_build_array(d.decoded) end)
+        with ordinality as x(item, ord)
+) e
+where s.section_name in ('activityLogs', 'sidebarArtifacts', 'keyDetails', 'messages')
+  and jsonb_typeof(d.decoded) in ('array', 'object')
+  and not exists (select 1 from activity_log l where l.process_id = s.process_id and l.section_name = s.section_name)
+order by s.process_id, s.section_name, e.ord
+on conflict (process_id, section_name, step_id) do nothing;
+
+-- Append one activity log entry, or merge it into the row for its stepId
+create or replace function append_activity_log(p_process_id uuid, p_log jsonb, p_step_id text default null)
+returns void
+language sql
+as $$
+    insert into activity_log (process_id, section_name, step_id, item_id, payload)
+    values (p_process_id, 'activityLogs', p_step_id, p_log->>'id', p_log)
+    on conflict (process_id, section_name, step_id) do update
+    set payload = activity_log.payload || excluded.payload,
+        item_id = coalesce(excluded.item_id, activity_log.item_id),
+        updated_at = timezone('utc'::text, now());
+$$;
+
+-- Add sidebar artifacts, skipping ids the process already has
+create or replace function add_activity_artifacts(p_process_id uuid, p_artifacts jsonb)
+returns void
+language sql
+as $$
+    insert into activity_log (process_id, section_name, item_id, payload)
+    select p_process_id, 'sidebarArtifacts', a.item->>'id', a.item
+    from jsonb_array_elements(p_artifacts) with ordinality as a(item, ord)
+    where a.item->>'id' is null
+       or not exists (
+           select 1 from activity_log l
+           where l.process_id = p_process_id and l.section_name = 'sidebarArtifacts' and l.item_id = a.item->>'id'
+       )
+    order by a.ord;
+$$;
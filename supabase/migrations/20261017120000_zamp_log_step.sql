@@ -0,0 +1,59 @@
+-- Everything one /zamp/log call does, in a single transaction and round trip:
+-- upsert the activity log entry, add new artifacts, append key details and
+-- update process metadata (applicantName / status).
+create or replace function zamp_log_step(
+    p_process_id uuid,
+    p_log jsonb,
+    p_step_id text default null,
+    p_key_details jsonb default null,
+    p_metadata jsonb default null
+)
+returns void
+language plpgsql
+as $$
+begin
+    perform append_activity_log(p_process_id, p_log, p_step_id);
+
+    if jsonb_typeof(p_log->'artifacts') = 'array' and jsonb_array_length(p_log->'artifacts') > 0 then
+        perform add_activity_artifacts(p_process_id, p_log->'artifacts');
+    end if;
+
+    if p_key_details is not null and p_key_details <> 'null'::jsonb then
+        insert into activity_log (process_id, section_name, item_id, payload)
+        select p_process_id, 'keyDetails', kd.item->>'id', kd.item
+        from jsonb_array_elements(
+            case jsonb_typeof(p_key_details) when 'array' then p_key_details else jsonb_build_array(p_key_details) end
+        ) with ordinality as kd(item, ord)
+        order by kd.ord;
+    end if;
+
+    if p_metadata ? 'applicantName' or p_metadata ? 'status' then
+        update processes
+        set applicant_name = case when p_metadata ? 'applicantName' then p_metadata->>'applicantName' else applicant_name end,
+            status = case when p_metadata ? 'status' then p_metadata->>'status' else status end
+        where id = p_process_id;
+    end if;
+end;
+$$;
+
+-- Several /zamp/log entries for one process, applied in order in one transaction.
+-- Each element: { "log": {...}, "stepId": "...", "keyDetails": ..., "metadata": {...} }
+create or replace function zamp_log_entries(p_process_id uuid, p_entries jsonb)
+returns void
+language plpgsql
+as $$
+declare
+    v_entry jsonb;
+begin
+    for v_entry in select e.item from jsonb_array_elements(p_entries) with ordinality as e(item, ord) order by e.ord
+    loop
+        perform zamp_log_step(
+            p_process_id,
+            v_entry->'log',
+            v_entry->>'stepId',
+            nullif(v_entry->'keyDetails', 'null'::jsonb),
+            nullif(v_entry->'metadata', 'null'::jsonb)
+        );
+    end loop;
+end;
+$$;
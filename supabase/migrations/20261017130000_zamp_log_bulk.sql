@@ -0,0 +1,32 @@
+-- Ordered /zamp/log entries for any number of processes in one call.
+-- Each element: { "processId": "...", "log": {...}, "stepId": "...", "keyDetails": ..., "metadata": {...} }
+-- Every entry runs in its own subtransaction, so one bad entry does not roll back
+-- the others; the result array reports success or the error for each entry.
+create or replace function zamp_log_bulk(p_entries jsonb)
+returns jsonb
+language plpgsql
+as $$
+declare
+    v_entry jsonb;
+    v_index integer;
+    v_results jsonb := '[]'::jsonb;
+begin
+    for v_entry, v_index in
+        select e.item, (e.ord - 1)::integer from jsonb_array_elements(p_entries) with ordinality as e(item, ord) order by e.ord
+    loop
+        begin
+            perform zamp_log_step(
+                (v_entry->>'processId')::uuid,
+                v_entry->'log',
+                v_entry->>'stepId',
+                nullif(v_entry->'keyDetails', 'null'::jsonb),
+                nullif(v_entry->'metadata', 'null'::jsonb)
+            );
+            v_results := v_results || jsonb_build_array(jsonb_build_object('index', v_index, 'status', 'success'));
+        exception when others then
+            v_results := v_results || jsonb_build_array(jsonb_build_object('index', v_index, 'status', 'error', 'error', sqlerrm));
+        end;
+    end loop;
+    return v_results;
+end;
+$$;
@@ -0,0 +1,54 @@
+-- Keep processes.updated_at as the version of everything shown for a process,
+-- so the API can answer If-None-Match on /zamp/process, /zamp/messages and
+-- /zamp/processes by reading that one column instead of the jsonb payloads.
+
+-- Any direct update of a process bumps its version
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := timezone('utc'::text, now());
+    return new;
+end;
+$$;
+
+drop trigger if exists trg_processes_touch on processes;
+create trigger trg_processes_touch
+before update on processes
+for each row execute function touch_updated_at();
+
+drop trigger if exists trg_activity_log_touch on activity_log;
+create trigger trg_activity_log_touch
+before update on activity_log
+for each row execute function touch_updated_at();
+
+-- Writes to a process's activity_log or section headers bump the process
+create or replace function touch_parent_process()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_process_id uuid := case when tg_op = 'DELETE' then old.process_id else new.process_id end;
+begin
+    -- now() is fixed per transaction, so a batch of entries updates the row once
+    update processes
+    set updated_at = timezone('utc'::text, now())
+    where id = v_process_id
+      and updated_at is distinct from timezone('utc'::text, now());
+    return null;
+end;
+$$;
+
+drop trigger if exists trg_activity_log_touch_process on activity_log;
+create trigger trg_activity_log_touch_process
+after insert or update or delete on activity_log
+for each row execute function touch_parent_process();
+
+drop trigger if exists trg_process_sections_touch_process on process_sections;
+create trigger trg_process_sections_touch_process
+after insert or update or delete on process_sections
+for each row execute function touch_parent_process();
+
+-- Version check for the process list: newest updated_at without a scan
+create index if not exists idx_processes_updated_at on processes(updated_at desc);
@@ -0,0 +1,9 @@
+-- Keyset pagination for /zamp/processes: newest first on (created_at, id),
+-- optionally filtered by status, team or a fragment of the applicant name.
+create extension if not exists pg_trgm;
+
+create index if not exists idx_processes_created_id on processes(created_at desc, id desc);
+create index if not exists idx_processes_status_created_id on processes(status, created_at desc, id desc);
+create index if not exists idx_processes_team_created_id on processes(team, created_at desc, id desc);
+-- applicant_name filters are substring (ilike '%...%') matches
+create index if not exists idx_processes_applicant_name_trgm on processes using gin (applicant_name gin_trgm_ops);
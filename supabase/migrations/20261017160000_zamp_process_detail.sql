@@ -0,0 +1,93 @@
+-- Process detail in one round trip: metadata, section headers, per-section
+-- entry counts and the entries of the requested sections only.
+--
+-- Header content is returned only for sections that are not row-backed
+-- (e.g. overview); the old activityLogs/messages blobs are never shipped.
+-- activityLogs can be read as a tail (p_log_tail newest entries) and paged
+-- back with p_log_before, the activity_log id returned as activityLogsBefore.
+create index if not exists idx_activity_log_process_section_created
+    on activity_log(process_id, section_name, created_at, id);
+
+create or replace function zamp_process_detail(
+    p_process_id uuid,
+    p_sections text[] default array['keyDetails'],
+    p_log_tail int default null,
+    p_log_before bigint default null
+)
+returns jsonb
+language plpgsql
+stable
+as $$
+declare
+    v_row_sections constant text[] := array['activityLogs', 'sidebarArtifacts', 'keyDetails', 'messages'];
+    v_process jsonb;
+    v_section text;
+    v_rows jsonb;
+    v_items jsonb := '{}'::jsonb;
+    v_before_at timestamp with time zone;
+    v_next_before bigint;
+begin
+    select jsonb_build_object('id', id, 'applicant_name', applicant_name, 'status', status, 'updated_at', updated_at)
+    into v_process
+    from processes
+    where id = p_process_id;
+
+    if v_process is null then
+        return null;
+    end if;
+
+    if p_log_before is not null then
+        select created_at into v_before_at
+        from activity_log
+        where id = p_log_before and process_id = p_process_id;
+    end if;
+
+    foreach v_section in array coalesce(p_sections, '{}'::text[]) loop
+        if v_section = 'activityLogs' then
+            -- Newest first so the limit keeps the tail, then back to display order
+            select coalesce(jsonb_agg(t.payload order by t.created_at, t.id), '[]'::jsonb),
+                   case when count(*) = p_log_tail then (array_agg(t.id order by t.created_at, t.id))[1] end
+            into v_rows, v_next_before
+            from (
+                select id, payload, created_at
+                from activity_log
+                where process_id = p_process_id
+                  and section_name = 'activityLogs'
+                  and (v_before_at is null or (created_at, id) < (v_before_at, p_log_before))
+                order by created_at desc, id desc
+                limit p_log_tail
+            ) t;
+        else
+            select coalesce(jsonb_agg(payload order by created_at, id), '[]'::jsonb)
+            into v_rows
+            from activity_log
+            where process_id = p_process_id and section_name = v_section;
+        end if;
+        v_items := v_items || jsonb_build_object(v_section, v_rows);
+    end loop;
+
+    return jsonb_build_object(
+        'process', v_process,
+        'headers', (
+            select coalesce(jsonb_agg(jsonb_build_object(
+                'section_name', section_name,
+                'title', title,
+                'content', case when section_name = any(v_row_sections) then null else content end
+            )), '[]'::jsonb)
+            from process_sections
+            where process_id = p_process_id
+        ),
+        'counts', (
+            select coalesce(jsonb_object_agg(section_name, n), '{}'::jsonb)
+            from (
+                select section_name, count(*) as n
+                from activity_log
+                where process_id = p_process_id
+                group by section_name
+            ) c
+        ),
+        'items', v_items,
+        'activityLogsBefore', v_next_before
+    );
+end;
+$$;
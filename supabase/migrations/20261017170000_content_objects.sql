@@ -0,0 +1,11 @@
+-- Content-addressed index of uploaded storage objects. Before uploading, the
+-- API hashes the file and reuses the existing object when the hash is known.
+create table if not exists content_objects (
+    bucket text not null,
+    sha256 text not null, -- hex SHA-256 of the file content
+    storage_path text not null, -- path the content was first uploaded to
+    size bigint,
+    content_type text,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    primary key (bucket, sha256)
+);
@@ -0,0 +1,35 @@
+-- Version of the process list for /zamp/processes ETags, without counting rows.
+-- Inserts and edits move max(processes.updated_at) (idx_processes_updated_at);
+-- deletes do not, so they bump the counter kept here.
+create table if not exists process_list_version (
+    id boolean primary key default true check (id), -- single row
+    deletions bigint not null default 0
+);
+
+insert into process_list_version (id) values (true) on conflict do nothing;
+
+create or replace function bump_process_list_deletions()
+returns trigger
+language plpgsql
+as $$
+begin
+    update process_list_version set deletions = deletions + 1;
+    return null;
+end;
+$$;
+
+drop trigger if exists trg_processes_deleted on processes;
+create trigger trg_processes_deleted
+after delete on processes
+for each statement execute function bump_process_list_deletions();
+
+create or replace function zamp_process_list_version()
+returns jsonb
+language sql
+stable
+as $$
+    select jsonb_build_object(
+        'updatedAt', (select max(updated_at) from processes),
+        'deletions', (select deletions from process_list_version)
+    );
+$$;
@@ -0,0 +1,30 @@
+-- now() is the transaction start time, so a long transaction that commits after
+-- a newer one stamps an older updated_at and never moves max(updated_at): the
+-- list ETag stays the same and clients keep getting 304 for changed data.
+-- clock_timestamp() is the time of the write itself.
+
+create or replace function touch_updated_at()
+returns trigger
+language plpgsql
+as $$
+begin
+    new.updated_at := timezone('utc'::text, clock_timestamp());
+    return new;
+end;
+$$;
+
+-- clock_timestamp() differs for every row, so the old "already touched in this
+-- transaction" check on updated_at no longer applies; every write bumps the parent.
+create or replace function touch_parent_process()
+returns trigger
+language plpgsql
+as $$
+declare
+    v_process_id uuid := case when tg_op = 'DELETE' then old.process_id else new.process_id end;
+begin
+    update processes
+    set updated_at = timezone('utc'::text, clock_timestamp())
+    where id = v_process_id;
+    return null;
+end;
+$$;
@@ -18,7 +18,7 @@ create table if not exists processes (
 create table if not exists process_sections (
     id uuid default uuid_generate_v4() primary key,
     process_id uuid references processes(id) on delete cascade,
-    section_name text not null, -- 'overview', 'activityLogs', 'keyDetails', 'sidebarArtifacts', 'messages'
+    section_name text not null, -- 'overview', 'activityLogs', 'keyDetails' (headers; entries live in activity_log)
     title text,
     content jsonb default '[]'::jsonb, -- Stores the 'items' or 'content' string
     updated_at timestamp with time zone default timezone('utc'::text, now()) not null,
@@ -27,3 +27,62 @@ create table if not exists process_sections (
 
 -- Indexes for performance
 create index if not exists idx_process_sections_process_id on process_sections(process_id);
+
+-- 3. Verification result cache (license / LEI / website scrapes)
+create table if not exists verification_cache (
+    source text not null, -- 'license', 'lei', 'website', 'qr', 'match_names', 'match_addresses'
+    identifier text not null,
+    data jsonb not null,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    primary key (source, identifier)
+);
+
+-- 4. Row-per-event activity log (activityLogs, sidebarArtifacts, keyDetails, messages)
+create table if not exists activity_log (
+    id bigint generated always as identity primary key,
+    process_id uuid not null references processes(id) on delete cascade,
+    section_name text not null,
+    step_id text,
+    item_id text,
+    payload jsonb not null,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    updated_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
+create index if not exists idx_activity_log_process_created on activity_log(process_id, created_at);
+create index if not exists idx_activity_log_process_step on activity_log(process_id, step_id);
+create index if not exists idx_activity_log_process_item on activity_log(process_id, section_name, item_id);
+create unique index if not exists uq_activity_log_step on activity_log(process_id, section_name, step_id);
+
+-- processes.updated_at versions a process and everything logged under it
+-- (touch triggers in migrations/20261017140000_process_updated_at.sql, stamped
+-- with clock_timestamp() since migrations/20261017190000_touch_clock_timestamp.sql)
+create index if not exists idx_processes_updated_at on processes(updated_at desc);
+
+-- Keyset pagination and filters for the process list
+create extension if not exists pg_trgm;
+create index if not exists idx_processes_created_id on processes(created_at desc, id desc);
+create index if not exists idx_processes_status_created_id on processes(status, created_at desc, id desc);
+create index if not exists idx_processes_team_created_id on processes(team, created_at desc, id desc);
+create index if not exists idx_processes_applicant_name_trgm on processes using gin (applicant_name gin_trgm_ops);
+
+-- Per-section reads of activity_log (process detail, tails of long histories)
+create index if not exists idx_activity_log_process_section_created on activity_log(process_id, section_name, created_at, id);
+
+-- 5. Content-addressed upload index (SHA-256 -> storage path)
+create table if not exists content_objects (
+    bucket text not null,
+    sha256 text not null,
+    storage_path text not null,
+    size bigint,
+    content_type text,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null,
+    primary key (bucket, sha256)
+);
+
+-- 6. Process list version: deletes bump the counter, everything else moves
+-- max(processes.updated_at) (migrations/20261017180000_process_list_version.sql)
+create table if not exists process_list_version (
+    id boolean primary key default true check (id),
+    deletions bigint not null default 0
+);
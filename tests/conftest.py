@@ -0,0 +1,28 @@
+import asyncio
+import os
+import sys
+import pytest
+
+# The API modules import each other as top-level modules (as under `uvicorn index:app`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "api"))
+
+
+@pytest.fixture
+def api_post():
+    """`post(path, json)` against the FastAPI app in-process; skips when its dependencies are missing."""
+    index = pytest.importorskip("index")
+    import httpx
+
+    def post(path: str, body: dict):
+        async def call():
+            transport = httpx.ASGITransport(app=index.app)
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await client.post(path, json=body)
+            finally:
+                # The Gemini client binds to this loop
+                await index.gemini.close()
+
+        return asyncio.run(call())
+
+    return post
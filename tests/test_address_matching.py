@@ -0,0 +1,52 @@
+import pytest
+
+from address_matching import match_addresses_locally, parse_address
+
+
+def test_parse_keeps_floor_and_unit_in_their_own_segments():
+    parsed = parse_address("Office 12, Floor 3, Emirates Towers")
+    assert parsed["unit"] == "12"
+    assert parsed["floor"] == "3"
+
+
+def test_parse_prefers_floor_number_after_the_word():
+    parsed = parse_address("Office 12 Floor 3 Emirates Towers")
+    assert parsed["unit"] == "12"
+    assert parsed["floor"] == "3"
+    assert parse_address("12th Floor, Office 1203")["floor"] == "12"
+
+
+@pytest.mark.parametrize("address1, address2", [
+    ("PO Box 1234, Dubai", "P.O. Box 1234 Dubai UAE"),
+    ("Villa 12, Al Barsha 1, Dubai", "Villa 12, Al Barsha 1 Dubai"),
+    ("Flat 301, Al Nahda Building, Sharjah", "Apartment 301, Al Nahda Bldg, Sharjah, UAE"),
+    ("12th Floor, Office 1203, Tower A", "Office 1203, Floor 12, Tower A"),
+    ("Office 1203, JLT Cluster X, Dubai", "Ofc 1203, Cluster X, Jumeirah Lake Towers, Dubai, UAE"),
+    ("Flat 301, Al Nahda Building, Sharjah", "Flat 301, Al Nahdha Building, Sharjah"),
+])
+def test_accepts_same_address_locally(address1, address2):
+    result = match_addresses_locally(address1, address2)
+    assert result["match"] and not result["ambiguous"]
+
+
+@pytest.mark.parametrize("address1, address2", [
+    ("Office 12, Floor 3, Emirates Towers", "Office 12, Floor 30, Emirates Towers"),
+    ("Unit 5, Building 7, DIFC", "Unit 5, Building 8, DIFC"),
+    ("Building 12, Street 3", "Building 21, Street 3"),
+    ("Villa 12, Street 5, Al Barsha 1", "Villa 12, Street 5, Al Barsha 2"),
+    ("Office 1203, Tower A, Business Bay, Dubai", "Office 1204, Tower A, Business Bay, Dubai"),
+    ("Al Barsha, Dubai", "Deira, Abu Dhabi"),
+    ("Office 101, Tower A, Business Bay", "Office 101, Tower B, Business Bay"),
+    ("Building 7, DIFC", "Building 7, DMCC"),
+    ("Shop 5, Deira City Centre", "Shop 5, Mirdif City Centre"),
+    ("Office 5, Dubai Internet City", "Office 5, Dubai Media City"),
+])
+def test_never_accepts_different_numbers_or_places(address1, address2):
+    result = match_addresses_locally(address1, address2)
+    assert not result["match"]
+    assert result["reason"].startswith("Different")
+
+
+def test_weak_component_match_goes_to_gemini():
+    result = match_addresses_locally("PO Box 1234, Al Quoz, Dubai", "PO Box 1234, Dubai")
+    assert result["ambiguous"]
@@ -0,0 +1,84 @@
+"""Endpoints that call Gemini, driven against the in-process fake_gemini server."""
+import asyncio
+import pytest
+
+index = pytest.importorskip("index")
+from fake_gemini import start_fake_gemini  # noqa: E402
+from verification_cache import VerificationCache  # noqa: E402
+
+
+@pytest.fixture
+def fake_gemini(monkeypatch):
+    server, base_url = start_fake_gemini()
+    monkeypatch.setattr(index, "GENAI_API_KEY", "fake")
+    monkeypatch.setattr(index.gemini, "api_key", "fake")
+    monkeypatch.setattr(index.gemini, "base_url", base_url)
+    # Fresh in-memory cache so answers are not served from an earlier run
+    monkeypatch.setattr(index, "verification_cache", VerificationCache())
+    yield
+    server.shutdown()
+
+
+def test_match_names_asks_gemini_for_ambiguous_pair(fake_gemini, api_post):
+    res = api_post("/match-names", {"name1": "John Smith", "name2": "Jon Smyth"})
+    assert res.status_code == 200
+    data = res.json()
+    assert data["method"] == "gemini"
+    assert data["reason"] == "Fake: sequence ratio"
+    assert data["cached"] is False
+
+    again = api_post("/match-names", {"name1": "Jon Smyth", "name2": "John Smith"}).json()
+    assert again["cached"] is True
+    assert again["confidence"] == data["confidence"]
+
+
+def test_match_names_decides_clear_pair_locally(fake_gemini, api_post):
+    calls = dict(index.gemini.stats()["outcomes"].get("match_names", {}))
+    data = api_post("/match-names", {"name1": "Mohammed Al Maktoum", "name2": "Muhammad El-Maktoum"}).json()
+    assert data["method"] == "local"
+    assert data["match"] is True
+    assert index.gemini.stats()["outcomes"].get("match_names", {}) == calls
+
+
+def test_chat_help(fake_gemini, api_post):
+    res = api_post("/chat/help", {"query": "How do I upload my trade license?", "stepInfo": "2.1"})
+    assert res.status_code == 200
+    assert res.json() == {"response": "This is a fake Gemini answer for offline testing."}
+    assert index.gemini.stats()["outcomes"]["chat_help"]["ok"] >= 1
+
+
+def test_large_file_goes_through_files_api(tmp_path):
+    from gemini import GeminiClient
+
+    server, base_url = start_fake_gemini()
+    image = tmp_path / "license.png"
+    image.write_bytes(b"\x89PNG" + b"\0" * 64)
+
+    async def run():
+        client = GeminiClient("fake", base_url=base_url, inline_max_bytes=1024)
+        try:
+            small = await client.file_part(str(image))
+            client.inline_max_bytes = 16
+            large = await client.file_part(str(image))
+            answer = await client.generate([large, {"text": "Extract the URL encoded in the QR code."}])
+            return small, large, answer
+        finally:
+            await client.close()
+
+    try:
+        small, large, answer = asyncio.run(run())
+    finally:
+        server.shutdown()
+    assert small["inline_data"]["mime_type"] == "image/png"
+    assert large["file_data"]["mime_type"] == "image/png"
+    assert large["file_data"]["file_uri"].startswith(base_url)
+    assert "licenseNumber" in answer
+
+
+def test_unknown_file_type_is_rejected(tmp_path):
+    from gemini import GeminiClient, GeminiError
+
+    document = tmp_path / "license"
+    document.write_bytes(b"no extension")
+    with pytest.raises(GeminiError):
+        asyncio.run(GeminiClient("fake").file_part(str(document)))
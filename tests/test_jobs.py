@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+
+from jobs import JobQueue, MemoryJobStore
+from pubsub import broker
+
+
+async def wait_for_status(queue: JobQueue, job_id: str, *statuses):
+    for _ in range(200):
+        job = await queue.get(job_id)
+        if job["status"] in statuses:
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {statuses}")
+
+
+def test_submit_runs_the_handler_through_running_to_succeeded():
+    async def scenario():
+        queue = JobQueue(MemoryJobStore(), workers=1)
+        gate = asyncio.Event()
+
+        @queue.handler("echo")
+        async def echo(payload):
+            await gate.wait()
+            return {"echo": payload}
+
+        job = await queue.submit("echo", {"n": 1})
+        with broker.subscribe(f"job:{job['jobId']}") as events:
+            running = await wait_for_status(queue, job["jobId"], "running")
+            gate.set()
+            done = await wait_for_status(queue, job["jobId"], "succeeded")
+            published = [events.get_nowait()["status"] for _ in range(events.qsize())]
+        await queue.stop()
+        return job, running, done, published
+
+    job, running, done, published = asyncio.run(scenario())
+    assert job["status"] == "queued"
+    assert running["status"] == "running"
+    assert done["result"] == {"echo": {"n": 1}}
+    assert done["error"] is None
+    assert published[-1] == "succeeded"
+
+
+def test_handler_exception_marks_the_job_failed():
+    async def scenario():
+        queue = JobQueue(MemoryJobStore(), workers=1)
+
+        @queue.handler("boom")
+        async def boom(payload):
+            raise RuntimeError("portal down")
+
+        job = await queue.submit("boom", {})
+        failed = await wait_for_status(queue, job["jobId"], "failed", "succeeded")
+        await queue.stop()
+        return failed
+
+    failed = asyncio.run(scenario())
+    assert failed["status"] == "failed"
+    assert failed["error"] == "portal down"
+
+
+def test_unknown_kind_is_rejected():
+    async def scenario():
+        queue = JobQueue(MemoryJobStore(), workers=1)
+        with pytest.raises(ValueError):
+            await queue.submit("nope", {})
+
+    asyncio.run(scenario())
+
+
+def test_start_fails_interrupted_jobs_and_requeues_queued_ones():
+    store = MemoryJobStore()
+    base = {"kind": "echo", "payload": {}, "result": None, "error": None, "created_at": 0.0, "updated_at": 0.0}
+    store.create({**base, "id": "was-running", "status": "running"})
+    store.create({**base, "id": "was-queued", "status": "queued"})
+
+    async def scenario():
+        queue = JobQueue(store, workers=1)
+
+        @queue.handler("echo")
+        async def echo(payload):
+            return {"ok": True}
+
+        await queue.start()
+        interrupted = await queue.get("was-running")
+        resumed = await wait_for_status(queue, "was-queued", "succeeded", "failed")
+        await queue.stop()
+        return interrupted, resumed
+
+    interrupted, resumed = asyncio.run(scenario())
+    assert interrupted["status"] == "failed"
+    assert interrupted["error"] == "Interrupted by server restart"
+    assert resumed["status"] == "succeeded"
+    assert resumed["result"] == {"ok": True}
@@ -0,0 +1,60 @@
+import pytest
+
+from name_matching import CALIBRATION, NAME_MATCH_ACCEPT, NAME_MATCH_REJECT, calibrate, match_names_locally, name_tokens
+
+
+@pytest.mark.parametrize("raw, confidence", CALIBRATION)
+def test_calibrate_hits_table_points(raw, confidence):
+    assert calibrate(raw) == confidence
+
+
+def test_calibrate_interpolates_and_is_monotonic():
+    assert calibrate(0.875) == pytest.approx((0.5 + 0.75) / 2, abs=1e-3)
+    values = [calibrate(i / 100) for i in range(101)]
+    assert values == sorted(values)
+    assert values[0] == 0.0 and values[-1] == 1.0
+
+
+def test_calibration_points_sit_on_the_thresholds_sensibly():
+    # Spelling variants need raw similarity well above 0.9 to be accepted outright
+    assert calibrate(0.9) < NAME_MATCH_ACCEPT <= calibrate(0.95)
+    assert calibrate(0.75) <= NAME_MATCH_REJECT < calibrate(0.85)
+
+
+def test_name_tokens_canonicalize_variants():
+    assert name_tokens("Mohamed El-Maktoum") == name_tokens("Muhammad Al Maktoum") == ["muhammad", "almaktum"]
+    assert name_tokens("Abdul Rahman ibn Khaled") == ["abdrahman", "bin", "khalid"]
+
+
+@pytest.mark.parametrize("name1, name2", [
+    ("Mohammed Al Maktoum", "Muhammad El-Maktoum"),
+    ("Yousef Al Hashemi", "Yusuf Al-Hashimi"),
+    ("Aisha Salem Al Kaabi", "Ayesha Saleem Alkaabi"),
+    ("Omar Khalid", "Khaled Omar"),
+    ("Ahmed Khan", "Ahmad Karim Khan"),
+])
+def test_accepts_variants_locally(name1, name2):
+    result = match_names_locally(name1, name2)
+    assert result["match"] and not result["ambiguous"]
+
+
+@pytest.mark.parametrize("name1, name2", [
+    ("Ahmed Saeed Al Mansoori", "Ahmed Saif Al Mansoori"),
+    ("Fatima Ahmed Al Shamsi", "Fatima Hamad Al Shamsi"),
+    ("Mohammed Hassan Ali", "Mohammed Hussain Ali"),
+    ("Hamad Rashid", "Hamid Rashid"),
+])
+def test_distinct_known_names_are_never_accepted_locally(name1, name2):
+    result = match_names_locally(name1, name2)
+    assert not result["match"]
+    assert result["ambiguous"]
+    assert result["reason"].startswith("Different names")
+
+
+@pytest.mark.parametrize("name1, name2", [
+    ("Ali Hassan", "Peter Jones"),
+    ("Mohammed Ali", "Mohammed Umar"),
+])
+def test_rejects_different_people_locally(name1, name2):
+    result = match_names_locally(name1, name2)
+    assert not result["match"] and not result["ambiguous"]
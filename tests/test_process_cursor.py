@@ -0,0 +1,30 @@
+import base64
+import json
+import pytest
+
+index = pytest.importorskip("index")
+from fastapi import HTTPException
+
+
+def raw_cursor(created_at, process_id):
+    return base64.urlsafe_b64encode(json.dumps([created_at, process_id]).encode()).decode()
+
+
+def test_cursor_round_trip():
+    row = {"created_at": "2026-10-17T09:30:00.12345+00:00", "id": "8f1c3a52-6b0e-4a8e-9a57-2f4d1c0e7b11"}
+    created_at, process_id = index.decode_cursor(index.encode_cursor(row))
+    assert created_at == "2026-10-17T09:30:00.123450+00:00"
+    assert process_id == row["id"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 !",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    raw_cursor("2026-10-17T09:30:00+00:00", "1),id.gt.0"),
+    raw_cursor('2026-10-17",status.eq."Done', "8f1c3a52-6b0e-4a8e-9a57-2f4d1c0e7b11"),
+    raw_cursor(None, "8f1c3a52-6b0e-4a8e-9a57-2f4d1c0e7b11"),
+])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        index.decode_cursor(cursor)
+    assert exc.value.status_code == 400
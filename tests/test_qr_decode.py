@@ -0,0 +1,15 @@
+from qr_decode import license_number_from_url, license_url
+
+
+def test_license_url_picks_the_portal_url():
+    payloads = ["https://pay.example.com/invoice/42", "https://app.invest.dubai.ae/dul/dul-1234538?bk=1"]
+    assert license_url(payloads) == "https://app.invest.dubai.ae/dul/dul-1234538?bk=1"
+
+
+def test_license_url_ignores_other_urls():
+    assert license_url(["https://pay.example.com/invoice/42", "WIFI:S:office;;"]) is None
+    assert license_url([]) is None
+
+
+def test_license_number_from_query():
+    assert license_number_from_url("https://app.invest.dubai.ae/verify?licenseNo=1234538") == "1234538"
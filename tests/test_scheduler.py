@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+
+from scheduler import QueueFullError, Scheduler
+
+
+def test_admits_up_to_concurrency_then_queues_fifo():
+    async def scenario():
+        scheduler = Scheduler({"lei": (1, 5)})
+        order = []
+        gate = asyncio.Event()
+
+        async def job(name):
+            async with scheduler.slot("lei"):
+                order.append(name)
+                await gate.wait()
+
+        tasks = [asyncio.create_task(job(n)) for n in ("a", "b", "c")]
+        await asyncio.sleep(0)
+        stats = scheduler.stats()["lei"]
+        assert (stats["active"], stats["queueDepth"]) == (1, 2)
+        gate.set()
+        await asyncio.gather(*tasks)
+        return order, scheduler.stats()["lei"]
+
+    order, stats = asyncio.run(scenario())
+    assert order == ["a", "b", "c"]
+    assert stats["active"] == 0 and stats["completed"] == 3
+
+
+def test_full_queue_raises_with_retry_after():
+    async def scenario():
+        scheduler = Scheduler({"lei": (1, 1)})
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("lei"):
+                await gate.wait()
+
+        tasks = [asyncio.create_task(hold()) for _ in range(2)]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(QueueFullError) as raised:
+                async with scheduler.slot("lei"):
+                    pass
+        finally:
+            gate.set()
+            await asyncio.gather(*tasks)
+        return raised.value, scheduler.stats()["lei"]
+
+    error, stats = asyncio.run(scenario())
+    assert error.target == "lei"
+    assert error.retry_after >= 1
+    assert stats["rejected"] == 1
+
+
+def test_slot_is_released_when_the_body_raises():
+    async def scenario():
+        scheduler = Scheduler({"lei": (1, 0)})
+        with pytest.raises(RuntimeError):
+            async with scheduler.slot("lei"):
+                raise RuntimeError("scrape failed")
+        # The only slot is free again, so this does not hit the empty queue
+        async with scheduler.slot("lei"):
+            pass
+        return scheduler.stats()["lei"]
+
+    stats = asyncio.run(scenario())
+    assert stats["active"] == 0 and stats["completed"] == 2
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        scheduler = Scheduler({"lei": (1, 1)})
+        gate = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot("lei"):
+                await gate.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        depth = scheduler.stats()["lei"]["queueDepth"]
+        gate.set()
+        await holder
+        return depth, scheduler.stats()["lei"]
+
+    depth, stats = asyncio.run(scenario())
+    assert depth == 0
+    assert stats["active"] == 0
+
+
+def test_endpoint_answers_429_with_retry_after_when_queue_is_full(monkeypatch, api_post):
+    import index
+    # The only slot is busy and there is no queue, so the scrape is turned away at admission
+    busy = Scheduler({"lei": (1, 0)})
+    busy.targets["lei"].active = 1
+    monkeypatch.setattr(index, "scheduler", busy)
+    res = api_post("/verify-lei", {"leiCode": "5493001KJTIIGC8Y1R12", "forceRefresh": True, "recordVideo": "off"})
+    assert res.status_code == 429
+    assert int(res.headers["Retry-After"]) >= 1
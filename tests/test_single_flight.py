@@ -0,0 +1,102 @@
+import asyncio
+import pytest
+
+from single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_call_and_get_their_own_copy():
+    async def scenario():
+        flight = SingleFlight()
+        calls = 0
+        gate = asyncio.Event()
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await gate.wait()
+            return {"License Number": "1234538", "Activities": ["Trading"]}
+
+        callers = [asyncio.create_task(flight.do(("extract-license", "1234538", "off"), work)) for _ in range(3)]
+        await asyncio.sleep(0)
+        gate.set()
+        results = await asyncio.gather(*callers)
+        return flight, calls, results
+
+    flight, calls, results = asyncio.run(scenario())
+    assert calls == 1
+    assert all(r == results[0] for r in results)
+    results[0]["Activities"].append("mutated")
+    assert results[1]["Activities"] == ["Trading"]
+    assert flight.stats() == {"inFlight": 0, "started": {"extract-license": 1}, "coalesced": {"extract-license": 2}}
+
+
+def test_concurrent_callers_share_one_exception_and_the_key_is_cleared():
+    async def scenario():
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def failing():
+            await gate.wait()
+            raise RuntimeError("portal down")
+
+        callers = [asyncio.create_task(flight.do(("verify-lei", "X", "off"), failing)) for _ in range(2)]
+        await asyncio.sleep(0)
+        gate.set()
+        outcomes = await asyncio.gather(*callers, return_exceptions=True)
+
+        async def recovered():
+            return {"LEGAL NAME": "TRAFCO DMCC"}
+
+        # The failed call is forgotten, so the next caller runs the work again
+        again = await flight.do(("verify-lei", "X", "off"), recovered)
+        return flight, outcomes, again
+
+    flight, outcomes, again = asyncio.run(scenario())
+    assert [type(o) for o in outcomes] == [RuntimeError, RuntimeError]
+    assert outcomes[0] is outcomes[1]
+    assert again == {"LEGAL NAME": "TRAFCO DMCC"}
+    assert flight.stats()["inFlight"] == 0
+    assert flight.stats()["started"] == {"verify-lei": 2}
+
+
+def test_different_options_do_not_coalesce():
+    async def scenario():
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return {}
+
+        callers = [
+            asyncio.create_task(flight.do(("verify-website", "https://example.ae", policy), work))
+            for policy in ("off", "always")
+        ]
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*callers)
+        return flight.stats()
+
+    assert asyncio.run(scenario())["started"] == {"verify-website": 2}
+
+
+def test_caller_cancellation_does_not_cancel_shared_work():
+    async def scenario():
+        flight = SingleFlight()
+        gate = asyncio.Event()
+
+        async def work():
+            await gate.wait()
+            return {"ok": True}
+
+        first = asyncio.create_task(flight.do(("k",), work))
+        second = asyncio.create_task(flight.do(("k",), work))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        gate.set()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == {"ok": True}
@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+verification_cache = pytest.importorskip("verification_cache")
+VerificationCache = verification_cache.VerificationCache
+
+
+def cached_after_set(source: str, identifier: str, data: dict):
+    async def scenario():
+        cache = VerificationCache()
+        await cache.set(source, identifier, data)
+        return await cache.get(source, identifier)
+
+    return asyncio.run(scenario())
+
+
+def test_caches_found_license_without_transient_keys():
+    data = {"Business Name": "TRAFCO DMCC", "License Number": "1234538", "video_artifact_id": "abc",
+            "public_video_path": "https://x/videos/a.webm", "video_path": "/tmp/a.webm"}
+    entry = cached_after_set("license", "1234538", data)
+    assert entry is not None
+    cached, age = entry
+    assert cached == {"Business Name": "TRAFCO DMCC", "License Number": "1234538"}
+    assert age >= 0
+
+
+@pytest.mark.parametrize("source, data", [
+    ("license", {"error": "Timeout waiting for element"}),
+    ("license", {"Business Name": None, "License Number": None, "Activities": None}),
+    ("lei", {"LEGAL NAME": "Not Found", "LEI CODE": "5493001KJTIIGC8Y1R12", "COUNTRY": "United Arab Emirates"}),
+    ("website", {"company_name": "Trafco DMCC", "address": "No.303, Fortune Tower", "business_services": [],
+                 "countries_operating": ["UAE"], "people": [], "defaulted": ["company_name", "address", "business_services",
+                                                                            "countries_operating", "people"]}),
+])
+def test_does_not_cache_results_that_found_nothing(source, data):
+    assert cached_after_set(source, "id", data) is None
+
+
+def test_caches_found_lei_and_website():
+    assert cached_after_set("lei", "5493001KJTIIGC8Y1R12", {"LEGAL NAME": "TRAFCO DMCC", "LEI CODE": "5493001KJTIIGC8Y1R12"})
+    website = {"company_name": "Al Thuraya Advanced Electronics Trading LLC", "address": "", "people": [], "defaulted": ["address", "people"]}
+    assert cached_after_set("website", "https://example.ae", website)
+
+
+def test_expired_entries_are_misses():
+    async def scenario():
+        cache = VerificationCache(ttls={"lei": 0})
+        await cache.set("lei", "x", {"LEGAL NAME": "TRAFCO DMCC"})
+        await asyncio.sleep(0.01)
+        return await cache.get("lei", "x"), cache.stats()
+
+    entry, stats = asyncio.run(scenario())
+    assert entry is None
+    assert stats["misses"] == 1